@@ -6,6 +6,11 @@ import AppKit
 
 from controllers.mainWindowController import MainWindowController
 from model import Model
+from core.outputPipeline import stopSharedOutputPipeline
+from core.heldKeys import releaseAllHeldKeys
+from core.turbo import stopAllTurbo
+from core.utils import resourcePath
+from core import latency
 import objc
 
 class AppController(AppKit.NSObject):
@@ -18,6 +23,9 @@ class AppController(AppKit.NSObject):
         self.app.setDelegate_(self)  # Set self as app delegate to handle termination
         
         self.model = Model()
+        # latency_trace times every stage from mouse event to CGEvent post (see core.latency)
+        if getattr(self.model.config, 'latency_trace', False):
+            latency.enableTracing()
         self.windowController = MainWindowController.alloc().initWithModel_(self.model)
         self.windowController.showWindow()
         
@@ -26,8 +34,18 @@ class AppController(AppKit.NSObject):
     def applicationWillTerminate_(self, notification):
         """Save all preset data when the application is about to quit."""
         print("Application terminating...")
+        # Panels first: their boxes cancel dwell timers and running macros, so
+        # nothing presses a key again once the table below is emptied
+        self.windowController.closeAllPresets()
+        stopAllTurbo()
+        # Ups for anything still down are queued before the pipeline drains
+        releaseAllHeldKeys()
+        stopSharedOutputPipeline()
         if self.model:
             self.model.save()
+            self.model.close()
+        # After the pipeline drained, so the last posts are counted
+        latency.exportTrace(resourcePath(latency.TRACE_FILE))
 
     def run(self):
         AppHelper.runEventLoop()
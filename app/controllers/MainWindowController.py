@@ -1,9 +1,11 @@
 import AppKit
 import objc
-from types import SimpleNamespace
+from core.tracking import TrackedNamespace
 from ui.window import PresetsView
 from ui.preset import Preset
 
+PRESET_POLL_INTERVAL = 1.0  # seconds
+
 class MainWindowController(AppKit.NSObject):
     def initWithModel_(self, model):
         self = objc.super(MainWindowController, self).init()
@@ -25,6 +27,11 @@ class MainWindowController(AppKit.NSObject):
         
         # Set delegate
         self.mainWindow.setDelegate_(self)
+
+        # Watch the preset folder for edits made outside the app
+        self.presetPollTimer = AppKit.NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+            PRESET_POLL_INTERVAL, self, "pollPresets:", None, True
+        )
         
         return self
 
@@ -72,8 +79,10 @@ class MainWindowController(AppKit.NSObject):
                 del self.openPresets[tag]
         else:
             print(f"Opening preset {tag}")
-            # Ensure model.presets is accessed correctly
-            presetData = self.model.presets[tag]
+            # Parses the preset file on first open
+            presetData = self.model.getPreset(tag)
+            if presetData is None:
+                return
             self.openPresets[tag] = Preset(presetData, self.model)
             
     def editPreset_(self, sender):
@@ -81,11 +90,37 @@ class MainWindowController(AppKit.NSObject):
         # Ensure the preset is open before editing
         if tag not in self.openPresets:
              print(f"Opening preset {tag} for edit")
-             presetData = self.model.presets[tag]
+             presetData = self.model.getPreset(tag)
+             if presetData is None:
+                 return
              self.openPresets[tag] = Preset(presetData, self.model)
         
         self.openPresets[tag].toggleEdit()
 
+    def pollPresets_(self, timer):
+        """Hot reload preset files that changed on disk."""
+        reloaded, listChanged = self.model.pollPresetChanges()
+
+        for presetData, diff in reloaded:
+            for preset in self.openPresets.values():
+                if preset.presetData is presetData:
+                    preset.applyDiff(diff)
+
+        if listChanged:
+            # List positions (button tags) may have moved; re-key open presets
+            positions = {id(entry.data): i for i, entry in enumerate(self.model.presets)
+                         if entry.data is not None}
+            openPresets = {}
+            for preset in self.openPresets.values():
+                tag = positions.get(id(preset.presetData))
+                if tag is None:
+                    print(f"Preset file removed, closing {preset.presetData.name}")
+                    preset.close()
+                else:
+                    openPresets[tag] = preset
+            self.openPresets = openPresets
+            self.presetsView.reloadPresets(set(openPresets))
+
     def windowShouldClose_(self, sender):
         AppKit.NSApp.terminate_(None)
         return True
@@ -95,10 +130,7 @@ class MainWindowController(AppKit.NSObject):
         frame = self.mainWindow.frame()
         
         if not hasattr(self.model.config, 'main_window'):
-            self.model.config.main_window = SimpleNamespace()
-            
-        if not hasattr(self.model.config, 'main_window'):
-            self.model.config.main_window = SimpleNamespace()
+            self.model.config.main_window = TrackedNamespace()
             
         self.model.config.main_window.x = frame.origin.x
         self.model.config.main_window.y = frame.origin.y
@@ -107,6 +139,13 @@ class MainWindowController(AppKit.NSObject):
         from ui.globalConfigWindow import GlobalConfigWindow
         self.globalConfigWindow = GlobalConfigWindow(self.model, self)
 
+    def closeAllPresets(self):
+        """Close every open preset (on quit); its panels stop their dwells, macros and keys."""
+        self.presetPollTimer.invalidate()
+        for preset in self.openPresets.values():
+            preset.close()
+        self.openPresets = {}
+
     def updateGlobalSettings(self):
         """Update settings for all open presets."""
         for preset in self.openPresets.values():
@@ -3,27 +3,24 @@ import objc
 
 # Import the view
 from ui.panelView import PanelView
+from core.presetDiff import GEOMETRY_FIELDS, GRID_FIELDS
+from core.heldKeys import releaseAllHeldKeys
+from core.turbo import stopAllTurbo
 
 class PanelController:
-    def __init__(self, presetData, model):
+    def __init__(self, presetData, compiled, model):
         print("PanelController init")
         self.presetData = presetData
+        self.compiled = compiled
         self.model = model
         print(self.presetData)
         
-        # Determine width and height from data, or default
-        # Assuming presetData has width/height 
-        self.width = getattr(self.presetData, 'width', 500)
-        self.height = getattr(self.presetData, 'height', 500)
-
-        # Using a default position or one from data if available
-        # screen_x/y/w/h are for the window geometry
-        x = getattr(self.presetData, 'screen_x', 50)
-        y = getattr(self.presetData, 'screen_y', 500)
-        w = getattr(self.presetData, 'screen_width', 500)
-        h = getattr(self.presetData, 'screen_height', 500)
-        
-        frameRect = AppKit.NSMakeRect(x, y, w, h)
+        # Grid size, already validated and clamped by the compile step
+        self.width = self.compiled.width
+        self.height = self.compiled.height
+
+        # compiled.frame is the window geometry (screen_x/y/width/height)
+        frameRect = AppKit.NSMakeRect(*self.compiled.frame)
         
         style = (AppKit.NSWindowStyleMaskTitled | 
                  AppKit.NSWindowStyleMaskClosable | 
@@ -64,10 +61,35 @@ class PanelController:
         self.setupView()
 
     def close(self):
+        self.releaseKeys()
         # Ensure delegate is cleaned up or data is finalized if needed
         self.panel.setDelegate_(None)
         self.panel.close()
+
+    def releaseKeys(self):
+        """Let go of every key this panel's boxes hold, repeat or are playing."""
+        # Boxes cancel their dwell timers and macros first, so nothing presses again
+        self.container.closeActions()
+        releaseAllHeldKeys(self.container)
+        stopAllTurbo(self.container)
     
+    def reload(self, fields, compiled):
+        """Apply fields of presetData that changed on disk, keeping the panel open."""
+        self.compiled = compiled
+        if any(f in fields for f in GEOMETRY_FIELDS):
+            self.panel.setFrame_display_(AppKit.NSMakeRect(*compiled.frame), True)
+
+        if any(f in fields for f in GRID_FIELDS):
+            self.setCompiled(compiled)
+
+    def setCompiled(self, compiled):
+        """Lay the panel out again from a recompiled CompiledPanel."""
+        self.compiled = compiled
+        self.width = compiled.width
+        self.height = compiled.height
+        if hasattr(self, 'container') and self.container:
+            self.container.setCompiled(compiled)
+
     def setGridVisible(self, visible):
         """Show or hide the grid lines based on edit mode."""
         if hasattr(self, 'container') and self.container:
@@ -82,7 +104,7 @@ class PanelController:
     def setupView(self):
         rect = self.panel.contentView().bounds()
         # Use PanelView instead of FlippedContainer
-        self.container = PanelView.alloc().initWithFrame_preset_(rect, self.presetData)
+        self.container = PanelView.alloc().initWithFrame_compiled_(rect, self.compiled)
         
         self.container.setWantsLayer_(True)
         self.container.layer().setBorderWidth_(2.0)
@@ -0,0 +1,79 @@
+import time
+import threading
+
+# Coalesces bursts of edits (window drags, slider ticks) into one save on a
+# worker thread. A save runs once edits have been quiet for quietPeriod, or
+# maxDelay after the first unsaved edit if they never stop.
+
+AUTOSAVE_QUIET_PERIOD = 2.0  # seconds
+AUTOSAVE_MAX_DELAY = 10.0    # seconds
+
+
+class Autosaver:
+    def __init__(self, save, quietPeriod=AUTOSAVE_QUIET_PERIOD, maxDelay=AUTOSAVE_MAX_DELAY):
+        self.save = save
+        self.quietPeriod = quietPeriod
+        self.maxDelay = max(maxDelay, quietPeriod)
+        self.cond = threading.Condition()
+        self.firstEdit = None  # monotonic time of the oldest unsaved edit
+        self.lastEdit = None
+        self.stopped = False
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self.thread.start()
+
+    def notify(self):
+        """Note an edit. Cheap enough to call on every drag/slider tick."""
+        now = time.monotonic()
+        with self.cond:
+            self.lastEdit = now
+            if self.firstEdit is None:
+                self.firstEdit = now
+                self.cond.notify()
+
+    def clear(self):
+        """Forget pending edits; called when a save starts by other means."""
+        with self.cond:
+            self.firstEdit = None
+            self.lastEdit = None
+
+    def pending(self):
+        with self.cond:
+            return self.firstEdit is not None
+
+    def deadline(self):
+        return min(self.lastEdit + self.quietPeriod, self.firstEdit + self.maxDelay)
+
+    def stop(self):
+        """Stop the worker, waiting for a save in progress. Pending edits are left to the caller."""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.stopped:
+                    if self.firstEdit is None:
+                        self.cond.wait()
+                        continue
+                    remaining = self.deadline() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                if self.stopped:
+                    return
+                self.firstEdit = None
+                self.lastEdit = None
+
+            # Edits arriving from here on schedule the next save
+            try:
+                self.save()
+            except Exception as e:
+                print(f"Autosave failed: {e}")
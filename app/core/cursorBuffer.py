@@ -0,0 +1,111 @@
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Fixed-size history of cursor samples (time, x, y) in three array('d')
+# columns, so appending a sample allocates no Python objects. Every sample is
+# written twice, at i and i + capacity ("mirror" layout), which keeps the
+# last n samples contiguous: windows are memoryview slices, not copies.
+
+DEFAULT_CAPACITY = 512
+
+Window = namedtuple('Window', ['t', 'x', 'y'])
+
+
+class CursorBuffer:
+    __slots__ = ('capacity', 'count', 'head', 't', 'x', 'y', '_views')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.count = 0  # samples appended so far; readers can compare it to spot new ones
+        self.head = 0   # next slot to write
+        zeros = bytes(8 * 2 * capacity)
+        self.t = array('d', zeros)
+        self.x = array('d', zeros)
+        self.y = array('d', zeros)
+        self._views = (memoryview(self.t), memoryview(self.x), memoryview(self.y))
+
+    def append(self, t, x, y):
+        i = self.head
+        j = i + self.capacity
+        self.t[i] = self.t[j] = t
+        self.x[i] = self.x[j] = x
+        self.y[i] = self.y[j] = y
+        self.head = 0 if j + 1 == self.capacity * 2 else i + 1
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+        self.head = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def latest(self):
+        """(t, x, y) of the newest sample, or None when empty."""
+        if not self.count:
+            return None
+        i = self.head - 1  # -1 wraps to the mirror copy of the last slot
+        return self.t[i], self.x[i], self.y[i]
+
+    def window(self, n=None):
+        """The newest n samples (all of them by default), oldest first, as memoryviews.
+
+        The views are live: copy them (bytes(), list()) to keep them past
+        another capacity's worth of appends.
+        """
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = self.head + self.capacity
+        start = end - n
+        vt, vx, vy = self._views
+        return Window(vt[start:end], vx[start:end], vy[start:end])
+
+    def since(self, t0):
+        """Samples taken at or after time t0."""
+        full = self.window()
+        start = bisect_left(full.t, t0)
+        return Window(full.t[start:], full.x[start:], full.y[start:])
+
+
+def asNumpy(window):
+    """The window as float64 numpy arrays sharing its memory (needs numpy)."""
+    if numpy is None:
+        raise RuntimeError("numpy is not installed")
+    return Window(*(numpy.frombuffer(column, dtype=numpy.float64) for column in window))
+
+
+def velocity(window):
+    """Average (vx, vy) across the window, in units per second."""
+    if len(window.t) < 2:
+        return 0.0, 0.0
+    dt = window.t[-1] - window.t[0]
+    if dt <= 0:
+        return 0.0, 0.0
+    return (window.x[-1] - window.x[0]) / dt, (window.y[-1] - window.y[0]) / dt
+
+
+def spread(window):
+    """Largest distance of a sample from the window's centroid (how still the cursor held)."""
+    n = len(window.t)
+    if n == 0:
+        return 0.0
+    cx = sum(window.x) / n
+    cy = sum(window.y) / n
+    return max((x - cx) ** 2 + (y - cy) ** 2 for x, y in zip(window.x, window.y)) ** 0.5
+
+
+_shared = None
+
+
+def sharedCursorBuffer():
+    """The history the panels and the cursor sampler feed, in AppKit screen coordinates."""
+    global _shared
+    if _shared is None:
+        _shared = CursorBuffer()
+    return _shared
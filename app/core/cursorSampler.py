@@ -0,0 +1,151 @@
+import time
+
+# One poller for the global cursor position, shared by everything that needs
+# samples between mouse events (dwells running outside a view, the joystick).
+# Each subscriber says how fast it needs samples: activeRate while it has a
+# dwell pending or the cursor is near its region, idleRate otherwise. The
+# sampler runs at the fastest rate anyone currently wants and stops when
+# that is zero. Timing comes from a DwellScheduler, whose dispatch decides
+# which thread subscribers are called on.
+#
+# Positions are AppKit screen points (origin bottom-left, as from
+# NSEvent.mouseLocation), the same space PanelView writes to the shared
+# CursorBuffer, so sampled and event-driven samples can share one history.
+
+ACTIVE_RATE = 60.0   # Hz
+NEAR_MARGIN = 40.0   # how close (screen points) counts as near a region
+
+
+class AppKitCursorSource:
+    """The real cursor, in AppKit screen coordinates (macOS only)."""
+
+    def __init__(self):
+        from AppKit import NSEvent
+        self._event = NSEvent
+
+    def position(self):
+        location = self._event.mouseLocation()
+        return location.x, location.y
+
+
+class SyntheticCursorSource:
+    """A scripted cursor for tests and benchmarks: path(t) -> (x, y)."""
+
+    def __init__(self, path, clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.reads = 0
+
+    def position(self):
+        self.reads += 1
+        return self.path(self.clock())
+
+
+class Subscription:
+    __slots__ = ('sampler', 'callback', 'activeRate', 'idleRate', 'region', 'margin', 'pending')
+
+    def __init__(self, sampler, callback, activeRate, idleRate, region, margin):
+        self.sampler = sampler
+        self.callback = callback
+        self.activeRate = activeRate
+        self.idleRate = idleRate
+        self.region = region  # (x, y, width, height) in screen points, or None
+        self.margin = margin
+        self.pending = False
+
+    def setPending(self, pending):
+        """Ask for activeRate regardless of where the cursor is (e.g. a dwell in progress)."""
+        if pending != self.pending:
+            self.pending = pending
+            self.sampler.refresh()
+
+    def setRegion(self, region):
+        self.region = region
+        self.sampler.refresh()
+
+    def cancel(self):
+        self.sampler.unsubscribe(self)
+
+    def wantedRate(self, x, y):
+        if self.pending:
+            return self.activeRate
+        region = self.region
+        if region is not None and x is not None:
+            rx, ry, rw, rh = region
+            m = self.margin
+            if rx - m <= x <= rx + rw + m and ry - m <= y <= ry + rh + m:
+                return self.activeRate
+        return self.idleRate
+
+
+class CursorSampler:
+    def __init__(self, source, scheduler, buffer=None):
+        """Samples go to every subscriber and, if given, to buffer (a CursorBuffer)."""
+        self.source = source
+        self.scheduler = scheduler
+        self.clock = scheduler.clock
+        self.buffer = buffer
+        self.timer = scheduler.timer(self.sample)
+        self.subscriptions = []
+        self.rate = 0.0
+        self.x = self.y = None  # last sample
+        self.samples = 0
+
+    def subscribe(self, callback, activeRate=ACTIVE_RATE, idleRate=0.0, region=None, margin=NEAR_MARGIN):
+        """callback(t, x, y) on every sample while subscribed."""
+        subscription = Subscription(self, callback, activeRate, idleRate, region, margin)
+        self.subscriptions.append(subscription)
+        self.refresh()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            self.refresh()
+
+    def wantedRate(self):
+        return max((s.wantedRate(self.x, self.y) for s in self.subscriptions), default=0.0)
+
+    def refresh(self):
+        """Re-evaluate the rate after a subscription changed."""
+        rate = self.wantedRate()
+        old = self.rate
+        if rate == old:
+            return
+        self.rate = rate
+        if rate <= 0:
+            self.scheduler.cancel(self.timer)
+        elif old <= 0:
+            # Starting up: take a sample right away so subscribers get a position
+            self.scheduler.arm(self.timer, 0.0)
+        else:
+            self.scheduler.arm(self.timer, 1.0 / rate)
+
+    def sample(self):
+        t = self.clock()
+        position = self.source.position()
+        if position is not None:
+            x, y = position
+            self.x, self.y = x, y
+            self.samples += 1
+            if self.buffer is not None:
+                self.buffer.append(t, x, y)
+            for subscription in list(self.subscriptions):
+                subscription.callback(t, x, y)
+
+        self.rate = self.wantedRate()
+        if self.rate > 0:
+            self.scheduler.arm(self.timer, 1.0 / self.rate)
+
+
+_shared = None
+
+
+def sharedCursorSampler():
+    """One sampler of the real cursor, on the shared dwell scheduler, feeding the shared buffer."""
+    global _shared
+    if _shared is None:
+        from core.cursorBuffer import sharedCursorBuffer
+        from core.dwellScheduler import sharedDwellScheduler
+        _shared = CursorSampler(AppKitCursorSource(), sharedDwellScheduler(), buffer=sharedCursorBuffer())
+    return _shared
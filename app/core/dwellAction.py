@@ -0,0 +1,163 @@
+from core.dwellEngine import DwellEngine, PRESS, RELEASE
+from core.heldKeys import HeldKeysSink
+from core.oneEuroFilter import OneEuroFilter2D
+from core import latency
+
+# What a dwell target does, without the view: a DwellEngine fed by the
+# hosting view, one DwellTimer on a shared scheduler for its deadline, and the
+# key, macro or turbo its CompiledAction names, pressed through a HeldKeys
+# table. DwellBox wraps one; benchmarks and tests drive it directly with
+# their own scheduler, table and pipeline.
+
+# Headmouse jitter below DWELL_RADIUS (points) doesn't restart a dwell; a held
+# key is only released once the cursor moves past DWELL_EXIT_RADIUS. The
+# radius alone still leaves a long tail of late dwells at ~1.5 pt jitter;
+# smoothing keeps the worst case near 2x the delay (benchmarks/dwellJitterBench.py)
+DWELL_DELAY = 0.1
+DWELL_RADIUS = 4.0
+DWELL_EXIT_RADIUS = 8.0
+DWELL_SMOOTHING = True
+
+
+class DwellAction:
+    def __init__(self, action, scheduler, held, executor, repeater, resolver):
+        """action is a CompiledAction; its chord was parsed and interned at load time.
+
+        scheduler times the dwell (and its dispatch picks the thread intents
+        run on); keys go through held (a HeldKeys), macros through executor,
+        turbo through repeater, and resolver picks the pid to post to.
+        """
+        self.key = action.key
+        self.keycode = action.keycode
+        self.chord = action.chord
+        self.macro = action.macro  # Timeline, compiled at load, for macro actions
+        self.turbo = action.turbo  # TurboSpec for turbo actions
+        self.scheduler = scheduler
+        self.held = held
+        self.executor = executor
+        self.repeater = repeater
+        self.resolver = resolver
+
+        self.target = None  # preset's target_app, set by the hosting view
+        self.group = None   # the hosting PanelView; closing it releases our key
+        self.turboKey = None    # repeater handle while a turbo action is held
+        self.macroRuns = {}     # running macro SequenceRun -> the HeldKeysSink it posts through
+        self.closed = False
+
+        self.timer = scheduler.timer(self.tick)
+        self.armedDeadline = None
+        self.firedDeadline = None  # deadline of the last dwell tick, for latency tracing
+        self.configure(DWELL_DELAY, DWELL_RADIUS, DWELL_EXIT_RADIUS, DWELL_SMOOTHING)
+
+    def configure(self, delay, radius=0.0, exitRadius=None, smoothing=False):
+        """Dwell delay (s), jitter radius and release radius (points), optional One Euro smoothing."""
+        self.delay = delay
+        self.engine = DwellEngine(self.handleIntent, delay, radius, clock=self.scheduler.clock,
+                                  exitRadius=exitRadius, smoother=OneEuroFilter2D() if smoothing else None)
+        self.syncTimer()
+
+    def handleIntent(self, intent):
+        if intent.kind == PRESS:
+            if self.macro is not None:
+                self.playMacro()
+            elif self.turbo is not None:
+                self.startTurbo()
+            else:
+                self.pressKey()
+            tracer = latency.tracer
+            if tracer is not None:
+                tracer.record(latency.TRIGGER, self.engine.clock() - intent.time)
+        elif intent.kind == RELEASE:
+            if self.turboKey is not None:
+                self.stopTurbo()
+            else:
+                self.releaseKey()
+
+    def tick(self):
+        """The dwell timer fired (on the scheduler's dispatch thread)."""
+        if self.closed:
+            return  # fired on its way to the dispatch thread as the panel closed
+        tracer = latency.tracer
+        if tracer is not None and self.armedDeadline is not None:
+            tracer.record(latency.DWELL, self.engine.clock() - self.armedDeadline)
+            self.firedDeadline = self.armedDeadline
+        self.armedDeadline = None  # the timer is spent
+        self.engine.tick()
+        self.syncTimer()
+
+    def syncTimer(self):
+        """Point the scheduler at the engine's next deadline."""
+        deadline = self.engine.deadline
+        if deadline == self.armedDeadline:
+            return  # jitter inside the radius leaves the dwell alone
+        self.armedDeadline = deadline
+        if deadline is None:
+            self.scheduler.cancel(self.timer)
+        else:
+            # Re-arms the same heap entry; no thread or timer object per move
+            self.scheduler.arm(self.timer, deadline - self.engine.clock())
+
+    def cursorEntered(self, x, y):
+        self.engine.enter(x, y)
+        self.syncTimer()
+
+    def cursorMoved(self, x, y):
+        self.engine.move(x, y)
+        self.syncTimer()
+
+    def cursorExited(self):
+        self.engine.exit()
+        self.syncTimer()
+
+    def pressKey(self):
+        # Cached PID, kept current by workspace notifications
+        pid = self.resolver.pid(self.target)
+
+        tracer = latency.tracer
+        if tracer is not None:
+            tracer.begin(self.keycode, self.firedDeadline)
+
+        # Counted with every other holder of this key; only the first press reaches the game
+        held = self.held
+        held.press(self, self.keycode, self.chord.flags, pid, self.group)
+        if tracer is not None and held.holders(self.keycode) > 1:
+            tracer.cancel(self.keycode)  # the key was already down; no down to time
+
+    def releaseKey(self):
+        # Goes up (to the pid it went down to) once no other holder has it
+        return self.held.release(self, self.keycode)
+
+    def playMacro(self):
+        # Every step is timed by the executor's thread; its keys are held in
+        # the table (as their own owner) so close() can let go of them
+        pid = self.resolver.pid(self.target)
+        sink = HeldKeysSink(self.held, self.group)
+        run = self.executor.runTimeline(self.macro, self.macroFinished, pid, sink)
+        self.macroRuns[run] = sink
+
+    def macroFinished(self, run):
+        # Executor thread; the macro released its own keys
+        self.macroRuns.pop(run, None)
+
+    def startTurbo(self):
+        # Tapped by the repeater until the dwell releases; no timer of our own
+        pid = self.resolver.pid(self.target)
+        self.turboKey = self.repeater.start(self.keycode, self.chord.flags, self.turbo, pid, self.group)
+
+    def stopTurbo(self):
+        self.repeater.stop(self.turboKey)
+        self.turboKey = None
+
+    def close(self):
+        """Teardown: stop the dwell timer and any turbo or macro, then let go of every key."""
+        self.closed = True
+        self.scheduler.cancel(self.timer)
+        self.armedDeadline = None
+        self.engine.reset()
+        if self.turboKey is not None:
+            self.stopTurbo()
+        for run, sink in list(self.macroRuns.items()):
+            self.executor.cancel(run)
+            sink.close()
+        self.macroRuns.clear()
+        self.releaseKey()
@@ -0,0 +1,169 @@
+import time
+from collections import namedtuple
+
+# Dwell behaviour as a plain state machine, so it runs (and can be tested and
+# benchmarked) without AppKit. Views feed it enter/exit notifications and
+# cursor samples with timestamps, call tick() when its deadline passes, and
+# act on the intents it emits.
+#
+# KEY_MODE (DwellBox): dwelling inside the target presses its key; the next
+# move inside it (or re-entering) releases the key and starts a new dwell.
+# Leaving the target does not release a held key.
+#
+# CLICK_MODE (right-click box): dwelling inside arms the target; once the
+# cursor moves away from where it was armed, the next dwell anywhere on
+# screen clicks at that spot and the target goes back to idle.
+#
+# Jitter: a dwell only restarts when the cursor drifts more than radius from
+# where it began, and once it completed (key held, box armed) the cursor has
+# to leave the larger exitRadius to undo it. "Where it began" is the mean of
+# the dwell's first anchorSamples samples rather than the one that started
+# it, which may itself be a jitter outlier. An optional smoother (e.g.
+# OneEuroFilter2D) filters samples before either test.
+
+KEY_MODE = "key"
+CLICK_MODE = "click"
+
+PRESS = "press"
+RELEASE = "release"
+CLICK = "click"
+
+# States
+IDLE = "idle"
+DWELLING = "dwelling"   # inside the target, waiting for the dwell to complete
+PRESSED = "pressed"     # KEY_MODE: dwell completed, key down
+ARMED = "armed"         # CLICK_MODE: waiting for the cursor to leave the arming spot
+AIMING = "aiming"       # CLICK_MODE: waiting for the cursor to settle on the click spot
+
+Intent = namedtuple('Intent', ['kind', 'time', 'x', 'y'])
+
+# Samples averaged into a dwell's anchor; fixed after that, so a slow drift
+# still restarts the dwell
+ANCHOR_SAMPLES = 8
+
+
+class DwellEngine:
+    def __init__(self, emit, dwellTime, radius=0.0, mode=KEY_MODE, clock=time.monotonic,
+                 exitRadius=None, smoother=None, anchorSamples=ANCHOR_SAMPLES):
+        """emit(intent) is called for every PRESS / RELEASE / CLICK.
+
+        radius is how far (in the samples' units) the cursor may drift from
+        where a dwell started before it restarts; exitRadius (>= radius) how
+        far it must move to release a completed one. anchorSamples=1 anchors
+        on the first sample alone.
+        """
+        self.emit = emit
+        self.dwellTime = dwellTime
+        self.radius = radius
+        self.exitRadius = radius if exitRadius is None else max(exitRadius, radius)
+        self.mode = mode
+        self.clock = clock
+        self.smoother = smoother
+        self.anchorSamples = max(1, anchorSamples)
+
+        self.state = IDLE
+        self.inside = False
+        self.pressed = False
+        self.deadline = None  # when tick() next has something to do
+        self.anchorX = self.anchorY = 0.0
+        self.anchorCount = 0
+        self.x = self.y = 0.0
+
+    def enter(self, x, y, t=None):
+        t = self.clock() if t is None else t
+        if self.smoother is not None:
+            self.smoother.reset()
+            x, y = self.smoother.filter(x, y, t)
+        self.inside = True
+        self.x, self.y = x, y
+        if self.state in (ARMED, AIMING):
+            return
+        self._release(t)
+        self._startDwell(x, y, t, DWELLING)
+
+    def move(self, x, y, t=None):
+        t = self.clock() if t is None else t
+        if self.smoother is not None:
+            x, y = self.smoother.filter(x, y, t)
+        self.x, self.y = x, y
+        state = self.state
+
+        if state == DWELLING:
+            if self._moved(x, y, self.radius):
+                self._startDwell(x, y, t, DWELLING)
+            else:
+                self._settle(x, y)
+        elif state == PRESSED:
+            # Moving on inside the target releases the key and starts a new dwell
+            if self.inside and self._moved(x, y, self.exitRadius):
+                self._release(t)
+                self._startDwell(x, y, t, DWELLING)
+        elif state == IDLE:
+            if self.inside and self.mode == KEY_MODE:
+                self._startDwell(x, y, t, DWELLING)
+        elif state == ARMED:
+            if self._moved(x, y, self.exitRadius):
+                self._startDwell(x, y, t, AIMING)
+        elif state == AIMING:
+            if self._moved(x, y, self.radius):
+                self._startDwell(x, y, t, AIMING)
+            else:
+                self._settle(x, y)
+
+    def exit(self, t=None):
+        self.inside = False
+        if self.state == DWELLING:
+            self.state = IDLE
+            self.deadline = None
+
+    def tick(self, t=None):
+        """Complete a dwell whose deadline has passed."""
+        t = self.clock() if t is None else t
+        if self.deadline is None or t < self.deadline:
+            return
+        self.deadline = None
+
+        if self.state == DWELLING:
+            if self.mode == KEY_MODE:
+                self.state = PRESSED
+                self.pressed = True
+                self.emit(Intent(PRESS, t, self.x, self.y))
+            else:
+                # Arm where the cursor is; aiming starts once it leaves this spot
+                self.state = ARMED
+                self.anchorX, self.anchorY = self.x, self.y
+                self.anchorCount = self.anchorSamples
+        elif self.state == AIMING:
+            self.state = IDLE
+            self.emit(Intent(CLICK, t, self.x, self.y))
+
+    def reset(self, t=None):
+        """Back to idle, releasing a held key."""
+        self._release(self.clock() if t is None else t)
+        self.state = IDLE
+        self.deadline = None
+
+    def _moved(self, x, y, radius):
+        dx = x - self.anchorX
+        dy = y - self.anchorY
+        return dx * dx + dy * dy > radius * radius
+
+    def _settle(self, x, y):
+        # Fold a sample that stayed inside the radius into the anchor's mean
+        n = self.anchorCount
+        if n < self.anchorSamples:
+            n += 1
+            self.anchorX += (x - self.anchorX) / n
+            self.anchorY += (y - self.anchorY) / n
+            self.anchorCount = n
+
+    def _startDwell(self, x, y, t, state):
+        self.state = state
+        self.anchorX, self.anchorY = x, y
+        self.anchorCount = 1
+        self.deadline = t + self.dwellTime
+
+    def _release(self, t):
+        if self.pressed:
+            self.pressed = False
+            self.emit(Intent(RELEASE, t, self.x, self.y))
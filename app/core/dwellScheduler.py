@@ -0,0 +1,162 @@
+import time
+import threading
+
+# One thread for every dwell deadline in the app. Each dwell target owns a
+# DwellTimer handle for its lifetime; re-arming it on a mouse move moves the
+# handle within an indexed binary heap (O(log n), nothing allocated), instead
+# of starting a new threading.Timer per move. Expired timers are handed to
+# dispatch(fn); sharedDwellScheduler() points it at the main thread.
+
+
+class DwellTimer:
+    __slots__ = ('callback', 'deadline', 'pos', 'generation')
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.deadline = 0.0
+        self.pos = -1         # index in the heap, -1 when not armed
+        self.generation = 0   # bumped by every arm/cancel, so stale fires are dropped
+
+    def armed(self):
+        return self.pos >= 0
+
+
+class DwellScheduler:
+    def __init__(self, dispatch=None, clock=time.monotonic):
+        self.dispatch = dispatch or (lambda fn: fn())
+        self.clock = clock
+        self.heap = []
+        self.cond = threading.Condition()
+        self.waitingFor = None  # deadline the worker sleeps until, None when idle
+        self.stopped = False
+        self.thread = None
+        self.fired = 0
+
+    def timer(self, callback):
+        """A handle for one dwell target; callback() runs on expiry (via dispatch)."""
+        return DwellTimer(callback)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="dwell", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def arm(self, timer, delay):
+        """(Re)start timer so it fires delay seconds from now."""
+        deadline = self.clock() + delay
+        with self.cond:
+            timer.generation += 1
+            old = timer.deadline
+            timer.deadline = deadline
+            if timer.pos < 0:
+                timer.pos = len(self.heap)
+                self.heap.append(timer)
+                self._siftUp(timer.pos)
+            elif deadline < old:
+                self._siftUp(timer.pos)
+            else:
+                self._siftDown(timer.pos)
+
+            # Only wake the worker if it would otherwise sleep past this deadline
+            if self.waitingFor is None or deadline < self.waitingFor:
+                self.cond.notify()
+
+    def cancel(self, timer):
+        with self.cond:
+            timer.generation += 1
+            if timer.pos >= 0:
+                self._remove(timer.pos)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.stopped:
+                    if not self.heap:
+                        self.waitingFor = None
+                        self.cond.wait()
+                        continue
+                    top = self.heap[0]
+                    remaining = top.deadline - self.clock()
+                    if remaining <= 0:
+                        break
+                    self.waitingFor = top.deadline
+                    self.cond.wait(remaining)
+                if self.stopped:
+                    return
+                self.waitingFor = None
+                self._remove(0)
+                generation = top.generation
+                self.fired += 1
+
+            self.dispatch(lambda timer=top, generation=generation: self._fire(timer, generation))
+
+    def _fire(self, timer, generation):
+        # Re-armed or cancelled between expiry and dispatch: not a dwell anymore
+        if timer.generation == generation and timer.pos < 0:
+            timer.callback()
+
+    # Indexed heap; callers hold self.cond
+
+    def _remove(self, pos):
+        heap = self.heap
+        timer = heap[pos]
+        last = heap.pop()
+        timer.pos = -1
+        if pos < len(heap):
+            heap[pos] = last
+            last.pos = pos
+            self._siftDown(pos)
+            self._siftUp(last.pos)
+
+    def _siftUp(self, pos):
+        heap = self.heap
+        timer = heap[pos]
+        while pos > 0:
+            parentPos = (pos - 1) >> 1
+            parent = heap[parentPos]
+            if parent.deadline <= timer.deadline:
+                break
+            heap[pos] = parent
+            parent.pos = pos
+            pos = parentPos
+        heap[pos] = timer
+        timer.pos = pos
+
+    def _siftDown(self, pos):
+        heap = self.heap
+        size = len(heap)
+        timer = heap[pos]
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1].deadline < heap[child].deadline:
+                child += 1
+            if heap[child].deadline >= timer.deadline:
+                break
+            heap[pos] = heap[child]
+            heap[pos].pos = pos
+            pos = child
+        heap[pos] = timer
+        timer.pos = pos
+
+
+_shared = None
+
+
+def sharedDwellScheduler():
+    """The one scheduler every DwellBox and the cursor sampler use; fires on the main thread."""
+    global _shared
+    if _shared is None:
+        from PyObjCTools import AppHelper
+        _shared = DwellScheduler(AppHelper.callAfter)
+        _shared.start()
+    return _shared
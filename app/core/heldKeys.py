@@ -0,0 +1,187 @@
+import threading
+
+from core.inputSequence import KEY_DOWN, KEY_UP, keyDown, keyUp
+
+# One table of every key the app is holding down. Sources (a DwellBox, the
+# joystick, a turbo key, a running macro) press and release keys as owners; each keycode is counted across
+# owners, so the game sees a down only when the first owner presses it and an
+# up only when the last one lets go. Two boxes bound to "w" hovered in turn
+# no longer send a second down, or an up while the other still holds it.
+#
+# An owner may belong to a group (the PanelView it sits in); teardown calls
+# releaseAll(group) for a closing panel, or releaseAll() on quit, and every
+# key still down goes up, so nothing is left stuck in the game.
+#
+# An up goes to the same pid its down went to, even if another app has come
+# to the front since.
+
+
+class HeldKeys:
+    def __init__(self, post):
+        """Downs and ups go to post(step) (an OutputPipeline's submit)."""
+        self.post = post
+        self.lock = threading.Lock()
+        self.counts = {}  # keycode -> owners holding it
+        self.pids = {}    # keycode -> pid its down was posted to
+        self.owned = {}   # owner -> set of keycodes it holds
+        self.groups = {}  # owner -> group, for owners that gave one
+
+        self.downs = 0
+        self.ups = 0
+        self.merged = 0  # presses and releases that didn't reach the game
+
+    def press(self, owner, keycode, flags=0, pid=None, group=None):
+        """owner holds keycode; False if owner already held it."""
+        with self.lock:
+            keys = self.owned.get(owner)
+            if keys is None:
+                keys = self.owned[owner] = set()
+                if group is not None:
+                    self.groups[owner] = group
+            if keycode in keys:
+                return False
+            keys.add(keycode)
+            self._acquire(keycode, flags, pid)
+            return True
+
+    def release(self, owner, keycode, flags=0):
+        """owner lets go of keycode; False if owner wasn't holding it."""
+        with self.lock:
+            keys = self.owned.get(owner)
+            if keys is None or keycode not in keys:
+                return False
+            keys.discard(keycode)
+            if not keys:
+                self._forget(owner)
+            self._drop(keycode, flags)
+            return True
+
+    def releaseOwner(self, owner):
+        """owner lets go of everything it holds; how many keys that was."""
+        with self.lock:
+            keys = self.owned.get(owner)
+            if keys is None:
+                return 0
+            for keycode in keys:
+                self._drop(keycode)
+            self._forget(owner)
+            return len(keys)
+
+    def setHeld(self, owner, keycodes, flags=0, pid=None, group=None):
+        """Make owner hold exactly keycodes (ups before downs); True if that changed anything."""
+        with self.lock:
+            keys = self.owned.get(owner, set())
+            wanted = set(keycodes)
+            if keys == wanted:
+                return False
+            for keycode in keys - wanted:
+                self._drop(keycode)
+            for keycode in wanted - keys:
+                self._acquire(keycode, flags, pid)
+            if wanted:
+                self.owned[owner] = wanted
+                if group is not None:
+                    self.groups[owner] = group
+            else:
+                self._forget(owner)
+            return True
+
+    def held(self, owner=None):
+        """Keycodes owner holds, or every keycode that is down."""
+        with self.lock:
+            if owner is None:
+                return set(self.counts)
+            return set(self.owned.get(owner, ()))
+
+    def holders(self, keycode):
+        """How many owners hold keycode."""
+        return self.counts.get(keycode, 0)
+
+    def isHeld(self, owner, keycode):
+        with self.lock:
+            return keycode in self.owned.get(owner, ())
+
+    def releaseAll(self, group=None):
+        """Release every key held by owners in group, or by everyone; how many owners let go."""
+        with self.lock:
+            owners = [owner for owner in self.owned
+                      if group is None or self.groups.get(owner) is group]
+            for owner in owners:
+                for keycode in self.owned[owner]:
+                    self._drop(keycode)
+                self._forget(owner)
+            return len(owners)
+
+    # Callers hold self.lock
+
+    def _acquire(self, keycode, flags, pid):
+        count = self.counts.get(keycode, 0)
+        self.counts[keycode] = count + 1
+        if count:
+            self.merged += 1
+            return
+        self.pids[keycode] = pid
+        self.downs += 1
+        self.post(keyDown(keycode, flags, pid))
+
+    def _drop(self, keycode, flags=0):
+        count = self.counts[keycode] - 1
+        if count:
+            self.counts[keycode] = count
+            self.merged += 1
+            return
+        del self.counts[keycode]
+        self.ups += 1
+        self.post(keyUp(keycode, flags, self.pids.pop(keycode)))
+
+    def _forget(self, owner):
+        del self.owned[owner]
+        self.groups.pop(owner, None)
+
+
+class HeldKeysSink:
+    """A sink (post(step)) that presses and releases keys in a HeldKeys as one owner.
+
+    A macro run posts through one, so its downs count with every other
+    holder, and close() lets go of whatever it still holds. Mouse steps pass
+    straight through.
+    """
+
+    def __init__(self, held, group=None):
+        self.held = held
+        self.group = group
+        self.closed = False
+
+    def post(self, step):
+        kind = step.kind
+        if kind == KEY_DOWN:
+            # A step already in flight when the run was cancelled mustn't press again
+            if not self.closed:
+                self.held.press(self, step.value, step.flags, step.pid, self.group)
+        elif kind == KEY_UP:
+            self.held.release(self, step.value, step.flags)
+        elif not self.closed:
+            self.held.post(step)
+
+    def close(self):
+        """Stop pressing and release what is held; how many keys went up."""
+        self.closed = True
+        return self.held.releaseOwner(self)
+
+
+_shared = None
+
+
+def sharedHeldKeys():
+    """The table every key source presses through, posting via the output pipeline."""
+    global _shared
+    if _shared is None:
+        from core.outputPipeline import sharedOutputPipeline
+        _shared = HeldKeys(sharedOutputPipeline().submit)
+    return _shared
+
+
+def releaseAllHeldKeys(group=None):
+    """Release what group holds, or everything (on quit); a no-op if nothing was ever pressed."""
+    if _shared is not None:
+        _shared.releaseAll(group)
@@ -0,0 +1,46 @@
+from array import array
+
+# Cell -> action lookup for one panel, so PanelView can resolve the cursor
+# with a single tracking area instead of one per action view. Built from a
+# CompiledPanel (actions already clamped to the grid); hit tests are two
+# multiplications and an array index regardless of how many actions there are.
+
+NO_ACTION = -1
+
+
+class HitGrid:
+    __slots__ = ('width', 'height', 'cells')
+
+    def __init__(self, compiledPanel):
+        width = compiledPanel.width
+        height = compiledPanel.height
+        cells = array('i', [NO_ACTION]) * (width * height)
+        # Later actions are added as later subviews, so they win where actions overlap
+        for i, action in enumerate(compiledPanel.actions):
+            span = array('i', [i]) * action.w
+            for row in range(action.y, action.y + action.h):
+                start = row * width + action.x
+                cells[start:start + action.w] = span
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    def cellAt(self, col, row):
+        """Position in compiledPanel.actions of the action covering a cell, or NO_ACTION."""
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return self.cells[row * self.width + col]
+        return NO_ACTION
+
+    def hitTest(self, x, y, boundsWidth, boundsHeight):
+        """Action position under a point in a (flipped) view of the given size, or NO_ACTION."""
+        if not (0 <= x < boundsWidth and 0 <= y < boundsHeight):
+            return NO_ACTION
+        width = self.width
+        col = int(x * width / boundsWidth)
+        row = int(y * self.height / boundsHeight)
+        # Float rounding can land exactly on the far edge
+        if col >= width:
+            col = width - 1
+        if row >= self.height:
+            row = self.height - 1
+        return self.cells[row * width + col]
@@ -0,0 +1,198 @@
+import time
+from array import array
+from collections import namedtuple
+
+from core.dwellScheduler import DwellScheduler
+
+# Synthesized input as a timeline instead of post / sleep / post on the
+# caller's thread. A sequence is a list of Steps (key or mouse down/up and
+# waits); SequenceExecutor flattens it into offsets from the start and posts
+# each step from its own scheduler thread when due, so the UI never waits.
+# Steps are timed against the sequence start, not the previous step, so
+# lateness doesn't accumulate, and every run records how late each step was.
+# Sequences that run often (macros) are compiled to a Timeline once, at load.
+
+KEY_DOWN = "keyDown"
+KEY_UP = "keyUp"
+MOUSE_DOWN = "mouseDown"
+MOUSE_UP = "mouseUp"
+WAIT = "wait"
+
+LEFT_BUTTON = 0
+RIGHT_BUTTON = 1
+
+KEY_TAP_HOLD = 0.001  # s between down and up of a tapped key
+CLICK_HOLD = 0.05     # s between down and up of a click
+
+# The scheduler thread wakes this early and spins to the exact deadline
+SPIN_LEAD = 0.001
+
+# How many recent step errors the executor keeps for jitter()
+JITTER_HISTORY = 4096
+
+# value is the keycode, mouse button or wait time (s); pid None posts to the HID tap
+Step = namedtuple('Step', ['kind', 'value', 'x', 'y', 'flags', 'pid'])
+StepTiming = namedtuple('StepTiming', ['step', 'planned', 'actual', 'error'])
+
+# A compiled sequence: the non-wait steps, when each is due (s from the start), total length
+Timeline = namedtuple('Timeline', ['offsets', 'steps', 'duration'])
+
+
+def keyDown(keycode, flags=0, pid=None):
+    return Step(KEY_DOWN, keycode, 0.0, 0.0, flags, pid)
+
+
+def keyUp(keycode, flags=0, pid=None):
+    return Step(KEY_UP, keycode, 0.0, 0.0, flags, pid)
+
+
+def mouseDown(button, x, y):
+    return Step(MOUSE_DOWN, button, x, y, 0, None)
+
+
+def mouseUp(button, x, y):
+    return Step(MOUSE_UP, button, x, y, 0, None)
+
+
+def wait(seconds):
+    return Step(WAIT, seconds, 0.0, 0.0, 0, None)
+
+
+def keyTap(keycode, hold=KEY_TAP_HOLD, flags=0, pid=None):
+    return [keyDown(keycode, flags, pid), wait(hold), keyUp(keycode, flags, pid)]
+
+
+def click(button, x, y, hold=CLICK_HOLD):
+    return [mouseDown(button, x, y), wait(hold), mouseUp(button, x, y)]
+
+
+def compileSequence(steps):
+    """Flatten steps into a Timeline (waits become offsets)."""
+    offsets = array('d')
+    posted = []
+    at = 0.0
+    for step in steps:
+        if step.kind == WAIT:
+            at += step.value
+        else:
+            offsets.append(at)
+            posted.append(step)
+    return Timeline(offsets, tuple(posted), at)
+
+
+class SequenceRun:
+    __slots__ = ('offsets', 'steps', 'actual', 'index', 'start', 'timer', 'done', 'sink', 'cancelled')
+
+    def __init__(self, offsets, steps, start, done, sink):
+        self.offsets = offsets
+        self.steps = steps
+        self.actual = array('d')  # when each step was posted, from the start
+        self.index = 0
+        self.start = start
+        self.timer = None
+        self.done = done
+        self.sink = sink
+        self.cancelled = False
+
+    def finished(self):
+        return self.index == len(self.steps)
+
+    def report(self):
+        """Planned vs actual time of every step posted so far."""
+        return [StepTiming(step, planned, actual, actual - planned)
+                for step, planned, actual in zip(self.steps, self.offsets, self.actual)]
+
+
+class SequenceExecutor:
+    def __init__(self, sink, scheduler=None, clock=time.monotonic, lead=SPIN_LEAD):
+        """Posts steps to sink.post(step) from scheduler's thread (a dedicated one by default)."""
+        self.sink = sink
+        self.clock = clock
+        self.lead = lead
+        if scheduler is None:
+            scheduler = DwellScheduler(clock=clock)
+            scheduler.start()
+        self.scheduler = scheduler
+
+        self.posted = 0
+        self.totalError = 0.0
+        self.maxError = 0.0
+        self.history = array('d', bytes(8 * JITTER_HISTORY))  # ring of recent step errors
+
+    def run(self, steps, done=None):
+        """Start a sequence and return its SequenceRun; done(run) is called on the executor thread."""
+        return self.runTimeline(compileSequence(steps), done)
+
+    def runTimeline(self, timeline, done=None, pid=None, sink=None):
+        """Start a precompiled Timeline; pid, if given, retargets its key events.
+
+        sink, if given, takes this run's steps instead of the executor's own.
+        """
+        steps = timeline.steps
+        if pid is not None:
+            steps = [step._replace(pid=pid) if step.kind in (KEY_DOWN, KEY_UP) else step for step in steps]
+        run = SequenceRun(timeline.offsets, steps, self.clock(), done, sink or self.sink)
+        run.timer = self.scheduler.timer(lambda: self._advance(run))
+        self.scheduler.arm(run.timer, 0.0)
+        return run
+
+    def cancel(self, run):
+        """Drop the steps of run that haven't been posted yet; done is not called."""
+        # The flag stops an _advance already running on the executor thread,
+        # which would otherwise post on or re-arm the timer cancelled here
+        run.cancelled = True
+        self.scheduler.cancel(run.timer)
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def jitter(self):
+        """Lateness (s) of the most recent steps, oldest first, across every run."""
+        count = min(self.posted, JITTER_HISTORY)
+        end = self.posted % JITTER_HISTORY
+        history = self.history
+        return (history[end:] + history[:end])[JITTER_HISTORY - count:]
+
+    def _advance(self, run):
+        clock = self.clock
+        offsets = run.offsets
+        while run.index < len(offsets):
+            if run.cancelled:
+                return
+            due = run.start + offsets[run.index]
+            now = clock()
+            if due - now > self.lead:
+                self.scheduler.arm(run.timer, due - now - self.lead)
+                return
+            while now < due:
+                time.sleep(0)  # let the GIL go while spinning
+                now = clock()
+
+            if run.cancelled:
+                return  # cancelled while spinning
+            run.sink.post(run.steps[run.index])
+            actual = now - run.start
+            error = actual - offsets[run.index]
+            run.actual.append(actual)
+            run.index += 1
+
+            self.history[self.posted % JITTER_HISTORY] = error
+            self.posted += 1
+            self.totalError += error
+            if error > self.maxError:
+                self.maxError = error
+
+        if run.done is not None:
+            run.done(run)
+
+
+_shared = None
+
+
+def sharedInputExecutor():
+    """One executor timing steps on its own thread and posting them through the output pipeline."""
+    global _shared
+    if _shared is None:
+        from core.outputPipeline import sharedOutputPipeline
+        _shared = SequenceExecutor(sharedOutputPipeline())
+    return _shared
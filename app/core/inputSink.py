@@ -0,0 +1,56 @@
+import time
+from collections import namedtuple
+
+from core.inputSequence import KEY_DOWN, KEY_UP, MOUSE_DOWN
+
+# Where synthesized input goes. A sink has post(step) for one core.inputSequence
+# Step (key or mouse down/up); QuartzInputSink turns it into a CGEvent, while
+# RecordingInputSink keeps it with a timestamp so sequences can be run and
+# checked headless.
+
+Posted = namedtuple('Posted', ['time', 'step'])
+
+
+class QuartzInputSink:
+    """Posts steps as CGEvents (macOS only)."""
+
+    def __init__(self):
+        import Quartz
+        self.Quartz = Quartz
+        self.mouseTypes = {
+            (0, True): Quartz.kCGEventLeftMouseDown,
+            (0, False): Quartz.kCGEventLeftMouseUp,
+            (1, True): Quartz.kCGEventRightMouseDown,
+            (1, False): Quartz.kCGEventRightMouseUp,
+            (2, True): Quartz.kCGEventOtherMouseDown,
+            (2, False): Quartz.kCGEventOtherMouseUp,
+        }
+
+    def post(self, step):
+        Quartz = self.Quartz
+        if step.kind in (KEY_DOWN, KEY_UP):
+            event = Quartz.CGEventCreateKeyboardEvent(None, step.value, step.kind == KEY_DOWN)
+            if step.flags:
+                Quartz.CGEventSetFlags(event, step.flags)
+        else:
+            eventType = self.mouseTypes[(step.value, step.kind == MOUSE_DOWN)]
+            event = Quartz.CGEventCreateMouseEvent(None, eventType, (step.x, step.y), step.value)
+
+        if step.pid is not None:
+            Quartz.CGEventPostToPid(step.pid, event)
+        else:
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+
+
+class RecordingInputSink:
+    """Keeps every posted step with the time it was posted."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.posted = []
+
+    def post(self, step):
+        self.posted.append(Posted(self.clock(), step))
+
+    def clear(self):
+        self.posted = []
@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import threading
+
+# Append-only log of edits made since the last save.
+# One line per write: "<target>\t<dotted.path>\t<json value>\n", where target
+# is a preset file name or "config". record() only queues the edit, so the UI
+# thread never touches the file; a writer thread appends queued lines, hands
+# them to the OS straight away (so an app crash loses at most the edits still
+# queued) and fsyncs every batchSize lines or, once the edits stop, within
+# syncInterval seconds of the last fsync. Edits queued while the writer is busy are
+# coalesced by (target, path): a window drag's run of frame writes costs one
+# line per attribute, not one per tick.
+
+CONFIG_TARGET = "config"
+
+
+class Journal:
+    def __init__(self, path, batchSize=32, syncInterval=1.0):
+        self.path = path
+        self.batchSize = batchSize
+        self.syncInterval = syncInterval
+        self.pending = 0
+        self.records = 0  # total recorded, lets a save tell if edits arrived meanwhile
+        self.lastSync = time.monotonic()
+        self.file = None
+
+        # cond guards queued; writeLock is held while the file is written or
+        # truncated, and is always taken before cond
+        self.cond = threading.Condition()
+        self.writeLock = threading.Lock()
+        self.queued = {}  # (target, path) -> value, oldest first
+        self.stopped = False
+        self.thread = None
+
+    def open(self):
+        if self.file is None:
+            self.file = open(self.path, 'a')
+
+    def start(self):
+        if self.thread is None:
+            self.stopped = False
+            self.thread = threading.Thread(target=self._run, name="journal", daemon=True)
+            self.thread.start()
+
+    def record(self, target, path, value):
+        """Queue one edit. path is a tuple of attribute names / list indices.
+
+        value must not be mutated afterwards (Model passes a fresh _toDict copy).
+        """
+        key = (target, path)
+        with self.cond:
+            queued = self.queued
+            if not queued:
+                self.cond.notify()
+            # Re-queue at the end, so it still lands after any write to a parent
+            # or child of path made since its previous value was queued
+            queued.pop(key, None)
+            queued[key] = value
+            self.records += 1
+
+    def flush(self):
+        """Write everything queued so far (and fsync if due), on the calling thread."""
+        with self.writeLock:
+            with self.cond:
+                batch = self.queued
+                self.queued = {}
+            self._write(batch)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queued and not self.stopped:
+                    if not self.pending:
+                        self.cond.wait()
+                        continue
+                    # Lines written but not fsynced: wake when the sync is due
+                    remaining = self.lastSync + self.syncInterval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                if self.stopped:
+                    return  # close() writes what is left
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Journal: write failed: {e}")
+                # The batch is queued again; retry after a pause, not in a spin
+                with self.cond:
+                    if not self.stopped:
+                        self.cond.wait(self.syncInterval)
+
+    def _write(self, batch):
+        """Append batch's lines. Callers hold self.writeLock."""
+        if batch:
+            try:
+                self.open()
+                self.file.write("".join(
+                    f"{target}\t{'.'.join(str(p) for p in path)}\t{json.dumps(value, separators=(',', ':'))}\n"
+                    for (target, path), value in batch.items()))
+                self.file.flush()
+            except OSError:
+                self._requeue(batch)
+                raise
+            self.pending += len(batch)
+        if self.pending >= self.batchSize or time.monotonic() - self.lastSync >= self.syncInterval:
+            self.sync()
+
+    def _requeue(self, batch):
+        """Put a batch that failed to write back in front of anything queued since.
+
+        Edits queued meanwhile are newer, so they keep their values and stay last.
+        A line may land twice if part of the batch got out; replay is in order,
+        so the repeat is harmless.
+        """
+        with self.cond:
+            newer = self.queued
+            for key in newer:
+                batch.pop(key, None)
+            batch.update(newer)
+            self.queued = batch
+
+    def sync(self):
+        """fsync everything written so far. Callers hold self.writeLock."""
+        if self.file is None or not self.pending:
+            return
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.lastSync = time.monotonic()
+
+    def entries(self):
+        """Yield (target, path, value) for every complete line in the journal."""
+        try:
+            f = open(self.path, 'r')
+        except FileNotFoundError:
+            return
+
+        with f:
+            for lineNo, line in enumerate(f, 1):
+                # A torn last line (crash mid-write) has no newline; drop it
+                if not line.endswith("\n"):
+                    print(f"Journal: ignoring incomplete line {lineNo}")
+                    break
+                try:
+                    target, dotted, raw = line.rstrip("\n").split("\t", 2)
+                    value = json.loads(raw)
+                except ValueError:
+                    print(f"Journal: ignoring malformed line {lineNo}")
+                    continue
+                path = tuple(int(p) if p.isdigit() else p for p in dotted.split("."))
+                yield target, path, value
+
+    def isEmpty(self):
+        try:
+            return os.path.getsize(self.path) == 0
+        except OSError:
+            return True
+
+    def truncate(self):
+        """Drop all entries, queued or written, once their edits are safely in the JSON files."""
+        with self.writeLock:
+            with self.cond:
+                self.queued = {}
+            self._closeFile()
+            if self.isEmpty():
+                return
+            with open(self.path, 'w') as f:
+                os.fsync(f.fileno())
+
+    def close(self):
+        """Stop the writer, then write and fsync whatever is still queued."""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        with self.writeLock:
+            self._closeFile()
+
+    def _closeFile(self):
+        if self.file is None:
+            return
+        self.sync()
+        self.file.close()
+        self.file = None
+
+
+def writeAtomic(path, emit):
+    """Call emit(file) on a temp file next to path, fsync it, then rename over path."""
+    tmpPath = f"{path}.tmp"
+    with open(tmpPath, 'w') as f:
+        emit(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmpPath, path)
+
+
+def writeJsonAtomic(path, data, indent=4):
+    writeAtomic(path, lambda f: json.dump(data, f, indent=indent))
@@ -0,0 +1,127 @@
+from collections import namedtuple
+
+# Key names used in preset files -> macOS virtual keycodes (ANSI layout, as
+# in Carbon's Events.h), and chords: a key plus modifiers, written as
+# "ctrl+shift+f5". Chords are parsed once, interned (equal chords are the same
+# object) and cached by the exact string, so looking one up again at load time
+# is a single dict hit and nothing downstream handles strings.
+
+KEYCODES = {
+    # Letters and digits
+    "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
+    "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
+    "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
+    "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
+    "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
+    "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
+    "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
+    "m": 0x2E,
+
+    # Punctuation
+    "=": 0x18, "-": 0x1B, "]": 0x1E, "[": 0x21, "'": 0x27,
+    ";": 0x29, "\\": 0x2A, ",": 0x2B, "/": 0x2C, ".": 0x2F,
+    "`": 0x32,
+
+    # Editing and navigation
+    "space": 0x31, "escape": 0x35, "tab": 0x30, "return": 0x24,
+    "delete": 0x33, "forwarddelete": 0x75, "help": 0x72,
+    "home": 0x73, "end": 0x77, "pageup": 0x74, "pagedown": 0x79,
+    "up": 0x7E, "down": 0x7D, "left": 0x7B, "right": 0x7C,
+
+    # Modifiers as keys of their own
+    "command": 0x37, "shift": 0x38, "capslock": 0x39, "option": 0x3A,
+    "control": 0x3B, "rightcommand": 0x36, "rightshift": 0x3C,
+    "rightoption": 0x3D, "rightcontrol": 0x3E, "fn": 0x3F,
+
+    # Function keys
+    "f1": 0x7A, "f2": 0x78, "f3": 0x63, "f4": 0x76, "f5": 0x60,
+    "f6": 0x61, "f7": 0x62, "f8": 0x64, "f9": 0x65, "f10": 0x6D,
+    "f11": 0x67, "f12": 0x6F, "f13": 0x69, "f14": 0x6B, "f15": 0x71,
+    "f16": 0x6A, "f17": 0x40, "f18": 0x4F, "f19": 0x50, "f20": 0x5A,
+
+    # Numeric keypad
+    "num0": 0x52, "num1": 0x53, "num2": 0x54, "num3": 0x55, "num4": 0x56,
+    "num5": 0x57, "num6": 0x58, "num7": 0x59, "num8": 0x5B, "num9": 0x5C,
+    "num.": 0x41, "num*": 0x43, "num+": 0x45, "num-": 0x4E, "num/": 0x4B,
+    "num=": 0x51, "numenter": 0x4C, "numclear": 0x47,
+
+    # Media
+    "volumeup": 0x48, "volumedown": 0x49, "mute": 0x4A,
+}
+
+ALIASES = {
+    "esc": "escape", "enter": "return", "backspace": "delete", "del": "forwarddelete",
+    "pgup": "pageup", "pgdn": "pagedown", "caps": "capslock",
+    "cmd": "command", "ctrl": "control", "alt": "option", "opt": "option",
+    "equal": "=", "minus": "-", "rightbracket": "]", "leftbracket": "[", "quote": "'",
+    "semicolon": ";", "backslash": "\\", "comma": ",", "slash": "/", "period": ".",
+    "grave": "`",
+    "keypad0": "num0", "keypad1": "num1", "keypad2": "num2", "keypad3": "num3",
+    "keypad4": "num4", "keypad5": "num5", "keypad6": "num6", "keypad7": "num7",
+    "keypad8": "num8", "keypad9": "num9", "keypadenter": "numenter",
+}
+
+# CGEventFlags masks (kCGEventFlagMask*), by canonical modifier name
+MODIFIER_FLAGS = {
+    "shift": 0x00020000,
+    "control": 0x00040000,
+    "option": 0x00080000,
+    "command": 0x00100000,
+    "fn": 0x00800000,
+}
+
+# Canonical order modifiers are written in
+_MODIFIER_ORDER = ("control", "option", "shift", "command", "fn")
+
+NO_KEYCODE = -1
+
+# name is the canonical spelling, e.g. "control+shift+f5"
+Chord = namedtuple('Chord', ['keycode', 'flags', 'name'])
+
+NO_CHORD = Chord(NO_KEYCODE, 0, None)
+
+_interned = {}  # canonical name -> Chord
+_chords = {}    # any spelling seen so far -> Chord (or NO_CHORD)
+
+
+def _canonical(token):
+    token = token.strip().lower()
+    return ALIASES.get(token, token)
+
+
+def parseChord(text):
+    """Chord for "mod+mod+key" (or a single key name), or NO_CHORD if it isn't one."""
+    tokens = text.split("+")
+    # A trailing "+" names the keypad plus written as "num+"
+    if len(tokens) > 1 and tokens[-1] == "" and tokens[-2].strip().lower() in ("num", "keypad"):
+        tokens[-2:] = ["num+"]
+    *modifiers, key = [_canonical(token) for token in tokens]
+
+    keycode = KEYCODES.get(key, NO_KEYCODE)
+    if keycode == NO_KEYCODE:
+        return NO_CHORD
+    flags = 0
+    for modifier in modifiers:
+        flag = MODIFIER_FLAGS.get(modifier)
+        if flag is None:
+            return NO_CHORD
+        flags |= flag
+
+    name = "+".join([m for m in _MODIFIER_ORDER if flags & MODIFIER_FLAGS[m]] + [key])
+    chord = _interned.get(name)
+    if chord is None:
+        chord = _interned[name] = Chord(keycode, flags, name)
+    return chord
+
+
+def chordFor(text):
+    """Cached parseChord; anything that isn't a string is NO_CHORD."""
+    chord = _chords.get(text) if isinstance(text, str) else NO_CHORD
+    if chord is None:
+        chord = _chords[text] = parseChord(text)
+    return chord
+
+
+def keycodeFor(name):
+    """Keycode for a key name (or chord), or NO_KEYCODE if the name is unknown."""
+    return chordFor(name).keycode
@@ -0,0 +1,197 @@
+import time
+
+from core.inputSequence import KEY_DOWN
+from core.journal import writeJsonAtomic
+
+# End-to-end input latency tracing. With tracing on (config "latency_trace"),
+# each stage between the headmouse moving and the game getting the key feeds
+# a histogram:
+#
+#     event     NSEvent timestamp -> PanelView's mouse handler
+#     dwell     dwell deadline -> the dwell timer firing on the main thread
+#     trigger   dwell completing -> the key handed to the output pipeline
+#     queue     submitted -> the poster thread taking it
+#     post      CGEvent created and posted
+#     endToEnd  dwell deadline -> key down posted
+#
+# Call sites check the module-level tracer and skip everything when it is
+# None, so tracing off costs one attribute lookup per event:
+#
+#     tracer = latency.tracer
+#     if tracer is not None:
+#         tracer.record(latency.DWELL, late)
+#
+# Each histogram is written from one thread (main: event, dwell, trigger;
+# poster: queue, post, endToEnd), so recording takes no lock.
+
+EVENT = "event"
+DWELL = "dwell"
+TRIGGER = "trigger"
+QUEUE = "queue"
+POST = "post"
+END_TO_END = "endToEnd"
+
+STAGES = (EVENT, DWELL, TRIGGER, QUEUE, POST, END_TO_END)
+
+SUB_BUCKET_BITS = 5        # 32 buckets per power of two: values within ~3%
+HIGHEST_MICROS = 60000000  # 60 s; anything slower is counted as 60 s
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+TRACE_FILE = "latency.json"  # in resources/, written on quit and from Global Config
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations, in whole microseconds.
+
+    Values below 2 * 2**SUB_BUCKET_BITS µs get a bucket each; above that,
+    every power of two is split into 2**SUB_BUCKET_BITS buckets, so a
+    percentile is off by at most ~1/32 of its value however long it is.
+    """
+
+    def __init__(self, subBucketBits=SUB_BUCKET_BITS, highest=HIGHEST_MICROS):
+        self.bits = subBucketBits
+        self.linear = 2 << subBucketBits  # values below this are exact
+        self.highest = highest
+        self.counts = [0] * (self._index(highest) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = highest
+        self.max = 0
+
+    def record(self, seconds):
+        value = int(seconds * 1000000)
+        if value < self.linear:
+            if value < 0:
+                value = 0  # clocks compared across threads can disagree by a tick
+            index = value
+        else:
+            if value > self.highest:
+                value = self.highest
+            shift = value.bit_length() - self.bits - 1
+            index = (shift << self.bits) + (value >> shift)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """Microseconds at or below which a q (0-1) share of values fall."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.999999))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._highestIn(index), self.max)
+        return self.max
+
+    def summary(self):
+        result = {
+            "count": self.count,
+            "minUs": self.min if self.count else 0,
+            "meanUs": round(self.total / self.count, 1) if self.count else 0,
+            "maxUs": self.max,
+        }
+        for q in PERCENTILES:
+            result[f"p{q * 100:g}Us"] = self.percentile(q)
+        return result
+
+    def clear(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0
+        self.min = self.highest
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.linear:
+            return value
+        shift = value.bit_length() - self.bits - 1
+        return (shift << self.bits) + (value >> shift)
+
+    def _highestIn(self, index):
+        if index < self.linear:
+            return index
+        shift = (index >> self.bits) - 1
+        sub = index - (shift << self.bits)
+        return ((sub + 1) << shift) - 1
+
+
+class LatencyTracer:
+    def __init__(self):
+        self.started = time.time()
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.origins = {}  # keycode -> dwell deadline of the press on its way out
+
+    def record(self, stage, seconds):
+        self.histograms[stage].record(seconds)
+
+    def begin(self, keycode, origin):
+        """A press of keycode is under way; its down being posted ends the endToEnd span."""
+        if origin is not None:
+            self.origins[keycode] = origin
+
+    def cancel(self, keycode):
+        """The press won't post a down (the key was already down)."""
+        self.origins.pop(keycode, None)
+
+    def posted(self, step, submitted, start, done):
+        """The output pipeline posted step: queued at submitted, posted from start to done."""
+        histograms = self.histograms
+        histograms[QUEUE].record(start - submitted)
+        histograms[POST].record(done - start)
+        if step.kind == KEY_DOWN:
+            origin = self.origins.pop(step.value, None)
+            if origin is not None:
+                histograms[END_TO_END].record(done - origin)
+
+    def report(self):
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def export(self, path):
+        """Write the report (percentiles per stage, in µs) as JSON."""
+        writeJsonAtomic(path, {
+            "started": self.started,
+            "exported": time.time(),
+            "stages": self.report(),
+        })
+        print(f"Latency trace written to {path}")
+
+    def clear(self):
+        for histogram in self.histograms.values():
+            histogram.clear()
+        self.origins.clear()
+        self.started = time.time()
+
+
+# None while tracing is off; call sites test this before doing any work
+tracer = None
+
+
+def enableTracing():
+    global tracer
+    if tracer is None:
+        tracer = LatencyTracer()
+    return tracer
+
+
+def disableTracing():
+    global tracer
+    tracer = None
+
+
+def exportTrace(path):
+    """Write the current trace to path; False if tracing is off."""
+    if tracer is None:
+        return False
+    try:
+        tracer.export(path)
+    except OSError as e:
+        print(f"Failed to write latency trace {path}: {e}")
+        return False
+    return True
@@ -0,0 +1,107 @@
+from core.keymap import chordFor, NO_KEYCODE, MODIFIER_FLAGS, KEYCODES
+from core.inputSequence import keyDown, keyUp, wait, compileSequence
+
+# Macro actions: an action with a "macro" list plays a timed key sequence
+# instead of holding its key, e.g. hold shift, tap 1-2-3, release:
+#
+#     {"key": "combo", "x": 0, "y": 0,
+#      "macro": [{"press": "shift"}, "1", "2", "3", {"release": "shift"}]}
+#
+# Items:
+#     "f5" / {"tap": "ctrl+f5"}      tap a key or chord
+#         "hold": s                    how long it stays down (default TAP_HOLD)
+#         "repeat": n, "gap": s        tap n times, gap s between taps
+#     {"press": "shift"}             key down (held until released)
+#     {"release": "shift"}           key up
+#     {"delay": s}                   wait
+#
+# compileMacro turns the list into a core.inputSequence Timeline at load
+# time; keys still held at the end are released there. Modifiers that are
+# held (pressed and not yet released) are ORed into the flags of every key
+# event until their release: events posted to a pid don't pick up modifier
+# state from an earlier keyDown, so "hold shift, tap 1" must carry shift itself.
+
+TAP_HOLD = 0.02
+TAP_GAP = 0.03
+MAX_REPEAT = 100
+MAX_DELAY = 10.0
+
+_VERBS = ("tap", "press", "release", "delay")
+
+
+def _seconds(value, what):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{what} {value!r} is not a number")
+    if not 0 <= value <= MAX_DELAY:
+        raise ValueError(f"{what} {value} is outside 0-{MAX_DELAY} s")
+    return float(value)
+
+
+# Keycodes of the modifier keys -> their CGEventFlags mask
+_MODIFIER_KEYS = {KEYCODES[name]: flag for name, flag in MODIFIER_FLAGS.items()}
+_MODIFIER_KEYS.update({KEYCODES["right" + name]: flag
+                       for name, flag in MODIFIER_FLAGS.items() if "right" + name in KEYCODES})
+
+
+def _chord(name, n):
+    chord = chordFor(name)
+    if chord.keycode == NO_KEYCODE:
+        raise ValueError(f"step {n} has unknown key {name!r}")
+    return chord
+
+
+def compileMacro(spec, warn=None):
+    """Timeline for a macro list; ValueError if it can't be compiled, warn(message) for fix-ups."""
+    if not isinstance(spec, list):
+        raise ValueError(f"macro must be a list, got {type(spec).__name__}")
+
+    steps = []
+    held = {}  # keycode -> chord, in press order
+
+    def heldFlags():
+        flags = 0
+        for keycode, chord in held.items():
+            flags |= chord.flags | _MODIFIER_KEYS.get(keycode, 0)
+        return flags
+
+    for n, item in enumerate(spec, 1):
+        if isinstance(item, str):
+            item = {"tap": item}
+        if not isinstance(item, dict):
+            raise ValueError(f"step {n} must be a key name or an object")
+        verbs = [verb for verb in _VERBS if verb in item]
+        if len(verbs) != 1:
+            raise ValueError(f"step {n} needs exactly one of {', '.join(_VERBS)}")
+        verb = verbs[0]
+
+        if verb == "delay":
+            steps.append(wait(_seconds(item["delay"], f"step {n} delay")))
+        elif verb == "press":
+            chord = _chord(item["press"], n)
+            held[chord.keycode] = chord
+            steps.append(keyDown(chord.keycode, heldFlags()))
+        elif verb == "release":
+            chord = _chord(item["release"], n)
+            if held.pop(chord.keycode, None) is None and warn is not None:
+                warn(f"step {n} releases {item['release']!r}, which isn't held")
+            steps.append(keyUp(chord.keycode, heldFlags()))
+        else:
+            chord = _chord(item["tap"], n)
+            hold = _seconds(item.get("hold", TAP_HOLD), f"step {n} hold")
+            gap = _seconds(item.get("gap", TAP_GAP), f"step {n} gap")
+            repeat = item.get("repeat", 1)
+            if isinstance(repeat, bool) or not isinstance(repeat, int) or not 1 <= repeat <= MAX_REPEAT:
+                raise ValueError(f"step {n} repeat {repeat!r} is outside 1-{MAX_REPEAT}")
+            flags = chord.flags | heldFlags()
+            for i in range(repeat):
+                if i:
+                    steps.append(wait(gap))
+                steps += (keyDown(chord.keycode, flags), wait(hold), keyUp(chord.keycode, flags))
+
+    if held:
+        if warn is not None:
+            warn(f"{', '.join(chord.name for chord in held.values())} still held at the end, released")
+        for keycode in reversed(list(held)):
+            del held[keycode]
+            steps.append(keyUp(keycode, heldFlags()))
+    return compileSequence(steps)
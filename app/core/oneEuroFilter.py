@@ -0,0 +1,65 @@
+import math
+
+# One Euro filter (Casiez, Roussel, Vogel, CHI 2012): a low-pass filter whose
+# cutoff rises with speed, so a still head's jitter is smoothed heavily while
+# deliberate moves come through with little lag.
+#
+# minCutoff (Hz) sets the smoothing at rest, beta how fast the cutoff opens up
+# with speed (per unit/s), dCutoff (Hz) the smoothing of the speed estimate.
+
+DEFAULT_MIN_CUTOFF = 1.0
+DEFAULT_BETA = 0.007
+DEFAULT_D_CUTOFF = 1.0
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    __slots__ = ('minCutoff', 'beta', 'dCutoff', 'value', 'speed', 'time')
+
+    def __init__(self, minCutoff=DEFAULT_MIN_CUTOFF, beta=DEFAULT_BETA, dCutoff=DEFAULT_D_CUTOFF):
+        self.minCutoff = minCutoff
+        self.beta = beta
+        self.dCutoff = dCutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.speed = 0.0
+        self.time = None
+
+    def filter(self, value, t):
+        if self.time is None:
+            self.value = value
+            self.time = t
+            return value
+
+        dt = t - self.time
+        if dt <= 0:
+            return self.value
+        self.time = t
+
+        rawSpeed = (value - self.value) / dt
+        self.speed += _alpha(self.dCutoff, dt) * (rawSpeed - self.speed)
+        cutoff = self.minCutoff + self.beta * abs(self.speed)
+        self.value += _alpha(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class OneEuroFilter2D:
+    """Filters cursor positions, one OneEuroFilter per axis."""
+    __slots__ = ('fx', 'fy')
+
+    def __init__(self, minCutoff=DEFAULT_MIN_CUTOFF, beta=DEFAULT_BETA, dCutoff=DEFAULT_D_CUTOFF):
+        self.fx = OneEuroFilter(minCutoff, beta, dCutoff)
+        self.fy = OneEuroFilter(minCutoff, beta, dCutoff)
+
+    def reset(self):
+        self.fx.reset()
+        self.fy.reset()
+
+    def filter(self, x, y, t):
+        return self.fx.filter(x, t), self.fy.filter(y, t)
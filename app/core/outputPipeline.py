@@ -0,0 +1,155 @@
+import time
+import threading
+from collections import deque
+
+from core.inputSequence import KEY_UP, MOUSE_UP
+from core import latency
+
+# Every synthesized event leaves through here. Callers (UI thread, scheduler
+# threads) only append a Step to a bounded FIFO; one poster thread drains it
+# in batches and hands each step to the sink, so events are posted in exactly
+# the order they were submitted (a key's up never overtakes its down) and
+# nothing creates CGEvents on the thread that asked for them.
+#
+# When the queue is full new downs are dropped, but ups are always queued:
+# dropping one would leave a key stuck in the game.
+
+QUEUE_CAPACITY = 256
+BATCH_SIZE = 32  # steps taken off the queue per lock acquisition
+
+
+class OutputPipeline:
+    def __init__(self, sink, capacity=QUEUE_CAPACITY, batchSize=BATCH_SIZE, clock=time.monotonic):
+        """Posts submitted steps to sink.post(step) (see core.inputSink) from one thread."""
+        self.sink = sink
+        self.capacity = capacity
+        self.batchSize = batchSize
+        self.clock = clock
+        self.queue = deque()  # (submit time, step)
+        self.cond = threading.Condition()
+        self.busy = False     # the poster is posting a batch
+        self.stopped = False
+        self.thread = None
+
+        self.submitted = 0
+        self.posted = 0
+        self.dropped = 0
+        self.maxDepth = 0
+        self.totalLatency = 0.0
+        self.maxLatency = 0.0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="output", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Post what is queued, then end the poster thread."""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, step):
+        """Queue one step; False if it was dropped because the queue is full."""
+        with self.cond:
+            return self._enqueue(step, self.clock())
+
+    def submitAll(self, steps):
+        """Queue several steps back to back (nothing else is interleaved); how many were queued."""
+        with self.cond:
+            now = self.clock()
+            return sum(self._enqueue(step, now) for step in steps)
+
+    # A pipeline is itself a sink, so a SequenceExecutor can post through it
+    post = submit
+
+    def depth(self):
+        return len(self.queue)
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far has been posted."""
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.queue and not self.busy, timeout)
+
+    def metrics(self):
+        with self.cond:
+            return {
+                "depth": len(self.queue),
+                "maxDepth": self.maxDepth,
+                "submitted": self.submitted,
+                "posted": self.posted,
+                "dropped": self.dropped,
+                "meanLatency": self.totalLatency / self.posted if self.posted else 0.0,
+                "maxLatency": self.maxLatency,
+            }
+
+    def _enqueue(self, step, now):
+        # Callers hold self.cond
+        queue = self.queue
+        if len(queue) >= self.capacity and step.kind not in (KEY_UP, MOUSE_UP):
+            self.dropped += 1
+            return False
+        queue.append((now, step))
+        self.submitted += 1
+        if len(queue) > self.maxDepth:
+            self.maxDepth = len(queue)
+        if len(queue) == 1:
+            self.cond.notify_all()
+        return True
+
+    def _run(self):
+        queue = self.queue
+        post = self.sink.post
+        clock = self.clock
+        while True:
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()  # wake flush()
+                while not queue and not self.stopped:
+                    self.cond.wait()
+                if not queue:
+                    return
+                count = min(len(queue), self.batchSize)
+                batch = [queue.popleft() for _ in range(count)]
+                self.busy = True
+
+            tracer = latency.tracer
+            latencies = []
+            for submitted, step in batch:
+                if tracer is not None:
+                    start = clock()
+                try:
+                    post(step)
+                except Exception as e:
+                    print(f"Output pipeline: failed to post {step}: {e}")
+                done = clock()
+                latencies.append(done - submitted)
+                if tracer is not None:
+                    tracer.posted(step, submitted, start, done)
+
+            with self.cond:
+                self.posted += count
+                self.totalLatency += sum(latencies)
+                self.maxLatency = max(self.maxLatency, max(latencies))
+
+
+_shared = None
+
+
+def sharedOutputPipeline():
+    """The pipeline posting through Quartz (needs PyObjC)."""
+    global _shared
+    if _shared is None:
+        from core.inputSink import QuartzInputSink
+        _shared = OutputPipeline(QuartzInputSink())
+        _shared.start()
+    return _shared
+
+
+def stopSharedOutputPipeline():
+    """Post whatever is still queued and end the poster thread (on quit)."""
+    if _shared is not None:
+        _shared.stop()
@@ -0,0 +1,122 @@
+import os
+import pickle
+import hashlib
+import threading
+
+# On-disk cache of parsed presets, so reopening an unchanged preset is a
+# pickle.load instead of json.load + PresetData.fromJson. Entries are keyed by
+# source path and validated against its mtime/size. The directory is kept
+# under maxBytes by evicting the least recently used entries (each hit bumps
+# the entry file's mtime).
+
+CACHE_VERSION = 2  # bump when PresetData's layout (or how keys resolve) changes
+
+
+class PresetCache:
+    def __init__(self, cacheDir, maxBytes=16 * 1024 * 1024):
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        self.usedBytes = None  # measured on first write
+        self.hits = 0
+        self.misses = 0
+        # The loader reads presets from several threads at once
+        self.lock = threading.Lock()
+
+    def _entryPath(self, sourcePath):
+        digest = hashlib.sha1(os.path.abspath(sourcePath).encode()).hexdigest()
+        return os.path.join(self.cacheDir, digest + ".pickle")
+
+    def get(self, sourcePath, stat):
+        """Cached preset for sourcePath if it still matches stat, else None."""
+        entryPath = self._entryPath(sourcePath)
+        try:
+            with open(entryPath, 'rb') as f:
+                version, path, mtime, size, data = pickle.load(f)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except Exception as e:
+            print(f"Dropping unreadable cache entry for {os.path.basename(sourcePath)}: {e}")
+            self._remove(entryPath)
+            self._count(hit=False)
+            return None
+
+        if (version != CACHE_VERSION or path != os.path.abspath(sourcePath)
+                or mtime != stat.st_mtime_ns or size != stat.st_size):
+            self._count(hit=False)
+            return None
+
+        try:
+            os.utime(entryPath)  # mark as recently used
+        except OSError:
+            pass
+        self._count(hit=True)
+        return data
+
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, sourcePath, stat, data):
+        entryPath = self._entryPath(sourcePath)
+        record = (CACHE_VERSION, os.path.abspath(sourcePath), stat.st_mtime_ns, stat.st_size, data)
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            oldSize = os.path.getsize(entryPath) if os.path.exists(entryPath) else 0
+            tmpPath = entryPath + ".tmp"
+            with open(tmpPath, 'wb') as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpPath, entryPath)
+            newSize = os.path.getsize(entryPath)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Failed to cache {os.path.basename(sourcePath)}: {e}")
+            return
+
+        with self.lock:
+            if self.usedBytes is None:
+                self.usedBytes = self._measure()
+            else:
+                self.usedBytes += newSize - oldSize
+
+            if self.usedBytes > self.maxBytes:
+                self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in maxBytes.
+
+        Called with self.lock held.
+        """
+        entries = []
+        try:
+            with os.scandir(self.cacheDir) as it:
+                for d in it:
+                    if d.name.endswith(".pickle"):
+                        stat = d.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, d.path))
+        except FileNotFoundError:
+            return
+
+        entries.sort()
+        used = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if used <= self.maxBytes:
+                break
+            self._remove(path)
+            used -= size
+        self.usedBytes = used
+
+    def _measure(self):
+        try:
+            with os.scandir(self.cacheDir) as it:
+                return sum(d.stat().st_size for d in it if d.name.endswith(".pickle"))
+        except FileNotFoundError:
+            return 0
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
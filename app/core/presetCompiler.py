@@ -0,0 +1,161 @@
+from collections import namedtuple
+
+from core.keymap import NO_KEYCODE, chordFor
+from core.macro import compileMacro
+from core.turbo import parseTurbo
+from core.presetData import ACTION_STRIDE, X, Y, W, H, KEYCODE
+
+# Validates a PresetData tree once and turns it into immutable tuples the
+# views can lay out directly: grid sizes clamped, key names resolved to
+# keycodes and chords, and each action's span precomputed as fractions of the panel.
+# Problems are collected as issues instead of surfacing during layout.
+
+MAX_GRID = 64
+MIN_PANEL_SIZE = 50.0
+
+CompiledAction = namedtuple('CompiledAction', [
+    'index',     # position in the panel's ActionList
+    'key', 'keycode',
+    'chord',     # interned core.keymap.Chord: keycode plus modifier flags
+    'x', 'y', 'w', 'h',                  # grid cells, clamped to the grid
+    'left', 'top', 'spanW', 'spanH',     # same span as fractions of the panel
+    'macro',     # core.inputSequence Timeline for a "macro" action, else None
+    'turbo',     # core.turbo TurboSpec for a "turbo" action, else None
+])
+
+# target is the preset's "target_app" (see core.targetProcess), or None for the frontmost app
+CompiledPanel = namedtuple('CompiledPanel', ['width', 'height', 'frame', 'actions', 'target'])
+
+CompiledPreset = namedtuple('CompiledPreset', ['name', 'panels', 'issues', 'target'])
+
+CompileIssue = namedtuple('CompileIssue', ['panel', 'action', 'message'])
+
+
+def _gridSize(value, name, panelIndex, issues):
+    if not isinstance(value, int) or isinstance(value, bool):
+        issues.append(CompileIssue(panelIndex, None, f"{name} {value!r} is not an integer, using 1"))
+        return 1
+    if value < 1:
+        issues.append(CompileIssue(panelIndex, None, f"{name} {value} is below 1, clamped"))
+        return 1
+    if value > MAX_GRID:
+        issues.append(CompileIssue(panelIndex, None, f"{name} {value} is above {MAX_GRID}, clamped"))
+        return MAX_GRID
+    return value
+
+
+def _frame(panelData, panelIndex, issues):
+    try:
+        x = float(panelData.screen_x)
+        y = float(panelData.screen_y)
+        w = float(panelData.screen_width)
+        h = float(panelData.screen_height)
+    except (TypeError, ValueError):
+        issues.append(CompileIssue(panelIndex, None, "window geometry is not numeric, using defaults"))
+        return (50.0, 500.0, 500.0, 500.0)
+    if w < MIN_PANEL_SIZE or h < MIN_PANEL_SIZE:
+        issues.append(CompileIssue(panelIndex, None, f"window size {w}x{h} too small, clamped"))
+        w = max(w, MIN_PANEL_SIZE)
+        h = max(h, MIN_PANEL_SIZE)
+    return (x, y, w, h)
+
+
+def _target(presetData, issues):
+    target = presetData.extra.get("target_app")
+    if target is None or (isinstance(target, str) and target):
+        return target
+    issues.append(CompileIssue(None, None, f"target_app {target!r} is not an application name, ignored"))
+    return None
+
+
+def _macro(spec, panelIndex, actionIndex, issues):
+    def warn(message):
+        issues.append(CompileIssue(panelIndex, actionIndex, f"macro: {message}"))
+    try:
+        return compileMacro(spec, warn)
+    except ValueError as e:
+        warn(f"{e}, action disabled")
+        return None
+
+
+def _turbo(spec, panelIndex, actionIndex, issues):
+    try:
+        return parseTurbo(spec)
+    except ValueError as e:
+        issues.append(CompileIssue(panelIndex, actionIndex, f"{e}, turbo off"))
+        return None
+
+
+def compilePanel(panelData, panelIndex=0, issues=None, target=None):
+    if issues is None:
+        issues = []
+
+    width = _gridSize(panelData.width, "width", panelIndex, issues)
+    height = _gridSize(panelData.height, "height", panelIndex, issues)
+
+    actions = []
+    cells = panelData.actions.cells
+    keys = panelData.actions.keys
+    extras = panelData.actions.extras
+    for i, key in enumerate(keys):
+        base = i * ACTION_STRIDE
+        x, y, w, h = cells[base + X], cells[base + Y], cells[base + W], cells[base + H]
+        keycode = cells[base + KEYCODE]
+
+        extra = extras.get(i, ())
+        macro = turbo = None
+        if "macro" in extra:
+            # key is only the label of a macro action
+            macro = _macro(extra["macro"], panelIndex, i, issues)
+            if "turbo" in extra:
+                issues.append(CompileIssue(panelIndex, i, "turbo is ignored on a macro action"))
+        elif keycode == NO_KEYCODE:
+            issues.append(CompileIssue(panelIndex, i, f"unknown key {key!r}"))
+        elif "turbo" in extra:
+            turbo = _turbo(extra["turbo"], panelIndex, i, issues)
+        if not (0 <= x < width and 0 <= y < height):
+            # Left out rather than laid out off-panel; widening the grid brings it back
+            issues.append(CompileIssue(panelIndex, i,
+                                       f"action {key!r} at ({x}, {y}) is outside the {width}x{height} grid"))
+            continue
+        if w < 1 or h < 1 or x + w > width or y + h > height:
+            issues.append(CompileIssue(panelIndex, i, f"action {key!r} size {w}x{h} clamped to the grid"))
+            w = min(max(w, 1), width - x)
+            h = min(max(h, 1), height - y)
+
+        actions.append(CompiledAction(i, key, keycode, chordFor(key), x, y, w, h,
+                                      x / width, y / height, w / width, h / height, macro, turbo))
+
+    return CompiledPanel(width, height, _frame(panelData, panelIndex, issues), tuple(actions), target)
+
+
+def compilePreset(presetData):
+    issues = []
+    target = _target(presetData, issues)
+    panels = tuple(compilePanel(p, i, issues, target) for i, p in enumerate(presetData.panels))
+    return CompiledPreset(presetData.name, panels, tuple(issues), target)
+
+
+def compiledFor(presetData):
+    """The compiled form of a preset, compiled on first use.
+
+    Model drops it whenever the preset is edited, so this recompiles lazily.
+    """
+    compiled = getattr(presetData, '_compiled', None)
+    if compiled is None:
+        compiled = compilePreset(presetData)
+        presetData._compiled = compiled
+    return compiled
+
+
+def invalidate(presetData):
+    presetData._compiled = None
+
+
+def formatIssue(issue):
+    if issue.panel is None:
+        return f"preset: {issue.message}"
+    where = f"panel {issue.panel + 1}"
+    if issue.action is not None:
+        where += f", action {issue.action + 1}"
+    return f"{where}: {issue.message}"
@@ -0,0 +1,238 @@
+from array import array
+from core.tracking import Tracked
+from core.keymap import keycodeFor, chordFor
+
+# Typed preset tree, replacing the SimpleNamespace objects json.load used to
+# build. Defaults are applied once here at load time so views can read fields
+# directly. A panel's actions are packed into one int array, ACTION_STRIDE
+# ints per action (x, y, w, h, keycode), instead of one object per action.
+
+ACTION_STRIDE = 5
+X, Y, W, H, KEYCODE = range(ACTION_STRIDE)
+
+CELL_MIN = -2 ** 31  # range of an array('i') cell
+CELL_MAX = 2 ** 31 - 1
+
+_ACTION_KEYS = frozenset(("key", "x", "y", "w", "h"))
+
+PANEL_DEFAULTS = {
+    "width": 1,
+    "height": 1,
+    "screen_x": 50,
+    "screen_y": 500,
+    "screen_width": 500,
+    "screen_height": 500,
+}
+
+
+def _fitsCell(value):
+    try:
+        return CELL_MIN <= int(value) <= CELL_MAX
+    except OverflowError:
+        return False  # inf
+
+
+def _wholeCell(value):
+    try:
+        cell = int(value)
+    except (TypeError, ValueError):
+        cell = None
+    if cell is None or cell != value:
+        raise ValueError(f"action coordinate {value!r} is not a whole number")
+    return cell
+
+
+def _expectDict(data, what):
+    if not isinstance(data, dict):
+        raise ValueError(f"{what} must be an object, got {type(data).__name__}")
+
+
+class ActionData:
+    """One action, materialised from an ActionList when something needs an object."""
+    __slots__ = ('key', 'x', 'y', 'w', 'h', 'keycode', 'extra')
+
+    def __init__(self, key, x=0, y=0, w=1, h=1, keycode=None, extra=None):
+        self.key = key
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.keycode = keycodeFor(key) if keycode is None else keycode
+        self.extra = extra
+
+    def toJson(self):
+        d = {"key": self.key, "x": self.x, "y": self.y, "w": self.w, "h": self.h}
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __repr__(self):
+        return f"ActionData(key={self.key!r}, x={self.x}, y={self.y}, w={self.w}, h={self.h})"
+
+
+class ActionList:
+    """A panel's actions as a packed array of cells plus their key names."""
+    __slots__ = ('cells', 'keys', 'extras')
+
+    def __init__(self):
+        self.cells = array('i')
+        self.keys = []
+        self.extras = {}  # index -> unknown JSON fields, only for actions that have any
+
+    @classmethod
+    def fromJson(cls, items):
+        if not isinstance(items, list):
+            raise ValueError(f"actions must be a list, got {type(items).__name__}")
+        actions = cls()
+        keys = actions.keys
+        flat = []
+        known = _ACTION_KEYS.issuperset
+        chords = chordFor
+        # One pass over the dicts; this is the bulk of preset parsing
+        for item in items:
+            if type(item) is not dict:
+                _expectDict(item, "action")
+            key = item.get("key")
+            if not known(item):
+                actions.extras[len(keys)] = {k: v for k, v in item.items() if k not in _ACTION_KEYS}
+            keys.append(key)
+            flat += (item.get("x", 0), item.get("y", 0), item.get("w", 1), item.get("h", 1),
+                     chords(key).keycode)
+        try:
+            try:
+                actions.cells = array('i', flat)
+            except TypeError:
+                # Float coordinates (e.g. 1.0 written by hand); 1.5 is an error, not 1
+                actions.cells = array('i', map(_wholeCell, flat))
+        except OverflowError:
+            # A ValueError makes this one file a load error instead of stopping startup
+            bad = next(v for v in flat if not _fitsCell(v))
+            raise ValueError(f"action coordinate {bad!r} is out of range") from None
+        return actions
+
+    def append(self, action):
+        if action.extra:
+            self.extras[len(self.keys)] = action.extra
+        self.keys.append(action.key)
+        self.cells.extend((action.x, action.y, action.w, action.h, action.keycode))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.keys)
+        if not 0 <= i < len(self.keys):
+            raise IndexError("action index out of range")
+        base = i * ACTION_STRIDE
+        c = self.cells
+        return ActionData(self.keys[i], c[base + X], c[base + Y], c[base + W], c[base + H],
+                          c[base + KEYCODE], self.extras.get(i))
+
+    def __iter__(self):
+        for i in range(len(self.keys)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, ActionList):
+            return NotImplemented
+        return self.cells == other.cells and self.keys == other.keys and self.extras == other.extras
+
+    def toJson(self):
+        return [action.toJson() for action in self]
+
+    def __repr__(self):
+        return f"ActionList({list(self)!r})"
+
+
+class _Node(Tracked):
+    """Pickle support for the slotted nodes (used by the preset cache).
+
+    Only public fields are stored; tracking state is re-bound after load.
+    """
+    __slots__ = ()
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__
+                if name[0] != '_' and hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+class PanelData(_Node):
+    __slots__ = ('width', 'height', 'actions', 'screen_x', 'screen_y', 'screen_width',
+                 'screen_height', 'extra', '_root', '_path')
+
+    @classmethod
+    def fromJson(cls, data):
+        _expectDict(data, "panel")
+        data = dict(data)
+        panel = cls()
+        for name, default in PANEL_DEFAULTS.items():
+            setattr(panel, name, data.pop(name, default))
+        panel.actions = ActionList.fromJson(data.pop("actions", []))
+        panel.extra = data
+        return panel
+
+    def convert(self, name, value):
+        if name == "actions":
+            return ActionList.fromJson(value)
+        return value
+
+    def toJson(self):
+        d = {
+            "width": self.width,
+            "height": self.height,
+            "actions": self.actions.toJson(),
+            "screen_x": self.screen_x,
+            "screen_y": self.screen_y,
+            "screen_width": self.screen_width,
+            "screen_height": self.screen_height,
+        }
+        d.update(self.extra)
+        return d
+
+    def __repr__(self):
+        return (f"PanelData(width={self.width}, height={self.height}, "
+                f"actions={len(self.actions)}, screen=({self.screen_x}, {self.screen_y}, "
+                f"{self.screen_width}, {self.screen_height}))")
+
+
+class PresetData(_Node):
+    __slots__ = ('name', 'panels', 'filepath', 'extra',
+                 '_root', '_path', '_dirty', '_listener', '_compiled')
+
+    @classmethod
+    def fromJson(cls, data, filepath=None):
+        _expectDict(data, "preset")
+        data = dict(data)
+        preset = cls()
+        preset.name = data.pop("name", "Preset")
+        panels = data.pop("panels", [])
+        if not isinstance(panels, list):
+            raise ValueError(f"panels must be a list, got {type(panels).__name__}")
+        preset.panels = [PanelData.fromJson(p) for p in panels]
+        preset.filepath = filepath
+        preset.extra = data
+        return preset
+
+    def trackedChildren(self):
+        return [("panels", self.panels)]
+
+    def convert(self, name, value):
+        if name == "panels":
+            return [PanelData.fromJson(p) for p in value]
+        return value
+
+    def toJson(self):
+        d = {
+            "name": self.name,
+            "panels": [panel.toJson() for panel in self.panels],
+        }
+        d.update(self.extra)
+        return d
+
+    def __repr__(self):
+        return f"PresetData(name={self.name!r}, panels={len(self.panels)}, filepath={self.filepath!r})"
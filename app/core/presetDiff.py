@@ -0,0 +1,63 @@
+from collections import namedtuple
+
+from core.tracking import bind
+
+# Structural diff between the live copy of a preset and a freshly parsed one,
+# used to hot reload a preset file without tearing down its windows.
+
+PANEL_FIELDS = ('width', 'height', 'actions', 'screen_x', 'screen_y',
+                'screen_width', 'screen_height', 'extra')
+GEOMETRY_FIELDS = ('screen_x', 'screen_y', 'screen_width', 'screen_height')
+GRID_FIELDS = ('width', 'height', 'actions')
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+PanelDiff = namedtuple('PanelDiff', ['index', 'kind', 'fields'])
+PresetDiff = namedtuple('PresetDiff', ['fields', 'panels'])
+
+
+def diffPresets(old, new):
+    """Compare two PresetData trees panel by panel (panels are matched by position)."""
+    fields = tuple(f for f in ('name', 'extra') if getattr(old, f) != getattr(new, f))
+
+    panels = []
+    common = min(len(old.panels), len(new.panels))
+    for i in range(common):
+        a = old.panels[i]
+        b = new.panels[i]
+        changed = tuple(f for f in PANEL_FIELDS if getattr(a, f) != getattr(b, f))
+        if changed:
+            panels.append(PanelDiff(i, CHANGED, changed))
+    for i in range(common, len(new.panels)):
+        panels.append(PanelDiff(i, ADDED, PANEL_FIELDS))
+    # Highest index first, so callers can pop as they go
+    for i in reversed(range(common, len(old.panels))):
+        panels.append(PanelDiff(i, REMOVED, PANEL_FIELDS))
+
+    return PresetDiff(fields, panels)
+
+
+def isEmpty(diff):
+    return not diff.fields and not diff.panels
+
+
+def applyDiff(old, new, diff):
+    """Patch old in place so it matches new, keeping the existing PanelData objects."""
+    for f in diff.fields:
+        setattr(old, f, getattr(new, f))
+
+    for change in diff.panels:
+        if change.kind == CHANGED:
+            target = old.panels[change.index]
+            source = new.panels[change.index]
+            for f in change.fields:
+                setattr(target, f, getattr(source, f))
+        elif change.kind == ADDED:
+            old.panels.append(new.panels[change.index])
+        elif change.kind == REMOVED:
+            del old.panels[change.index]
+
+    # Panel indices may have shifted; refresh the tracking paths
+    bind(old, old)
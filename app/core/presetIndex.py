@@ -0,0 +1,130 @@
+import os
+import json
+
+# Persisted summary of the preset library, so startup only needs a stat()
+# per file instead of parsing every preset. Entries are revalidated against
+# mtime/size; the full preset is parsed the first time something opens it.
+
+
+class PresetEntry:
+    def __init__(self, filename, filepath, name, mtime, size, panelCount):
+        self.filename = filename
+        self.filepath = filepath
+        self.name = name
+        self.mtime = mtime
+        self.size = size
+        self.panelCount = panelCount
+        self.data = None  # parsed preset, filled in lazily
+
+    def matches(self, stat):
+        return self.mtime == stat.st_mtime_ns and self.size == stat.st_size
+
+    def update(self, data, stat):
+        """Refresh the summary from a parsed preset and its file stat."""
+        self.name = data.name
+        self.panelCount = len(data.panels)
+        self.mtime = stat.st_mtime_ns
+        self.size = stat.st_size
+
+    def toDict(self):
+        return {
+            "name": self.name,
+            "mtime": self.mtime,
+            "size": self.size,
+            "panelCount": self.panelCount,
+        }
+
+
+class PresetIndex:
+    def __init__(self, indexPath, presetDir):
+        self.indexPath = indexPath
+        self.presetDir = presetDir
+        self.entries = {}
+        self.changed = False
+
+    def load(self):
+        try:
+            with open(self.indexPath, 'r') as f:
+                raw = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raw = {}
+
+        self.entries = {}
+        for filename, e in raw.items():
+            try:
+                self.entries[filename] = PresetEntry(
+                    filename, os.path.join(self.presetDir, filename),
+                    e["name"], e["mtime"], e["size"], e["panelCount"]
+                )
+            except (KeyError, TypeError):
+                self.changed = True
+
+    def refresh(self, parseMany):
+        """Revalidate against the preset directory and return entries sorted by filename.
+
+        parseMany(paths) is only given new or modified files, in filename
+        order; it returns the parsed presets in the same order (None for files
+        that could not be read). Parsed presets are kept on their entries.
+        """
+        try:
+            with os.scandir(self.presetDir) as it:
+                files = sorted((d for d in it if d.name.endswith(".json") and d.is_file()),
+                               key=lambda d: d.name)
+        except FileNotFoundError:
+            print(f"Directory not found: {self.presetDir}")
+            files = []
+
+        seen = set()
+        stale = []
+        for dirEntry in files:
+            stat = dirEntry.stat()
+            entry = self.entries.get(dirEntry.name)
+            if entry is not None and entry.matches(stat):
+                seen.add(dirEntry.name)
+            else:
+                stale.append((dirEntry, stat))
+
+        parsed = parseMany([dirEntry.path for dirEntry, _ in stale]) if stale else []
+
+        for (dirEntry, stat), data in zip(stale, parsed):
+            entry = self.entries.get(dirEntry.name)
+            self.changed = True
+            if data is None:
+                continue
+
+            if entry is None:
+                entry = PresetEntry(dirEntry.name, dirEntry.path, None, 0, 0, 0)
+                self.entries[dirEntry.name] = entry
+            entry.update(data, stat)
+            entry.data = data
+            seen.add(dirEntry.name)
+
+        for filename in list(self.entries):
+            if filename not in seen:
+                del self.entries[filename]
+                self.changed = True
+
+        return [self.entries[name] for name in sorted(self.entries)]
+
+    def touch(self, entry):
+        """Re-stat an entry after its file was rewritten."""
+        try:
+            stat = os.stat(entry.filepath)
+        except OSError:
+            return
+        if entry.data is not None:
+            entry.update(entry.data, stat)
+        self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        data = {name: e.toDict() for name, e in self.entries.items()}
+        try:
+            tmpPath = f"{self.indexPath}.tmp"
+            with open(tmpPath, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmpPath, self.indexPath)
+            self.changed = False
+        except OSError as e:
+            print(f"Failed to save preset index: {e}")
@@ -0,0 +1,71 @@
+import os
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from core.presetData import PresetData
+
+# Reads and decodes preset files, fanning out over a thread pool when there
+# are enough of them. Results always come back in the order of the paths
+# passed in (filename order), so list positions / button tags stay stable.
+
+LoadError = namedtuple('LoadError', ['filename', 'path', 'error'])
+
+# Below this many files the pool costs more than it saves
+MIN_PARALLEL = 8
+
+
+def defaultWorkers():
+    # Decoding holds the GIL, so extra threads mostly overlap file reads
+    return min(8, os.cpu_count() or 1)
+
+
+def readPresetFile(path, cache=None):
+    """Read one preset, from the parsed-preset cache when it is still valid."""
+    stat = os.stat(path)
+    if cache is not None:
+        data = cache.get(path, stat)
+        if data is not None:
+            data.filepath = path
+            return data
+
+    with open(path, 'r') as file:
+        data = PresetData.fromJson(json.load(file), path)
+
+    if cache is not None:
+        cache.put(path, stat, data)
+    return data
+
+
+def loadPresetFiles(paths, cache=None, workers=None):
+    """Read every path. Returns (presets, errors).
+
+    presets lines up with paths (None where loading failed); errors is a list
+    of LoadError in the same order.
+    """
+    def read(path):
+        return readPresetFile(path, cache)
+
+    if workers is None:
+        workers = defaultWorkers()
+
+    if workers == 1 or len(paths) < MIN_PARALLEL:
+        outcomes = [_attempt(read, path) for path in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(lambda path: _attempt(read, path), paths))
+
+    presets = []
+    errors = []
+    for path, (data, error) in zip(paths, outcomes):
+        presets.append(data)
+        if error is not None:
+            errors.append(LoadError(os.path.basename(path), path, error))
+    return presets, errors
+
+
+def _attempt(read, path):
+    try:
+        return read(path), None
+    except (ValueError, TypeError, OSError) as e:
+        return None, e
@@ -0,0 +1,42 @@
+import os
+
+# Polls the preset directory for files edited outside the app.
+# Only stat() calls per poll; callers decide what to re-parse.
+
+
+class PresetWatcher:
+    def __init__(self, presetDir):
+        self.presetDir = presetDir
+        self.snapshot = {}  # filename -> (mtime_ns, size)
+
+    def reset(self, entries):
+        """Start from the state the preset index already knows about."""
+        self.snapshot = {e.filename: (e.mtime, e.size) for e in entries}
+
+    def acknowledge(self, path):
+        """Record a write the app made itself so it isn't reported as an outside edit."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self.snapshot[os.path.basename(path)] = (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self):
+        """Return (changed, added, removed) filenames since the last poll."""
+        current = {}
+        try:
+            with os.scandir(self.presetDir) as it:
+                for d in it:
+                    if d.name.endswith(".json") and d.is_file():
+                        stat = d.stat()
+                        current[d.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+
+        changed = sorted(name for name, sig in current.items()
+                         if name in self.snapshot and self.snapshot[name] != sig)
+        added = sorted(name for name in current if name not in self.snapshot)
+        removed = sorted(name for name in self.snapshot if name not in current)
+
+        self.snapshot = current
+        return changed, added, removed
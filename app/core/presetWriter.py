@@ -0,0 +1,98 @@
+import json
+
+from core.presetData import ACTION_STRIDE, X, Y, W, H
+
+# Streams a PresetData tree as JSON text, chunk by chunk, without building
+# the dicts and lists toJson() makes first. The output is byte for byte what
+# json.dump(preset.toJson(), f, indent=indent) writes; indent=None gives the
+# compact form (no whitespace) for files nobody edits by hand.
+
+PANEL_SCALARS = ('width', 'height')
+PANEL_GEOMETRY = ('screen_x', 'screen_y', 'screen_width', 'screen_height')
+
+_MAX_DEPTH = 6
+
+
+def writePreset(presetData, write, indent=4):
+    """Call write(text) with consecutive chunks of presetData's JSON (one or more per panel)."""
+    if indent is None:
+        pad = [''] * _MAX_DEPTH
+        colon = ':'
+    else:
+        pad = ['\n' + ' ' * (indent * depth) for depth in range(_MAX_DEPTH)]
+        colon = ': '
+    dump = _dumper(indent)
+
+    write('{' + pad[1] + '"name"' + colon + dump(presetData.name, 1) + ',' + pad[1] + '"panels"' + colon)
+    panels = presetData.panels
+    if panels:
+        write('[')
+        for i, panel in enumerate(panels):
+            write((',' if i else '') + pad[2])
+            _writePanel(panel, write, pad, colon, dump)
+        write(pad[1] + ']')
+    else:
+        write('[]')
+    write(_fields(presetData.extra, pad[1], colon, dump, 1) + pad[0] + '}')
+
+
+def _writePanel(panel, write, pad, colon, dump):
+    write('{' + ''.join(
+        (',' if i else '') + pad[3] + f'"{name}"' + colon + dump(getattr(panel, name), 3)
+        for i, name in enumerate(PANEL_SCALARS)
+    ) + ',' + pad[3] + '"actions"' + colon)
+
+    actions = panel.actions
+    if len(actions):
+        write('[' + pad[4] + _actionsText(actions, pad, colon, dump) + pad[3] + ']')
+    else:
+        write('[]')
+
+    write(''.join(
+        ',' + pad[3] + f'"{name}"' + colon + dump(getattr(panel, name), 3)
+        for name in PANEL_GEOMETRY
+    ) + _fields(panel.extra, pad[3], colon, dump, 3) + pad[2] + '}')
+
+
+def _actionsText(actions, pad, colon, dump):
+    # One %-format per action straight off the packed cells; this is the bulk of a preset
+    template = ('{' + pad[5] + '"key"' + colon + '%s,'
+                + pad[5] + '"x"' + colon + '%d,'
+                + pad[5] + '"y"' + colon + '%d,'
+                + pad[5] + '"w"' + colon + '%d,'
+                + pad[5] + '"h"' + colon + '%d'
+                + pad[4] + '}')
+    cells = actions.cells
+    extras = actions.extras
+    quoted = {}
+    parts = []
+    for i, (key, x, y, w, h) in enumerate(zip(actions.keys, cells[X::ACTION_STRIDE], cells[Y::ACTION_STRIDE],
+                                              cells[W::ACTION_STRIDE], cells[H::ACTION_STRIDE])):
+        if extras and i in extras:
+            parts.append(dump(actions[i].toJson(), 4))
+            continue
+        try:
+            q = quoted[key]
+        except (KeyError, TypeError):
+            q = dump(key, 5)
+            if type(key) is str:
+                quoted[key] = q
+        parts.append(template % (q, x, y, w, h))
+    return (',' + pad[4]).join(parts)
+
+
+def _fields(extra, padding, colon, dump, depth):
+    """Unknown fields kept from the file, appended after the known ones."""
+    if not extra:
+        return ''
+    return ''.join(',' + padding + json.dumps(k) + colon + dump(v, depth) for k, v in extra.items())
+
+
+def _dumper(indent):
+    if indent is None:
+        return lambda value, depth: json.dumps(value, separators=(',', ':'))
+
+    def dump(value, depth):
+        # Nested values get json's own layout, shifted to where they sit
+        return json.dumps(value, indent=indent).replace('\n', '\n' + ' ' * (indent * depth))
+    return dump
@@ -0,0 +1,162 @@
+# Which process synthesized key events are posted to. Asking NSWorkspace for
+# the frontmost application is an IPC round trip, too slow for every key
+# press, so TargetResolver keeps the answer cached and updates it from
+# workspace notifications (app activated / launched / terminated).
+#
+# A preset can pin its events to one application with "target_app" (bundle
+# identifier or name, case-insensitive). The pinned app's PID is looked up
+# once and kept until it quits; while it isn't running, events go to the
+# frontmost application as before.
+#
+# The notification source is swappable: WorkspaceNotificationSource on macOS,
+# FakeNotificationSource for headless runs.
+
+ACTIVATED = "activated"
+LAUNCHED = "launched"
+TERMINATED = "terminated"
+
+_UNRESOLVED = object()
+
+
+def _names(*names):
+    return tuple(name.lower() for name in names if name)
+
+
+class WorkspaceNotificationSource:
+    """NSWorkspace's running applications and notifications (macOS only)."""
+
+    def __init__(self):
+        import AppKit
+        self.AppKit = AppKit
+        self.workspace = AppKit.NSWorkspace.sharedWorkspace()
+        self.observers = []
+
+    def describe(self, app):
+        """(pid, names) of an NSRunningApplication."""
+        return app.processIdentifier(), _names(app.bundleIdentifier(), app.localizedName())
+
+    def frontmost(self):
+        app = self.workspace.frontmostApplication()
+        return self.describe(app) if app is not None else None
+
+    def running(self):
+        return [self.describe(app) for app in self.workspace.runningApplications()]
+
+    def subscribe(self, callback):
+        """callback(kind, pid, names) on the main thread for every activation, launch and quit."""
+        AppKit = self.AppKit
+        center = self.workspace.notificationCenter()
+        for name, kind in ((AppKit.NSWorkspaceDidActivateApplicationNotification, ACTIVATED),
+                           (AppKit.NSWorkspaceDidLaunchApplicationNotification, LAUNCHED),
+                           (AppKit.NSWorkspaceDidTerminateApplicationNotification, TERMINATED)):
+            def notified(notification, kind=kind):
+                app = notification.userInfo()[AppKit.NSWorkspaceApplicationKey]
+                callback(kind, *self.describe(app))
+            self.observers.append(center.addObserverForName_object_queue_usingBlock_(
+                name, None, AppKit.NSOperationQueue.mainQueue(), notified))
+
+    def close(self):
+        center = self.workspace.notificationCenter()
+        for observer in self.observers:
+            center.removeObserver_(observer)
+        self.observers = []
+
+
+class FakeNotificationSource:
+    """Scripted applications for tests and benchmarks; counts queries like real IPC calls."""
+
+    def __init__(self):
+        self.apps = {}  # pid -> names
+        self.front = None
+        self.callbacks = []
+        self.queries = 0
+
+    def frontmost(self):
+        self.queries += 1
+        return (self.front, self.apps[self.front]) if self.front is not None else None
+
+    def running(self):
+        self.queries += 1
+        return list(self.apps.items())
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def close(self):
+        self.callbacks = []
+
+    def launch(self, pid, *names):
+        self.apps[pid] = _names(*names)
+        self._notify(LAUNCHED, pid)
+
+    def activate(self, pid):
+        self.front = pid
+        self._notify(ACTIVATED, pid)
+
+    def terminate(self, pid):
+        names = self.apps.pop(pid)
+        if self.front == pid:
+            self.front = None
+        for callback in list(self.callbacks):
+            callback(TERMINATED, pid, names)
+
+    def _notify(self, kind, pid):
+        for callback in list(self.callbacks):
+            callback(kind, pid, self.apps[pid])
+
+
+class TargetResolver:
+    def __init__(self, source):
+        self.source = source
+        frontmost = source.frontmost()
+        self.frontmostPid = frontmost[0] if frontmost is not None else None
+        self.pinned = {}  # target_app (lowercase) -> pid, None while it isn't running
+        source.subscribe(self.onNotification)
+
+    def pid(self, target=None):
+        """PID to post to: the pinned target_app if given and running, else the frontmost app.
+
+        None means no application is known; post to the HID event tap.
+        """
+        if target:
+            key = target.lower()
+            pid = self.pinned.get(key, _UNRESOLVED)
+            if pid is _UNRESOLVED:
+                pid = self.pinned[key] = self._find(key)
+            if pid is not None:
+                return pid
+        return self.frontmostPid
+
+    def onNotification(self, kind, pid, names):
+        if kind == ACTIVATED:
+            self.frontmostPid = pid
+        elif kind == LAUNCHED:
+            for key in names:
+                if self.pinned.get(key, _UNRESOLVED) is None:
+                    self.pinned[key] = pid
+        elif kind == TERMINATED:
+            if self.frontmostPid == pid:
+                self.frontmostPid = None  # until the next activation
+            for key, pinnedPid in self.pinned.items():
+                if pinnedPid == pid:
+                    self.pinned[key] = None
+
+    def close(self):
+        self.source.close()
+
+    def _find(self, key):
+        for pid, names in self.source.running():
+            if key in names:
+                return pid
+        return None
+
+
+_shared = None
+
+
+def sharedTargetResolver():
+    """The resolver fed by NSWorkspace (needs PyObjC); use from the main thread."""
+    global _shared
+    if _shared is None:
+        _shared = TargetResolver(WorkspaceNotificationSource())
+    return _shared
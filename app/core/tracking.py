@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+# Change tracking for the loaded preset/config trees.
+# Every node in a tree points at its root and knows its path from it;
+# writing a public attribute marks the root dirty so Model.save only rewrites
+# what actually changed, and notifies the root's listener (the journal).
+
+_MISSING = object()
+
+
+class Tracked:
+    """Mixin for tree nodes. Subclasses provide the _root/_path storage."""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if name[0] == '_' or name == 'filepath':
+            object.__setattr__(self, name, value)
+            return
+
+        old = getattr(self, name, _MISSING)
+        object.__setattr__(self, name, value)
+
+        root = getattr(self, '_root', None)
+        if root is None:
+            return
+
+        path = self._path + (name,)
+        if isinstance(value, (Tracked, list)):
+            bind(value, root, path)
+        elif old is not _MISSING and old == value:
+            # Same value written again (e.g. windowDidMove_ on open)
+            return
+
+        object.__setattr__(root, '_dirty', True)
+
+        listener = getattr(root, '_listener', None)
+        if listener:
+            listener(root, path, value)
+
+    def trackedChildren(self):
+        """(name, value) pairs that bind() should descend into."""
+        return ()
+
+    def convert(self, name, value):
+        """Turn a plain JSON value into what this node stores under name (journal replay)."""
+        return value
+
+
+class TrackedNamespace(Tracked, SimpleNamespace):
+    def trackedChildren(self):
+        return [(k, v) for k, v in self.__dict__.items() if not k.startswith('_')]
+
+    def convert(self, name, value):
+        return toNamespace(value)
+
+
+def toNamespace(obj):
+    if isinstance(obj, dict):
+        return TrackedNamespace(**{k: toNamespace(v) for k, v in obj.items()})
+    elif isinstance(obj, list):
+        return [toNamespace(i) for i in obj]
+    else:
+        return obj
+
+
+def bind(obj, root, path=()):
+    """Attach every node under obj to the given root, recording its path."""
+    if isinstance(obj, Tracked):
+        object.__setattr__(obj, '_root', root)
+        object.__setattr__(obj, '_path', path)
+        for key, value in obj.trackedChildren():
+            bind(value, root, path + (key,))
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            bind(item, root, path + (i,))
+
+
+def setListener(root, listener):
+    """Call listener(root, path, value) for every tracked write under root."""
+    object.__setattr__(root, '_listener', listener)
+
+
+def isDirty(root):
+    return bool(getattr(root, '_dirty', False))
+
+
+def markDirty(root):
+    """Flag a tree as changed, for edits that bypass attribute writes (list appends etc)."""
+    object.__setattr__(root, '_dirty', True)
+
+
+def markClean(root):
+    object.__setattr__(root, '_dirty', False)
@@ -0,0 +1,190 @@
+import heapq
+import threading
+from collections import namedtuple
+
+# Turbo (auto-repeat): while a turbo action is held, its key is tapped
+# rate times a second, down for duty of each period. One TurboRepeater
+# drives every turbo key: it keeps the next toggle of each in a heap and
+# arms a single DwellTimer for the earliest, instead of a timer per key.
+#
+# A global cap keeps a large panel from flooding the event tap: taps draw
+# from a token bucket of maxTapRate per second, and a tap that finds it empty
+# is skipped for that period. Ups are never held back, so no key sticks.
+#
+# Each TurboKey presses and releases through a HeldKeys table as its own
+# owner: a tap of a key another source holds doesn't reach the game, and
+# releaseAll(group) lets go of a tap that is down when its panel closes.
+#
+# In a preset: "turbo": 15 (taps per second) or {"rate": 15, "duty": 0.5}.
+
+MIN_TURBO_RATE = 1.0
+MAX_TURBO_RATE = 30.0
+DEFAULT_DUTY = 0.5
+MIN_DUTY = 0.05
+MAX_DUTY = 0.95
+
+MAX_TAP_RATE = 60.0  # taps per second across every turbo key
+TAP_BURST = 10       # taps the bucket can bank
+
+TurboSpec = namedtuple('TurboSpec', ['rate', 'duty'])
+
+
+def parseTurbo(spec):
+    """TurboSpec from a preset's "turbo" value; ValueError if it isn't one."""
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        rate, duty = spec, DEFAULT_DUTY
+    elif isinstance(spec, dict):
+        rate = spec.get("rate")
+        duty = spec.get("duty", DEFAULT_DUTY)
+    else:
+        raise ValueError(f"turbo must be a rate or an object, got {type(spec).__name__}")
+    for value, name in ((rate, "rate"), (duty, "duty")):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"turbo {name} {value!r} is not a number")
+    if not MIN_TURBO_RATE <= rate <= MAX_TURBO_RATE:
+        raise ValueError(f"turbo rate {rate} is outside {MIN_TURBO_RATE:g}-{MAX_TURBO_RATE:g} per second")
+    if not MIN_DUTY <= duty <= MAX_DUTY:
+        raise ValueError(f"turbo duty {duty} is outside {MIN_DUTY}-{MAX_DUTY}")
+    return TurboSpec(float(rate), float(duty))
+
+
+class TurboKey:
+    __slots__ = ('keycode', 'flags', 'pid', 'group', 'period', 'downTime', 'down', 'due', 'active')
+
+    def __init__(self, keycode, flags, pid, spec, group=None):
+        self.keycode = keycode
+        self.flags = flags
+        self.pid = pid
+        self.group = group
+        self.period = 1.0 / spec.rate
+        self.downTime = self.period * spec.duty
+        self.down = False
+        self.due = 0.0
+        self.active = True
+
+
+class TurboRepeater:
+    def __init__(self, held, scheduler, maxTapRate=MAX_TAP_RATE, burst=TAP_BURST):
+        """Taps are pressed and released in held (a HeldKeys); timing runs on scheduler's thread."""
+        self.held = held
+        self.scheduler = scheduler
+        self.clock = scheduler.clock
+        self.timer = scheduler.timer(self.tick)
+        self.lock = threading.Lock()
+        self.heap = []  # (due, sequence, key); stopped keys are skipped when they surface
+        self.sequence = 0
+        self.armedFor = None
+
+        self.maxTapRate = maxTapRate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled = self.clock()
+
+        self.taps = 0
+        self.skipped = 0
+
+    def start(self, keycode, flags, spec, pid=None, group=None):
+        """Start tapping a key; returns the TurboKey to pass to stop()."""
+        key = TurboKey(keycode, flags, pid, spec, group)
+        with self.lock:
+            key.due = self.clock()
+            self._push(key)
+            self._arm()
+        return key
+
+    def stop(self, key):
+        """Stop tapping; a key that is down goes up right away."""
+        with self.lock:
+            self._stop(key)
+
+    def stopAll(self, group=None):
+        """Stop every key started with group, or every key (teardown)."""
+        with self.lock:
+            for _, _, key in self.heap:
+                if group is None or key.group is group:
+                    self._stop(key)
+            self._arm()
+
+    def active(self):
+        with self.lock:
+            return sum(1 for _, _, key in self.heap if key.active)
+
+    def tick(self):
+        with self.lock:
+            self.armedFor = None
+            now = self.clock()
+            heap = self.heap
+            while heap and heap[0][0] <= now:
+                _, _, key = heapq.heappop(heap)
+                if not key.active:
+                    continue
+                if key.down:
+                    key.down = False
+                    self.held.release(key, key.keycode)
+                    interval = key.period - key.downTime
+                elif self._takeToken(now):
+                    key.down = True
+                    self.taps += 1
+                    self.held.press(key, key.keycode, key.flags, key.pid, key.group)
+                    interval = key.downTime
+                else:
+                    # Over the global cap: skip this tap, try again next period
+                    self.skipped += 1
+                    interval = key.period
+                # Fell behind (busy thread, system sleep): restart the phase rather than catch up
+                key.due = max(key.due + interval, now + interval * 0.5)
+                self._push(key)
+            self._arm()
+
+    def _takeToken(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.maxTapRate)
+        self.refilled = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    # Callers hold self.lock
+
+    def _stop(self, key):
+        key.active = False
+        if key.down:
+            key.down = False
+            self.held.release(key, key.keycode)
+
+    def _push(self, key):
+        self.sequence += 1
+        heapq.heappush(self.heap, (key.due, self.sequence, key))
+
+    def _arm(self):
+        heap = self.heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+        if not heap:
+            if self.armedFor is not None:
+                self.scheduler.cancel(self.timer)
+                self.armedFor = None
+            return
+        due = heap[0][0]
+        if due != self.armedFor:
+            self.armedFor = due
+            self.scheduler.arm(self.timer, max(0.0, due - self.clock()))
+
+
+_shared = None
+
+
+def sharedTurboRepeater():
+    """The repeater every turbo action uses: the input executor's thread, the shared HeldKeys."""
+    global _shared
+    if _shared is None:
+        from core.heldKeys import sharedHeldKeys
+        from core.inputSequence import sharedInputExecutor
+        _shared = TurboRepeater(sharedHeldKeys(), sharedInputExecutor().scheduler)
+    return _shared
+
+
+def stopAllTurbo(group=None):
+    """Stop the shared repeater's keys in group, or all of them; a no-op if turbo was never used."""
+    if _shared is not None:
+        _shared.stopAll(group)
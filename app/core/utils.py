@@ -14,5 +14,16 @@ def getResourcePath(relativePath):
 
     return os.path.join(basePath, relativePath)
 
-PRESET_DIR = getResourcePath("resources/presets")
-CONFIG_DIR = getResourcePath("resources/config.json")
\ No newline at end of file
+RESOURCE_DIR = getResourcePath("resources")
+
+
+def resourcePath(name, resourceDir=None):
+    """Path of a file inside resources/, or inside another folder laid out the same way."""
+    return os.path.join(resourceDir or RESOURCE_DIR, name)
+
+
+PRESET_DIR = resourcePath("presets")
+CONFIG_DIR = resourcePath("config.json")
+JOURNAL_PATH = resourcePath("journal.log")
+INDEX_PATH = resourcePath("presetIndex.json")
+CACHE_DIR = resourcePath("cache")
@@ -1,90 +1,379 @@
+import threading
+
 from core.utils import *
-from types import SimpleNamespace
+from core.tracking import Tracked, TrackedNamespace, bind, setListener, isDirty, markDirty, markClean
+from core.journal import Journal, CONFIG_TARGET, writeAtomic, writeJsonAtomic
+from core.presetIndex import PresetIndex
+from core.presetCache import PresetCache
+from core.presetLoader import loadPresetFiles
+from core.presetWatcher import PresetWatcher
+from core.presetDiff import diffPresets, applyDiff, isEmpty
+from core.presetCompiler import compiledFor, invalidate, formatIssue
+from core.presetWriter import writePreset
+from core.autosave import Autosaver, AUTOSAVE_QUIET_PERIOD, AUTOSAVE_MAX_DELAY
 
 class Model():
-    def __init__(self):
+    def __init__(self, resourceDir=None):
+        # resourceDir points the model at another resources/ folder (benchmarks)
+        self.presetDir = resourcePath("presets", resourceDir)
+        self.configPath = resourcePath("config.json", resourceDir)
+
+        self.replaying = False
+        # lock orders journal records against the autosave snapshot (a save
+        # only truncates the journal if nothing was recorded meanwhile). Tree
+        # writes on the main thread don't take it, so snapshots copy what they
+        # iterate. saveLock serializes whole saves (and hot reload) so file
+        # writes and the watcher stay consistent
+        self.lock = threading.RLock()
+        self.saveLock = threading.RLock()
+        self.cache = PresetCache(resourcePath("cache", resourceDir))
+        self.index = PresetIndex(resourcePath("presetIndex.json", resourceDir), self.presetDir)
         self.presets = self.loadPresets()        
         self.config = self.loadConfig()
+        # compact_presets drops the indentation, for presets nobody edits by hand
+        self.presetIndent = None if getattr(self.config, 'compact_presets', False) else 4
+
+        self.watcher = PresetWatcher(self.presetDir)
+        self.watcher.reset(self.presets)
+
+        # Edits since the last save live in the journal until compacted
+        self.journal = Journal(resourcePath("journal.log", resourceDir))
+        self.autosaver = Autosaver(
+            self.autosave,
+            getattr(self.config, 'autosave_quiet_period', AUTOSAVE_QUIET_PERIOD),
+            getattr(self.config, 'autosave_max_delay', AUTOSAVE_MAX_DELAY),
+        )
+        self.replayJournal()
+
+        setListener(self.config, self._onChange)
+        self.journal.start()
+        self.autosaver.start()
     
     def loadPresets(self):
-        presets = []
+        """Return index entries for every preset; only new or changed files get parsed."""
+        self.loadErrors = []
+        self.index.load()
+        entries = self.index.refresh(self.parsePresets)
+        self.index.save()
+        return entries
 
-        try:
-            files = os.listdir(PRESET_DIR)
-
-            for filename in files:
-                if filename.endswith(".json"):
-                    path = os.path.join(PRESET_DIR, filename)
-
-                    try:
-                        with open(path, 'r') as file:
-                            data = json.load(file, object_hook=lambda d: SimpleNamespace(**d))
-                            data.filepath = path
-                            presets.append(data)
-                    except (json.JSONDecodeError, IOError) as e:
-                        print(f"Failed to load {filename}: e")
-        except FileNotFoundError:
-            print(f"Direcotry no found: {PRESET_DIR}")
-        
+    def parsePresets(self, paths):
+        """Read presets (in parallel when there are many), in the order given.
+
+        Failed files come back as None and are recorded in self.loadErrors.
+        """
+        presets, errors = loadPresetFiles(paths, self.cache)
+        for error in errors:
+            print(f"Failed to load {error.filename}: {error.error}")
+        self.loadErrors.extend(errors)
+
+        for data in presets:
+            if data is not None:
+                bind(data, data)
+                setListener(data, self._onChange)
+                # Validate up front so bad actions show up now, not during layout
+                for issue in compiledFor(data).issues:
+                    print(f"{os.path.basename(data.filepath)}: {formatIssue(issue)}")
         return presets
+
+    def parsePreset(self, path):
+        return self.parsePresets([path])[0]
+
+    def getPreset(self, index):
+        """Return the full preset for a list position, parsing it on first use."""
+        entry = self.presets[index]
+        if entry.data is None:
+            entry.data = self.parsePreset(entry.filepath)
+        return entry.data
+
+    def loadedPresets(self):
+        return [entry.data for entry in self.presets if entry.data is not None]
+
+    def pollPresetChanges(self):
+        """Pick up preset files edited outside the app.
+
+        Presets that are already loaded are patched in place, so open windows
+        keep their PanelData objects. Returns (reloaded, listChanged):
+        reloaded is a list of (presetData, PresetDiff), listChanged means
+        files were added/removed/renamed and self.presets was rebuilt.
+        """
+        # Skip this tick while a save is writing files the watcher would see
+        if not self.saveLock.acquire(blocking=False):
+            return [], False
+        try:
+            return self._pollPresetChanges()
+        finally:
+            self.saveLock.release()
+
+    def _pollPresetChanges(self):
+        changed, added, removed = self.watcher.poll()
+        if not (changed or added or removed):
+            return [], False
+
+        positions = {entry.filename: i for i, entry in enumerate(self.presets)}
+        reloaded = []
+        listChanged = bool(added or removed)
+
+        for filename in changed:
+            i = positions.get(filename)
+            if i is None:
+                # Previously unreadable file, now fixed
+                listChanged = True
+                continue
+
+            entry = self.presets[i]
+            if entry.data is None:
+                # Not open; the index refresh below re-reads its summary
+                listChanged = True
+                continue
+
+            fresh = self.parsePreset(entry.filepath)
+            if fresh is None:
+                continue  # probably saved half-way; keep the live copy
+
+            diff = diffPresets(entry.data, fresh)
+            self.replaying = True
+            try:
+                applyDiff(entry.data, fresh, diff)
+            finally:
+                self.replaying = False
+            # Added/removed panels are list edits the tracker doesn't see;
+            # drop the compiled layout so it matches the new panel count
+            invalidate(entry.data)
+            # Memory now matches the file again
+            markClean(entry.data)
+            self.index.touch(entry)
+
+            if not isEmpty(diff):
+                print(f"Reloaded {filename}: {len(diff.panels)} panel change(s)")
+                listChanged = listChanged or 'name' in diff.fields
+                reloaded.append((entry.data, diff))
+
+        if listChanged:
+            self.presets = self.index.refresh(self.parsePresets)
+        self.index.save()
+
+        if reloaded and not self.journal.isEmpty():
+            # Journal entries for a reloaded file are now stale; compact them away
+            self.save()
+
+        return reloaded, listChanged
     
     def loadConfig(self):
         try:
-            with open(CONFIG_DIR, 'r') as file:
+            with open(self.configPath, 'r') as file:
                 # check if file is empty
                 content = file.read()
                 if not content:
-                    return SimpleNamespace()
+                    return self._newConfig()
                     
                 file.seek(0)
-                data = json.load(file, object_hook=lambda d: SimpleNamespace(**d))
+                data = json.load(file, object_hook=lambda d: TrackedNamespace(**d))
+                bind(data, data)
                 return data
         except (FileNotFoundError, json.JSONDecodeError):
-            print(f"Config not found or invalid at {CONFIG_DIR}, creating new.")
-            return SimpleNamespace()
+            print(f"Config not found or invalid at {self.configPath}, creating new.")
+            return self._newConfig()
+
+    def _newConfig(self):
+        config = TrackedNamespace()
+        bind(config, config)
+        return config
+
+    def _journalTarget(self, root):
+        if root is self.config:
+            return CONFIG_TARGET
+        return os.path.basename(root.filepath)
+
+    def _onChange(self, root, path, value):
+        if root is not self.config:
+            invalidate(root)
+        if self.replaying:
+            return
+        with self.lock:
+            self.journal.record(self._journalTarget(root), path, self._toDict(value))
+        self.autosaver.notify()
+
+    def replayJournal(self):
+        """Re-apply edits left in the journal by a session that didn't save, then compact."""
+        positions = {entry.filename: i for i, entry in enumerate(self.presets)}
+
+        count = 0
+        self.replaying = True
+        try:
+            for target, path, value in self.journal.entries():
+                if target == CONFIG_TARGET:
+                    root = self.config
+                elif target in positions:
+                    root = self.getPreset(positions[target])
+                else:
+                    root = None
+
+                if root is None:
+                    print(f"Journal: no preset {target}, skipping edit")
+                    continue
+                try:
+                    self._applyEdit(root, path, value)
+                    count += 1
+                except (AttributeError, IndexError, TypeError) as e:
+                    print(f"Journal: could not apply {target} {path}: {e}")
+        finally:
+            self.replaying = False
+
+        if count:
+            print(f"Replayed {count} journal edit(s)")
+            self.save()
+
+    def _applyEdit(self, root, path, value):
+        node = root
+        for key in path[:-1]:
+            node = node[key] if isinstance(key, int) else getattr(node, key)
+
+        # Only attribute writes are journaled, so the last step is always a name
+        key = path[-1]
+        if not isinstance(node, Tracked) or isinstance(key, int):
+            raise TypeError("not an attribute of a tracked node")
+        setattr(node, key, node.convert(key, value))
 
     def _toDict(self, obj):
-        if isinstance(obj, SimpleNamespace):
-            return {k: self._toDict(v) for k, v in vars(obj).items() if k != 'filepath'}
+        if hasattr(obj, 'toJson'):
+            return obj.toJson()
+        elif isinstance(obj, TrackedNamespace):
+            # Skip filepath and tracking internals (_root, _dirty). Copied
+            # first: the main thread may add attributes while autosave encodes
+            return {k: self._toDict(v) for k, v in dict(vars(obj)).items()
+                    if k != 'filepath' and not k.startswith('_')}
         elif isinstance(obj, list):
             return [self._toDict(i) for i in obj]
         else:
             return obj
 
     def savePreset(self, presetData):
+        """Write one preset to its file. Returns True on success.
+
+        Called on the main thread, where the trees are edited, so the preset
+        is streamed straight from the tree into the file.
+        """
+        with self.saveLock:
+            # Clean first, as _saveDirty does
+            markClean(presetData)
+            if self._writePreset(presetData, lambda f: writePreset(presetData, f.write, self.presetIndent)):
+                return True
+            markDirty(presetData)
+            return False
+
+    def _writePreset(self, presetData, emit):
         if not hasattr(presetData, 'filepath'):
             print("No filepath to save preset")
-            return
-            
-        data = self._toDict(presetData)
-        
+            return False
+
         try:
-            with open(presetData.filepath, 'w') as f:
-                json.dump(data, f, indent=4)
+            writeAtomic(presetData.filepath, emit)
+            if not isDirty(presetData):
+                # Only cache the tree if it still matches what was written
+                self.cache.put(presetData.filepath, os.stat(presetData.filepath), presetData)
+            self.watcher.acknowledge(presetData.filepath)
             print(f"Saved preset to {presetData.filepath}")
+            return True
         except Exception as e:
             print(f"Failed to save preset: {e}")
+            return False
             
     def saveConfig(self):
+        """Write the config file. Returns True on success."""
         if not self.config:
-            return
-            
-        data = self._toDict(self.config)
-        
+            return False
+
+        with self.saveLock:
+            with self.lock:
+                markClean(self.config)
+                data = self._toDict(self.config)
+            if self._writeConfig(data):
+                return True
+            markDirty(self.config)
+            return False
+
+    def _writeConfig(self, data):
         try:
-            with open(CONFIG_DIR, 'w') as f:
-                json.dump(data, f, indent=4)
-            print(f"Saved config to {CONFIG_DIR}")
+            writeJsonAtomic(self.configPath, data)
+            print(f"Saved config to {self.configPath}")
+            return True
         except Exception as e:
             print(f"Failed to save config: {e}")
+            return False
+
+    def _saveDirty(self):
+        """Write every dirty preset and the config. Returns (saved, skipped, failed).
+
+        Each tree is encoded under self.lock and written outside it, one at a
+        time, so edits on the UI thread never wait for disk. Callers hold
+        self.saveLock.
+        """
+        with self.lock:
+            journalMark = self.journal.records
+
+        saved = 0
+        skipped = 0
+        failed = 0
+        for entry in list(self.presets) + [None]:
+            with self.lock:
+                root = self.config if entry is None else entry.data
+                # Presets never opened this session can't have changed
+                if root is None or not isDirty(root):
+                    skipped += entry is not None
+                    continue
+                markClean(root)
+                if entry is None:
+                    data = self._toDict(root)
+                else:
+                    chunks = []
+                    writePreset(root, chunks.append, self.presetIndent)
+
+            if entry is None:
+                ok = self._writeConfig(data)
+            else:
+                ok = self._writePreset(root, lambda f: f.writelines(chunks))
+            if ok:
+                saved += 1
+                if entry is not None:
+                    self.index.touch(entry)
+            else:
+                markDirty(root)
+                failed += 1
+        self.index.save()
+
+        with self.lock:
+            # Edits journaled after the first snapshot may not be on disk; keep them
+            if not failed and self.journal.records == journalMark:
+                self.journal.truncate()
+        return saved, skipped, failed
     
     def save(self):
-        """Save all presets and config to disk."""
-        print(f"Saving {len(self.presets)} preset(s)...")
-        for presetData in self.presets:
-            self.savePreset(presetData)
-            
-        print("Saving config...")
-        self.saveConfig()
+        """Save presets and config that changed since load (or the last save).
+
+        Once every dirty file is written the journal is compacted away.
+        """
+        with self.saveLock:
+            self.autosaver.clear()
+            saved, skipped, failed = self._saveDirty()
+        print(f"Saved {saved} file(s), skipped {skipped} unchanged preset(s).")
+
+        if failed:
+            # Keep the journal so the next launch can retry these edits
+            print(f"{failed} file(s) failed to save, keeping journal.")
         
-        print("All saved.")
\ No newline at end of file
+        print("All saved.")
+        return saved, skipped
+
+    def autosave(self):
+        """Autosaver callback; runs on its worker thread."""
+        with self.saveLock:
+            saved, _, failed = self._saveDirty()
+        if failed:
+            print(f"Autosave: {failed} file(s) failed, will retry on the next edit or quit.")
+        elif saved:
+            print(f"Autosaved {saved} file(s).")
+
+    def close(self):
+        self.autosaver.stop()
+        self.journal.close()
@@ -1,6 +1,25 @@
 import AppKit
+import objc
 
 class Box(AppKit.NSView):
+    # PanelView hit-tests the cursor and forwards it to the action view under it
+
+    @objc.python_method
+    def cursorEntered(self, x, y):
+        pass
+
+    @objc.python_method
+    def cursorMoved(self, x, y):
+        pass
+
+    @objc.python_method
+    def cursorExited(self):
+        pass
+
+    @objc.python_method
+    def close(self):
+        """The panel is closing or rebuilding its actions: stop timers, let go of keys."""
+        pass
     
     def drawRect_(self, rect):
         pd = 3
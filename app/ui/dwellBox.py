@@ -4,7 +4,6 @@ import objc
 from PyObjCTools import AppHelper
 
 import AppKit
-from Quartz import CGEventCreateKeyboardEvent, CGEventPost, kCGHIDEventTap, CGEventSetFlags, CGEventPostToPid
 from AppKit import (
     NSScreen, NSApplication, NSWindow, NSApp, NSButton, NSTextField, NSScrollView, NSPanel,
     NSMakeRect, NSBackingStoreBuffered, NSTitledWindowMask, NSClosableWindowMask,
@@ -18,42 +17,31 @@ from AppKit import NSEvent, NSKeyDown, NSWorkspace
 
 # from ui.panel import Panel
 
-from threading import Timer
+from core.dwellScheduler import sharedDwellScheduler
+from core.dwellAction import DwellAction
+from core.inputSequence import sharedInputExecutor
+from core.targetProcess import sharedTargetResolver
+from core.turbo import sharedTurboRepeater
+from core.heldKeys import sharedHeldKeys
 import objc
 
+
 class DwellBox(NSView):
-    def initWithFrame_key_(self, frame, key):
-            keycode_map = {
-            "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
-            "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
-            "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
-            "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
-            "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
-            "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
-            "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
-            "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
-            "return": 0x24, "delete": 0x33,
-            "up": 0x7E, "down": 0x7D, "left": 0x7B, "right": 0x7C
-        }
-            
-            self.key = key
-            self.keycode = keycode_map[self.key]
-            self.is_pressed = False
+    def initWithFrame_action_(self, frame, action):
+            # action is a CompiledAction; DwellAction does the dwelling and pressing,
+            # this view draws it and forwards the hosting PanelView's cursor calls
+            self.key = action.key
+            self.target = None  # preset's target_app, set by the hosting PanelView
+            self.group = None   # the hosting PanelView; closing it releases our key
             print("init Dwell")
             self = objc.super(DwellBox, self).initWithFrame_(frame) # type:ignore
 
             if self:
-                # enter/exit, move, active 
-                options = (0x01 | 0x02 | 0x04 | 0x80)
-
-                self.area = NSTrackingArea.alloc().initWithRect_options_owner_userInfo_(
-                     self.bounds(), options, self, None
-                )
-
-                self.addTrackingArea_(self.area)
+                # No tracking area of its own: the hosting PanelView hit-tests the
+                # cursor and calls cursorEntered/cursorMoved/cursorExited
                 self.setWantsLayer_(True)
-                self.timer = None
-                self.delay = 0.1
+                self.dwell = DwellAction(action, sharedDwellScheduler(), sharedHeldKeys(),
+                                         sharedInputExecutor(), sharedTurboRepeater(), sharedTargetResolver())
                 self.label = NSTextField.labelWithString_(self.key)
                 self.label.setFrame_(self.bounds())
                 self.label.setAlignment_(NSCenterTextAlignment)
@@ -73,61 +61,25 @@ class DwellBox(NSView):
         NSBezierPath.fillRect_(self.bounds())
 
     @objc.python_method
-    def triggerAction(self):
-        self.press_key()
-        print("Trigger")
-    
-    @objc.python_method
-    def startTimer(self):
-        self.release_key()
-        if self.timer: self.timer.cancel()
-        self.timer = Timer(self.delay, self.triggerAction)
-        self.timer.start()
-
-    def mouseEntered_(self, event):
-        # print("Enter")
-        self.startTimer()
-        
-    def mouseMoved_(self, event):
-        # print("Move")
-        self.startTimer()
-    
-    def mouseExited_(self, event):
-        # print("Exit")
-        if self.timer:
-            self.timer.cancel()
+    def configureDwell(self, delay, radius=0.0, exitRadius=None, smoothing=False):
+        """Dwell delay (s), jitter radius and release radius (points), optional One Euro smoothing."""
+        self.dwell.configure(delay, radius, exitRadius, smoothing)
 
-    def press_key(self):
-        print("press")
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
-        
-        if active_app:
-            pid = active_app.processIdentifier()
-            event = CGEventCreateKeyboardEvent(None, self.keycode, True)
-            CGEventPostToPid(pid, event)
-        else:
-            event = CGEventCreateKeyboardEvent(None, self.keycode, True)
-            CGEventPost(kCGHIDEventTap, event)
+    @objc.python_method
+    def cursorEntered(self, x, y):
+        # The host sets target and group on the view; every press follows an enter
+        self.dwell.target = self.target
+        self.dwell.group = self.group
+        self.dwell.cursorEntered(x, y)
 
-        self.is_pressed = True
-    
-    def release_key(self):
-        if not self.is_pressed: return
+    @objc.python_method
+    def cursorMoved(self, x, y):
+        self.dwell.cursorMoved(x, y)
 
-        print("releease")
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
-        
-        if active_app:
-            pid = active_app.processIdentifier()
-            event = CGEventCreateKeyboardEvent(None, self.keycode, False)
-            # CGEventPostToPid(pid, event)
-            CGEventPost(kCGHIDEventTap, event)
-        else:
-            print("not active app")
-            event = CGEventCreateKeyboardEvent(None, self.keycode, False)
-            # CGEventPost(kCGHIDEventTap, event)
-            CGEventPost(kCGHIDEventTap, event)
+    @objc.python_method
+    def cursorExited(self):
+        self.dwell.cursorExited()
 
-        self.is_pressed = False
+    @objc.python_method
+    def close(self):
+        self.dwell.close()
@@ -1,5 +1,7 @@
 import AppKit
 import objc
+from core import latency
+from core.utils import resourcePath
 
 class GlobalConfigDelegate(AppKit.NSObject):
     def initWithWindow_(self, window):
@@ -11,6 +13,9 @@ class GlobalConfigDelegate(AppKit.NSObject):
     def opacityChanged_(self, sender):
         self.window.opacityChanged(sender.floatValue())
 
+    def exportLatency_(self, sender):
+        self.window.exportLatency()
+
 class GlobalConfigWindow:
     def __init__(self, model, controller):
         self.model = model
@@ -55,7 +60,19 @@ class GlobalConfigWindow:
         )
         slider.setFrame_(AppKit.NSMakeRect(130, 98, 150, 24))
         contentView.addSubview_(slider)
+
+        # Only while "latency_trace" is on in config.json
+        if latency.tracer is not None:
+            export = AppKit.NSButton.alloc().initWithFrame_(AppKit.NSMakeRect(20, 50, 260, 28))
+            export.setTitle_("Export Latency Trace")
+            export.setBezelStyle_(AppKit.NSRoundedBezelStyle)
+            export.setTarget_(self.delegate)
+            export.setAction_("exportLatency:")
+            contentView.addSubview_(export)
         
     def opacityChanged(self, value):
         self.model.config.opacity = value
         self.controller.updateGlobalSettings()
+
+    def exportLatency(self):
+        latency.exportTrace(resourcePath(latency.TRACE_FILE))
@@ -1,18 +1,26 @@
+import time
 import AppKit
 import Quartz
 import objc
+from core.hitGrid import HitGrid, NO_ACTION
+from core.cursorBuffer import sharedCursorBuffer
+from core import latency
 from ui.box import Box
 
 class PanelView(AppKit.NSView):
-    def initWithFrame_preset_(self, frame, preset):
+    def initWithFrame_compiled_(self, frame, compiled):
         self = objc.super(PanelView, self).initWithFrame_(frame)
         if self:
             self.setAutoresizingMask_(AppKit.NSViewWidthSizable | AppKit.NSViewHeightSizable)
 
-        self.preset = preset
+        # CompiledPanel: grid size is already clamped, actions validated
+        self.compiled = compiled
+        self.hitGrid = HitGrid(compiled)
+        self.hoverIndex = NO_ACTION
         self.createButtons()
         self.setupGridLayer()
         self.updateGridLines()
+        self.setupTrackingArea()
         return self
 
     def isFlipped(self):
@@ -36,12 +44,8 @@ class PanelView(AppKit.NSView):
     def updateGridLines(self):
         size = self.bounds().size
         
-        # Safety check if width/height are 0
-        pWidth = getattr(self.preset, 'width', 1)
-        pHeight = getattr(self.preset, 'height', 1)
-        
-        if pWidth == 0: pWidth = 1
-        if pHeight == 0: pHeight = 1
+        pWidth = self.compiled.width
+        pHeight = self.compiled.height
 
         gridW = size.width / pWidth
         gridH = size.height / pHeight
@@ -69,50 +73,109 @@ class PanelView(AppKit.NSView):
         """Update button positions and sizes based on current grid dimensions."""
         bounds = self.bounds().size
         
-        pWidth = getattr(self.preset, 'width', 1)
-        pHeight = getattr(self.preset, 'height', 1)
-        if pWidth == 0: pWidth = 1
-        if pHeight == 0: pHeight = 1
-        
-        gridW = bounds.width / pWidth
-        gridH = bounds.height / pHeight
-        
         # Find all Box subviews and update their frames
         for subview in self.subviews():
-            if hasattr(subview, 'x') and hasattr(subview, 'y'):
-                # This is a Box with grid position
-                new_rect = AppKit.NSMakeRect(
-                    subview.x * gridW, 
-                    subview.y * gridH, 
-                    gridW, 
-                    gridH
-                )
-                subview.setFrame_(new_rect)
+            if hasattr(subview, 'action'):
+                subview.setFrame_(self.actionRect(subview.action, bounds))
+
+    @objc.python_method
+    def actionRect(self, action, bounds):
+        # Spans are precomputed fractions of the panel
+        return AppKit.NSMakeRect(
+            action.left * bounds.width,
+            action.top * bounds.height,
+            action.spanW * bounds.width,
+            action.spanH * bounds.height
+        )
 
     def setFrameSize_(self, newSize):
         objc.super(PanelView, self).setFrameSize_(newSize)
         
-        if self.preset is not None:
+        if self.compiled is not None:
             self.updateGridLines()
 
+    def setupTrackingArea(self):
+        # One area for the whole panel; the action under the cursor comes from hitGrid
+        options = (AppKit.NSTrackingMouseEnteredAndExited | AppKit.NSTrackingMouseMoved |
+                   AppKit.NSTrackingActiveAlways | AppKit.NSTrackingInVisibleRect)
+        self.trackingArea = AppKit.NSTrackingArea.alloc().initWithRect_options_owner_userInfo_(
+            self.bounds(), options, self, None
+        )
+        self.addTrackingArea_(self.trackingArea)
+
+    def mouseEntered_(self, event):
+        self.updateHover(event)
+
+    def mouseMoved_(self, event):
+        self.updateHover(event)
+
+    def mouseExited_(self, event):
+        self.setHover(NO_ACTION, 0, 0)
+
+    @objc.python_method
+    def updateHover(self, event):
+        now = time.monotonic()
+        tracer = latency.tracer
+        if tracer is not None:
+            # NSEvent timestamps are uptime on the same clock as time.monotonic
+            tracer.record(latency.EVENT, now - event.timestamp())
+
+        # Screen coordinates go to the shared history every consumer reads
+        screen = AppKit.NSEvent.mouseLocation()
+        sharedCursorBuffer().append(now, screen.x, screen.y)
+
+        point = self.convertPoint_fromView_(event.locationInWindow(), None)
+        size = self.bounds().size
+        index = self.hitGrid.hitTest(point.x, point.y, size.width, size.height)
+        if index == self.hoverIndex:
+            if index != NO_ACTION:
+                self.actionViews[index].cursorMoved(point.x, point.y)
+        else:
+            self.setHover(index, point.x, point.y)
+
+    @objc.python_method
+    def setHover(self, index, x, y):
+        """Move the hover from the current action view to the one at index."""
+        if self.hoverIndex != NO_ACTION:
+            self.actionViews[self.hoverIndex].cursorExited()
+        self.hoverIndex = index
+        if index != NO_ACTION:
+            self.actionViews[index].cursorEntered(x, y)
+
+    @objc.python_method
+    def setCompiled(self, compiled):
+        """Switch to a recompiled panel (grid size or actions changed)."""
+        self.setHover(NO_ACTION, 0, 0)
+        self.compiled = compiled
+        self.hitGrid = HitGrid(compiled)
+        self.reloadActions()
+
+    @objc.python_method
+    def closeActions(self):
+        """Tear down every action view (dwell timers, turbo, macros, held keys)."""
+        for view in self.actionViews:
+            view.close()
+
+    def reloadActions(self):
+        """Recreate the action boxes and grid after the panel's actions changed."""
+        self.closeActions()
+        for subview in list(self.subviews()):
+            if hasattr(subview, 'action'):
+                subview.removeFromSuperview()
+        self.createButtons()
+        self.updateGridLines()
+
     def createButtons(self):
         bounds = self.bounds().size
-        
-        pWidth = getattr(self.preset, 'width', 1)
-        pHeight = getattr(self.preset, 'height', 1)
-        if pWidth == 0: pWidth = 1
-        if pHeight == 0: pHeight = 1
-        
-        gridW = bounds.width / pWidth
-        gridH = bounds.height / pHeight
-        
-        actions = getattr(self.preset, 'actions', [])
+        # Same order as compiled.actions, which hitGrid indexes into
+        self.actionViews = []
 
-        for i, act in enumerate(actions):
-            rect = AppKit.NSMakeRect(act.x * gridW, act.y * gridH, gridW, gridH)
-            box = Box.alloc().initWithFrame_(rect)
-            box.x = act.x
-            box.y = act.y
+        for action in self.compiled.actions:
+            box = Box.alloc().initWithFrame_(self.actionRect(action, bounds))
+            box.action = action
+            box.target = self.compiled.target  # app the preset pins its key events to
+            box.group = self  # keys it holds are released when the panel closes
+            self.actionViews.append(box)
 
             box.setAutoresizingMask_(
                 AppKit.NSViewWidthSizable | 
@@ -3,6 +3,8 @@ import json
 from types import SimpleNamespace
 from controllers.panelController import PanelController
 from ui.presetConfigWindow import PresetConfigWindow
+from core.presetDiff import ADDED, REMOVED, CHANGED
+from core.presetCompiler import compiledFor
 
 # Preset Controller manages a single preset entity
 # Creates all the panels inside the preset
@@ -15,17 +17,19 @@ class Preset:
         self.model = model
         self.panels = []
         
-        # The loaded data (SimpleNamespace) now matches the JSON structure:
+        # The loaded data (PresetData) matches the JSON structure:
         # { "name": "...", "panels": [ ... ] }
         
-        panelsData = getattr(self.presetData, 'panels', [])
+        panelsData = self.presetData.panels
         
         # Fallback if panels is not present or if data structure is unexpected
         if not panelsData:
              print("No panels found in preset data")
 
-        for panelData in panelsData:
-            self.panels.append(PanelController(panelData, self.model))
+        # Views lay out from the validated, compiled form
+        compiled = compiledFor(self.presetData)
+        for panelData, compiledPanel in zip(panelsData, compiled.panels):
+            self.panels.append(PanelController(panelData, compiledPanel, self.model))
             
         self.isEditing = False
         self.configWindow = None
@@ -36,6 +40,7 @@ class Preset:
                 panel.close()
             except Exception as e:
                 print(f"Error closing panel: {e}")
+                panel.releaseKeys()  # never leave a key down in the game
         # Close config window if open
         if self.configWindow:
             self.configWindow.close()
@@ -45,10 +50,37 @@ class Preset:
     def updatePanelGrid(self, panel_index):
         """Update the grid display for a specific panel when its dimensions change."""
         if panel_index < len(self.panels):
-            panel = self.panels[panel_index]
-            if hasattr(panel, 'container') and panel.container:
-                panel.container.updateGridLines()
+            # The edit dropped the compiled preset; this recompiles it
+            compiled = compiledFor(self.presetData)
+            self.panels[panel_index].setCompiled(compiled.panels[panel_index])
     
+    def applyDiff(self, diff):
+        """Update live panels after the preset file was reloaded in place."""
+        compiled = compiledFor(self.presetData)
+        for change in diff.panels:
+            if change.kind == CHANGED:
+                self.panels[change.index].reload(change.fields, compiled.panels[change.index])
+            elif change.kind == ADDED:
+                panel = PanelController(self.presetData.panels[change.index],
+                                        compiled.panels[change.index], self.model)
+                panel.setGridVisible(self.isEditing)
+                self.panels.append(panel)
+            elif change.kind == REMOVED:
+                try:
+                    self.panels.pop(change.index).close()
+                except Exception as e:
+                    print(f"Error closing panel: {e}")
+
+        # target_app lives at the preset level; the boxes of every panel carry it
+        if "extra" in diff.fields:
+            for panel, compiledPanel in zip(self.panels, compiled.panels):
+                panel.setCompiled(compiledPanel)
+
+        # The config window lists one row per panel; rebuild it
+        if self.configWindow and diff.panels:
+            self.configWindow.close()
+            self.configWindow = PresetConfigWindow(self.presetData, self.model, self)
+
     def updateOpacity(self):
         """Update opacity for all panels."""
         for panel in self.panels:
@@ -70,7 +70,7 @@ class PresetConfigWindow:
         self.window.setBecomesKeyOnlyIfNeeded_(True)
         self.window.setDelegate_(self.buttonDelegate)
         
-        presetName = getattr(self.presetData, 'name', 'Preset')
+        presetName = self.presetData.name
         self.window.setTitle_(f"Configure {presetName}")
         self.window.setAlphaValue_(0.95)
     
@@ -91,7 +91,7 @@ class PresetConfigWindow:
         )
         
         # Create document view (container for panel items)
-        panels = getattr(self.presetData, 'panels', [])
+        panels = self.presetData.panels
         numPanels = len(panels)
         itemHeight = 60
         totalHeight = max(numPanels * itemHeight + 20, bounds.size.height - 40)
@@ -146,7 +146,7 @@ class PresetConfigWindow:
         parentView.addSubview_(widthMinus)
         
         # Width value display
-        currentWidth = getattr(panelData, 'width', 1)
+        currentWidth = panelData.width
         widthValue = AppKit.NSTextField.alloc().initWithFrame_(
             AppKit.NSMakeRect(195, yPos + 20, 40, 20)
         )
@@ -193,7 +193,7 @@ class PresetConfigWindow:
         parentView.addSubview_(heightMinus)
         
         # Height value display
-        currentHeight = getattr(panelData, 'height', 1)
+        currentHeight = panelData.height
         heightValue = AppKit.NSTextField.alloc().initWithFrame_(
             AppKit.NSMakeRect(195, yPos - 5, 40, 20)
         )
@@ -220,12 +220,12 @@ class PresetConfigWindow:
     @objc.python_method
     def updateDisplay(self, index, fieldType):
         """Update the displayed value for width or height."""
-        panels = getattr(self.presetData, 'panels', [])
+        panels = self.presetData.panels
         if index >= len(panels):
             return
             
         panelData = panels[index]
-        value = getattr(panelData, fieldType, 1)
+        value = getattr(panelData, fieldType)
         
         # Find the text field with the matching identifier
         identifier = f"{fieldType}_{index}"
@@ -240,10 +240,10 @@ class PresetConfigWindow:
     
     def incrementWidth(self, index):
         """Increment the width of a panel."""
-        panels = getattr(self.presetData, 'panels', [])
+        panels = self.presetData.panels
         if index < len(panels):
             panelData = panels[index]
-            currentWidth = getattr(panelData, 'width', 1)
+            currentWidth = panelData.width
             panelData.width = currentWidth + 1
             self.updateDisplay(index, 'width')
             # Update the live panel grid
@@ -252,10 +252,10 @@ class PresetConfigWindow:
     
     def decrementWidth(self, index):
         """Decrement the width of a panel."""
-        panels = getattr(self.presetData, 'panels', [])
+        panels = self.presetData.panels
         if index < len(panels):
             panelData = panels[index]
-            currentWidth = getattr(panelData, 'width', 1)
+            currentWidth = panelData.width
             if currentWidth > 1:  # Prevent going below 1
                 panelData.width = currentWidth - 1
                 self.updateDisplay(index, 'width')
@@ -265,10 +265,10 @@ class PresetConfigWindow:
     
     def incrementHeight(self, index):
         """Increment the height of a panel."""
-        panels = getattr(self.presetData, 'panels', [])
+        panels = self.presetData.panels
         if index < len(panels):
             panelData = panels[index]
-            currentHeight = getattr(panelData, 'height', 1)
+            currentHeight = panelData.height
             panelData.height = currentHeight + 1
             self.updateDisplay(index, 'height')
             # Update the live panel grid
@@ -277,10 +277,10 @@ class PresetConfigWindow:
     
     def decrementHeight(self, index):
         """Decrement the height of a panel."""
-        panels = getattr(self.presetData, 'panels', [])
+        panels = self.presetData.panels
         if index < len(panels):
             panelData = panels[index]
-            currentHeight = getattr(panelData, 'height', 1)
+            currentHeight = panelData.height
             if currentHeight > 1:  # Prevent going below 1
                 panelData.height = currentHeight - 1
                 self.updateDisplay(index, 'height')
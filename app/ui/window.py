@@ -19,7 +19,14 @@ class PresetsView(AppKit.NSView):
 
         return self
 
-    def drawPresets(self):
+    def reloadPresets(self, openTags=()):
+        """Rebuild the list after presets were added, removed or renamed."""
+        for subview in list(self.subviews()):
+            subview.removeFromSuperview()
+        self.presets = self.model.presets
+        self.drawPresets(openTags)
+
+    def drawPresets(self, openTags=()):
         # Create scroll view to match the view's bounds
         scroll = AppKit.NSScrollView.alloc().initWithFrame_(self.bounds())
         scroll.setHasVerticalScroller_(True)
@@ -49,6 +56,8 @@ class PresetsView(AppKit.NSView):
             btn.setBezelStyle_(AppKit.NSBezelStyleRounded)
             # Use PushOnPushOff to allow persistent active state
             btn.setButtonType_(AppKit.NSButtonTypePushOnPushOff)
+            if i in openTags:
+                btn.setState_(AppKit.NSControlStateValueOn)
 
             # edit button
             editIcon = AppKit.NSImage.imageWithSystemSymbolName_accessibilityDescription_("pencil", "Edit")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""CursorBuffer vs a deque of point objects for cursor history.
+
+Appends simulated 120 Hz samples to core.cursorBuffer.CursorBuffer and to a
+bounded deque of (time, point) tuples, the shape the views kept before.
+Reports append cost, memory retained by a full history and the cost of
+reading a window and computing velocity / spread from it. Runs headless.
+
+    python benchmarks/cursorBufferBench.py [--samples 200000] [--capacity 512] [--window 64]
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from collections import deque, namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.cursorBuffer import CursorBuffer, velocity, spread, Window
+
+# Stand-in for the NSPoint structs PyObjC hands back
+Point = namedtuple('Point', ['x', 'y'])
+
+
+class DequeHistory:
+    def __init__(self, capacity):
+        self.samples = deque(maxlen=capacity)
+
+    def append(self, t, x, y):
+        self.samples.append((t, Point(x, y)))
+
+    def window(self, n):
+        recent = list(self.samples)[-n:]
+        return Window([s[0] for s in recent], [s[1].x for s in recent], [s[1].y for s in recent])
+
+
+def feed(history, count):
+    append = history.append
+    start = time.perf_counter()
+    for i in range(count):
+        t = i / 120.0
+        append(t, 400.0 + (i % 97) * 0.5, 300.0 + (i % 89) * 0.5)
+    return (time.perf_counter() - start) / count
+
+
+def retained(make, capacity):
+    tracemalloc.start()
+    history = make(capacity)
+    feed(history, capacity * 4)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def reads(history, n, repeat=20000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        w = history.window(n)
+        velocity(w)
+        spread(w)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--capacity", type=int, default=512)
+    parser.add_argument("--window", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'history':>12} {'ns/append':>10} {'retained KiB':>13} {'us/window+stats':>16}")
+    for name, make in (("deque+points", DequeHistory), ("CursorBuffer", CursorBuffer)):
+        history = make(args.capacity)
+        perAppend = feed(history, args.samples)
+        memory = retained(make, args.capacity)
+        perRead = reads(history, args.window)
+        print(f"{name:>12} {perAppend * 1e9:>10.0f} {memory / 1024:>13.1f} {perRead * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Shared adaptive cursor sampler vs fixed per-widget polling.
+
+Drives core.cursorSampler.CursorSampler from a SyntheticCursorSource on a
+virtual clock through four phases: cursor parked far from every target, an
+approach to one target (arriving halfway through), a dwell pending on it,
+and parked far away again. Reports cursor reads per second in each phase
+against the fixed timers the prototypes ran before (one 100 ms NSTimer per
+dwell box plus the joystick's 50 ms one), all running the whole time. Runs headless.
+
+    python benchmarks/cursorSamplerBench.py [--boxes 8] [--idle-rate 2] [--active-rate 60]
+"""
+import os
+import sys
+import heapq
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.cursorSampler import CursorSampler, SyntheticCursorSource
+from core.dwellScheduler import DwellTimer
+
+BOX_POLL = 0.1
+JOYSTICK_POLL = 0.05
+
+FAR = (1500.0, 900.0)
+TARGET = (200.0, 200.0, 50.0, 50.0)  # (x, y, w, h) of the first box
+
+
+class VirtualScheduler:
+    """The DwellScheduler interface on a simulated clock, run by advance()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.queue = []
+        self.seq = 0
+
+    def clock(self):
+        return self.now
+
+    def timer(self, callback):
+        return DwellTimer(callback)
+
+    def arm(self, timer, delay):
+        timer.generation += 1
+        timer.deadline = self.now + delay
+        self.seq += 1
+        heapq.heappush(self.queue, (timer.deadline, self.seq, timer.generation, timer))
+
+    def cancel(self, timer):
+        timer.generation += 1
+
+    def advance(self, until):
+        while self.queue and self.queue[0][0] <= until:
+            deadline, _, generation, timer = heapq.heappop(self.queue)
+            if generation != timer.generation:
+                continue
+            self.now = deadline
+            timer.callback()
+        self.now = until
+
+
+def lerp(a, b, f):
+    return a + (b - a) * f
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boxes", type=int, default=8)
+    parser.add_argument("--idle-rate", type=float, default=2.0)
+    parser.add_argument("--active-rate", type=float, default=60.0)
+    args = parser.parse_args()
+
+    tx, ty, tw, th = TARGET
+    centre = (tx + tw / 2, ty + th / 2)
+    phases = [
+        ("idle far away", 5.0, lambda f: FAR),
+        ("approach", 2.0, lambda f: (lerp(FAR[0], centre[0], min(2 * f, 1.0)), lerp(FAR[1], centre[1], min(2 * f, 1.0)))),
+        ("dwell pending", 1.0, lambda f: centre),
+        ("left, idle", 5.0, lambda f: FAR),
+    ]
+
+    scheduler = VirtualScheduler()
+    bounds = []
+    start = 0.0
+    for _, duration, _ in phases:
+        bounds.append((start, start + duration))
+        start += duration
+
+    def path(t):
+        for (name, duration, at), (begin, end) in zip(phases, bounds):
+            if t < end:
+                return at((t - begin) / duration)
+        return phases[-1][2](1.0)
+
+    source = SyntheticCursorSource(path, scheduler.clock)
+    sampler = CursorSampler(source, scheduler)
+
+    subscriptions = []
+    for i in range(args.boxes):
+        region = (tx + i * 80.0, ty, tw, th)
+        subscriptions.append(sampler.subscribe(lambda t, x, y: None, args.active_rate, args.idle_rate, region))
+
+    fixedRate = args.boxes / BOX_POLL + 1 / JOYSTICK_POLL
+    print(f"{args.boxes} boxes + joystick; fixed polling reads {fixedRate:.0f}/s in every phase")
+    print(f"{'phase':<16} {'seconds':>8} {'fixed/s':>9} {'adaptive/s':>11} {'saved':>7}")
+    totalFixed = totalAdaptive = 0.0
+    for (name, duration, _), (begin, end) in zip(phases, bounds):
+        subscriptions[0].setPending(name == "dwell pending")
+        before = source.reads
+        scheduler.advance(end)
+        reads = source.reads - before
+        fixed = fixedRate * duration
+        totalFixed += fixed
+        totalAdaptive += reads
+        print(f"{name:<16} {duration:>8.1f} {fixedRate:>9.0f} {reads / duration:>11.1f} {1 - reads / fixed:>7.0%}")
+    print(f"{'total':<16} {bounds[-1][1]:>8.1f} {totalFixed:>9.0f} {totalAdaptive:>11.0f} {1 - totalAdaptive / totalFixed:>7.0%}  (reads)")
+
+
+if __name__ == "__main__":
+    main()
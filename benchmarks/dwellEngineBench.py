@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Throughput of the dwell state machine on simulated cursor traffic.
+
+Drives core.dwellEngine.DwellEngine with a fake clock (no sleeping): a
+cursor wandering over a row of key targets at --rate Hz, trembling by a few
+points while it rests, plus a right-click target that is armed and aimed
+repeatedly. The key targets run with exitRadius equal to radius and then
+with a larger exitRadius, so the intents show how many presses the tremor
+undoes without hysteresis. Reports simulated events per second of wall time
+and the intents produced. Runs headless.
+
+    python benchmarks/dwellEngineBench.py [--events 200000] [--targets 16] [--rate 120]
+                                          [--radius 4] [--exit-radius 8]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.dwellEngine import DwellEngine, KEY_MODE, CLICK_MODE
+
+TARGET_WIDTH = 100.0
+TREMOR = 2.0  # points a resting headmouse wobbles by
+
+
+def keyTraffic(events, targets, rate, seed=0):
+    """Yield (t, x, y) for a cursor drifting along a row of targets, resting now and then."""
+    rng = random.Random(seed)
+    x, y = targets * TARGET_WIDTH / 2, 50.0
+    hold = 0
+    for i in range(events):
+        if hold:
+            hold -= 1
+            # Resting: tremor around the spot it stopped at
+            yield i / rate, x + rng.uniform(-TREMOR, TREMOR), y + rng.uniform(-TREMOR, TREMOR)
+            continue
+        if rng.random() < 0.01:
+            hold = int(rate * 0.5)
+        else:
+            x = min(max(x + rng.uniform(-20, 20), TREMOR), targets * TARGET_WIDTH - 1 - TREMOR)
+            y = min(max(y + rng.uniform(-2, 2), TREMOR), 99.0 - TREMOR)
+        yield i / rate, x, y
+
+
+def runKeys(events, targets, rate, radius, exitRadius):
+    counts = {}
+
+    def emit(intent):
+        counts[intent.kind] = counts.get(intent.kind, 0) + 1
+
+    engines = [DwellEngine(emit, 0.1, radius, mode=KEY_MODE, exitRadius=exitRadius) for _ in range(targets)]
+    current = None
+    start = time.perf_counter()
+    for t, x, y in keyTraffic(events, targets, rate):
+        index = int(x // TARGET_WIDTH)
+        if index != current:
+            if current is not None:
+                engines[current].exit(t)
+            engines[index].enter(x, y, t)
+            current = index
+        else:
+            engine = engines[index]
+            engine.move(x, y, t)
+            engine.tick(t)
+    return time.perf_counter() - start, counts
+
+
+def runClick(events, rate, radius, exitRadius):
+    counts = {}
+
+    def emit(intent):
+        counts[intent.kind] = counts.get(intent.kind, 0) + 1
+
+    engine = DwellEngine(emit, 0.25, radius, mode=CLICK_MODE, exitRadius=exitRadius)
+    rng = random.Random(1)
+    x = y = 0.0
+    start = time.perf_counter()
+    for i in range(events):
+        t = i / rate
+        if engine.state == "idle":
+            engine.enter(0.0, 0.0, t)
+            x = y = 0.0
+        elif rng.random() < 0.1:
+            x += rng.uniform(-40, 40)
+            y += rng.uniform(-40, 40)
+        engine.move(x, y, t)
+        engine.tick(t)
+    return time.perf_counter() - start, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--targets", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=120.0, help="simulated samples per second")
+    parser.add_argument("--radius", type=float, default=4.0, help="points a dwell tolerates")
+    parser.add_argument("--exit-radius", type=float, default=8.0, help="points to undo a completed dwell")
+    args = parser.parse_args()
+    simulated = args.events / args.rate
+
+    for label, exitRadius in (("no hysteresis", args.radius), ("hysteresis", args.exit_radius)):
+        seconds, counts = runKeys(args.events, args.targets, args.rate, args.radius, exitRadius)
+        print(f"key targets, {label:<14} (exit {exitRadius:g}): {args.events / seconds:>10.0f} events/s  "
+              f"({simulated:.0f}s simulated)  intents {counts}")
+    seconds, counts = runClick(args.events, args.rate, args.radius, args.exit_radius)
+    print(f"click target (exit {args.exit_radius:g}): {args.events / seconds:>10.0f} events/s  "
+          f"({simulated:.0f}s simulated)  intents {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Dwell activation latency and re-arm churn under headmouse jitter.
+
+Simulates a 120 Hz cursor that alternates deliberate moves with holds on a
+key target, adding Gaussian jitter to every sample. For each dwell setup it
+reports how long after a hold begins the key is pressed, how often the
+dwell deadline had to be re-armed, and presses that fired mid-move. Runs
+headless with a simulated clock.
+
+    python benchmarks/dwellJitterBench.py [--jitter 1.5] [--holds 200] [--delay 0.1]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.dwellEngine import DwellEngine, PRESS, ANCHOR_SAMPLES
+from core.oneEuroFilter import OneEuroFilter2D
+
+
+def samples(holds, rate, jitter, seed=0):
+    """Yield (t, x, y, holding) for alternating 0.3s moves and 0.6s holds."""
+    rng = random.Random(seed)
+    x, y = 200.0, 200.0
+    t = 0.0
+    step = 1.0 / rate
+    for _ in range(holds):
+        tx, ty = rng.uniform(100, 300), rng.uniform(100, 300)
+        moveTicks = int(0.3 * rate)
+        sx, sy = x, y
+        for i in range(1, moveTicks + 1):
+            x = sx + (tx - sx) * i / moveTicks
+            y = sy + (ty - sy) * i / moveTicks
+            yield t, x + rng.gauss(0, jitter), y + rng.gauss(0, jitter), False
+            t += step
+        for _ in range(int(0.6 * rate)):
+            yield t, x + rng.gauss(0, jitter), y + rng.gauss(0, jitter), True
+            t += step
+
+
+def run(holds, rate, jitter, delay, radius, exitRadius, smoothing, anchorSamples=ANCHOR_SAMPLES):
+    presses = []
+    def emit(intent):
+        if intent.kind == PRESS:
+            presses.append(intent.time)
+
+    engine = DwellEngine(emit, delay, radius,
+                         exitRadius=exitRadius, smoother=OneEuroFilter2D() if smoothing else None,
+                         anchorSamples=anchorSamples)
+    engine.enter(200.0, 200.0, 0.0)
+
+    latencies = []
+    rearms = 0
+    falsePresses = 0
+    holdStart = None
+    pressedThisHold = False
+    lastDeadline = engine.deadline
+    start = time.perf_counter()
+    for t, x, y, holding in samples(holds, rate, jitter):
+        if holding and holdStart is None:
+            holdStart = t
+            pressedThisHold = False
+        elif not holding:
+            holdStart = None
+
+        before = len(presses)
+        engine.tick(t)
+        engine.move(x, y, t)
+        if len(presses) > before:
+            if holdStart is None:
+                falsePresses += 1
+            elif not pressedThisHold:
+                latencies.append(presses[-1] - holdStart)
+                pressedThisHold = True
+        if engine.deadline is not None and engine.deadline != lastDeadline:
+            rearms += 1
+        lastDeadline = engine.deadline
+    elapsed = time.perf_counter() - start
+
+    simulated = t
+    latencies.sort()
+    median = latencies[len(latencies) // 2] if latencies else float("nan")
+    worst = latencies[-1] if latencies else float("nan")
+    return len(latencies), median, worst, rearms / simulated, falsePresses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jitter", type=float, default=1.5, help="std dev of jitter, points")
+    parser.add_argument("--holds", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=120.0)
+    parser.add_argument("--delay", type=float, default=0.1, help="dwell delay, seconds")
+    args = parser.parse_args()
+
+    # (name, radius, exitRadius, smoothing, anchorSamples)
+    setups = [
+        ("radius 0 (before)", 0.0, None, False, 1),
+        ("radius 4/8, 1-sample", 4.0, 8.0, False, 1),
+        ("radius 4/8", 4.0, 8.0, False, ANCHOR_SAMPLES),
+        ("radius 4/8 + 1euro", 4.0, 8.0, True, ANCHOR_SAMPLES),
+    ]
+    print(f"jitter {args.jitter} pt, dwell {args.delay * 1000:.0f} ms, {args.holds} holds at {args.rate:.0f} Hz")
+    print(f"{'setup':>20} {'activated':>9} {'median ms':>9} {'worst ms':>9} {'re-arms/s':>9} {'mid-move':>8}")
+    for name, radius, exitRadius, smoothing, anchorSamples in setups:
+        activated, median, worst, rearmRate, falsePresses, _ = run(
+            args.holds, args.rate, args.jitter, args.delay, radius, exitRadius, smoothing, anchorSamples)
+        print(f"{name:>20} {activated:>6}/{args.holds:<3}{median * 1000:>9.0f} {worst * 1000:>9.0f} "
+              f"{rearmRate:>9.1f} {falsePresses:>8}")
+
+
+if __name__ == "__main__":
+    main()
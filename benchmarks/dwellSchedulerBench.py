@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Thread-per-move dwell timers vs the shared DwellScheduler.
+
+Replays simulated headmouse motion at 120 Hz in real time across a row of
+dwell targets: the pointer drifts between targets and holds still now and
+then long enough for a dwell to fire. The old DwellBox started a
+threading.Timer on every move; the new one re-arms its handle on one shared
+scheduler thread. Reports threads started, peak live threads, dwells fired,
+CPU time and cost per re-arm. Runs headless; callbacks run inline instead of
+on the AppKit main thread.
+
+    python benchmarks/dwellSchedulerBench.py [--seconds 3] [--targets 16] [--rate 120]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.dwellScheduler import DwellScheduler
+
+DWELL_DELAY = 0.1  # DwellBox.delay
+
+
+class TimerTargets:
+    """The old DwellBox.startTimer / mouseExited_ logic."""
+    def __init__(self, count, onFire):
+        self.timers = [None] * count
+        self.onFire = onFire
+        self.started = 0
+
+    def move(self, i):
+        if self.timers[i]:
+            self.timers[i].cancel()
+        self.timers[i] = threading.Timer(DWELL_DELAY, self.onFire)
+        self.timers[i].start()
+        self.started += 1
+
+    def exit(self, i):
+        if self.timers[i]:
+            self.timers[i].cancel()
+
+    def close(self):
+        for timer in self.timers:
+            if timer:
+                timer.cancel()
+                timer.join()
+
+
+class SchedulerTargets:
+    def __init__(self, count, onFire):
+        self.scheduler = DwellScheduler()
+        self.scheduler.start()
+        self.timers = [self.scheduler.timer(onFire) for _ in range(count)]
+        self.started = 1
+
+    def move(self, i):
+        self.scheduler.arm(self.timers[i], DWELL_DELAY)
+
+    def exit(self, i):
+        self.scheduler.cancel(self.timers[i])
+
+    def close(self):
+        self.scheduler.stop()
+
+
+def motion(seconds, rate, targets, seed=0):
+    """Yield (time offset, target index or None while holding still) at rate Hz."""
+    rng = random.Random(seed)
+    position = targets / 2
+    hold = 0
+    for tick in range(int(seconds * rate)):
+        if hold:
+            hold -= 1
+            yield tick / rate, None
+            continue
+        if rng.random() < 0.01:
+            hold = int(rate * DWELL_DELAY * 1.5)  # hold still past the dwell delay
+        position = min(max(position + rng.uniform(-0.3, 0.3), 0), targets - 1e-9)
+        yield tick / rate, int(position)
+
+
+def run(kind, seconds, rate, count):
+    fired = []
+    baseThreads = threading.active_count()
+    targets = kind(count, lambda: fired.append(1))
+    peak = 0
+    moveTime = 0.0
+    moves = 0
+    current = None
+
+    cpuStart = time.process_time()
+    start = time.perf_counter()
+    for offset, index in motion(seconds, rate, count):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if index is not None:
+            t = time.perf_counter()
+            if current is not None and current != index:
+                targets.exit(current)
+            targets.move(index)
+            moveTime += time.perf_counter() - t
+            moves += 1
+            current = index
+        peak = max(peak, threading.active_count() - baseThreads)
+    time.sleep(DWELL_DELAY * 2)
+    cpu = time.process_time() - cpuStart
+    targets.close()
+    return targets.started, peak, len(fired), cpu, moveTime / max(moves, 1), moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--targets", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=120.0, help="mouse moves per second")
+    args = parser.parse_args()
+
+    print(f"{args.rate:.0f} Hz for {args.seconds:.0f}s over {args.targets} targets")
+    print(f"{'dwell timers':>16} {'moves':>6} {'threads':>8} {'peak live':>9} {'fired':>6} "
+          f"{'cpu ms':>7} {'us/move':>8}")
+    for name, kind in (("Timer per move", TimerTargets), ("DwellScheduler", SchedulerTargets)):
+        started, peak, fired, cpu, perMove, moves = run(kind, args.seconds, args.rate, args.targets)
+        print(f"{name:>16} {moves:>6} {started:>8} {peak:>9} {fired:>6} {cpu * 1000:>7.0f} {perMove * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Held-key table vs each source tracking its own pressed keys.
+
+Replays a random session: --boxes dwell boxes over a small set of keys (so
+several boxes share a key, as a WASD cluster next to a movement pad does) and
+a joystick holding up to two of the same keys, pressing and releasing for
+--events steps, then quits part-way through a hold. Each source
+either posts its own downs and ups (the old DwellBox.is_pressed and
+JoystickView.held_keys) or goes through core.heldKeys.HeldKeys. Reports
+events posted, downs sent for a key already down, ups sent while another
+source still held the key, keys left down after teardown, and the cost per
+press/release. Runs headless.
+
+    python benchmarks/heldKeysBench.py [--boxes 12] [--keys 4] [--events 20000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.heldKeys import HeldKeys
+from core.inputSequence import KEY_DOWN, keyDown, keyUp
+
+
+class Game:
+    """What the game sees: which keys are down, and the events that made no sense."""
+
+    def __init__(self):
+        self.down = set()
+        self.events = 0
+        self.repeatDowns = 0
+        self.earlyUps = 0
+        self.holders = None  # set by the replay: keycode -> sources that mean to hold it
+
+    def post(self, step):
+        self.events += 1
+        if step.kind == KEY_DOWN:
+            if step.value in self.down:
+                self.repeatDowns += 1
+            self.down.add(step.value)
+        else:
+            if self.holders.get(step.value):
+                self.earlyUps += 1
+            self.down.discard(step.value)
+
+
+class OwnTracking:
+    """Each source keeps its own set and posts straight away."""
+
+    def __init__(self, post):
+        self.post = post
+        self.owned = {}
+
+    def setHeld(self, owner, keycodes, group=None):
+        keys = self.owned.get(owner, set())
+        for keycode in keys - keycodes:
+            self.post(keyUp(keycode))
+        for keycode in keycodes - keys:
+            self.post(keyDown(keycode))
+        self.owned[owner] = set(keycodes)
+
+    def releaseAll(self, group=None):
+        pass  # nothing was wired to teardown
+
+
+def replay(table, game, boxes, keys, events, seed=1):
+    rng = random.Random(seed)
+    bindings = [rng.randrange(keys) for _ in range(boxes)]
+    intent = {}  # source -> keys it means to hold
+    game.holders = {}
+    panel = object()
+
+    def holders():
+        result = {}
+        for source, held in intent.items():
+            for keycode in held:
+                result.setdefault(keycode, set()).add(source)
+        return result
+
+    elapsed = 0.0
+    for _ in range(events):
+        if rng.random() < 0.3:
+            source = "joystick"
+            wanted = set(rng.sample(range(keys), rng.randint(0, 2)))
+        else:
+            source = rng.randrange(boxes)
+            wanted = set() if intent.get(source) else {bindings[source]}
+        intent[source] = wanted
+        game.holders = holders()
+        start = time.perf_counter()
+        table.setHeld(source, wanted, group=panel if source != "joystick" else None)
+        elapsed += time.perf_counter() - start
+
+    # Quit mid-hold: teardown is all that can let go
+    intent.clear()
+    game.holders = {}
+    table.releaseAll()
+    return elapsed / events * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boxes", type=int, default=12)
+    parser.add_argument("--keys", type=int, default=4)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'':<16} {'events':>8} {'repeat downs':>13} {'early ups':>10} {'stuck':>6} {'ns/op':>7}")
+    for label, make in (("own tracking", OwnTracking), ("held-key table", HeldKeys)):
+        game = Game()
+        cost = replay(make(game.post), game, args.boxes, args.keys, args.events)
+        print(f"{label:<16} {game.events:>8} {game.repeatDowns:>13} {game.earlyUps:>10} "
+              f"{len(game.down):>6} {cost:7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Grid-cell hit testing vs scanning every action rect.
+
+Builds core.hitGrid.HitGrid for panels up to the 64x64 grid limit, checks it
+against a linear scan of the action rects (what per-action tracking areas
+amount to) and times table build and lookups. Runs headless.
+
+    python benchmarks/hitGridBench.py [--grids 8 32 64] [--lookups 200000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.presetData import PanelData
+from core.presetCompiler import compilePanel
+from core.hitGrid import HitGrid, NO_ACTION
+
+VIEW_SIZE = 800.0
+
+
+def makePanel(grid, seed=0):
+    """A grid x grid panel tiled with 1x1 to 3x3 actions (a few overlapping)."""
+    rng = random.Random(seed)
+    actions = []
+    for y in range(0, grid, 2):
+        for x in range(0, grid, 2):
+            actions.append({"key": "a", "x": x, "y": y, "w": rng.randint(1, 3), "h": rng.randint(1, 3)})
+    return compilePanel(PanelData.fromJson({"width": grid, "height": grid, "actions": actions}))
+
+
+def scan(compiled, x, y, size):
+    """Topmost action whose rect contains the point, checking every action."""
+    hit = NO_ACTION
+    for i, a in enumerate(compiled.actions):
+        left = a.left * size
+        top = a.top * size
+        if left <= x < left + a.spanW * size and top <= y < top + a.spanH * size:
+            hit = i
+    return hit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grids", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'grid':>6} {'cells':>6} {'actions':>8} {'build ms':>9} {'grid ns/hit':>12} {'scan ns/hit':>12}")
+    for grid in args.grids:
+        compiled = makePanel(grid)
+        start = time.perf_counter()
+        hitGrid = HitGrid(compiled)
+        build = time.perf_counter() - start
+
+        points = [(rng.uniform(0, VIEW_SIZE), rng.uniform(0, VIEW_SIZE)) for _ in range(args.lookups)]
+        # Sample cell centres so float edges can't make the two methods disagree
+        step = VIEW_SIZE / grid
+        for row in range(grid):
+            for col in range(grid):
+                x, y = (col + 0.5) * step, (row + 0.5) * step
+                assert hitGrid.hitTest(x, y, VIEW_SIZE, VIEW_SIZE) == scan(compiled, x, y, VIEW_SIZE)
+
+        hitTest = hitGrid.hitTest
+        start = time.perf_counter()
+        for x, y in points:
+            hitTest(x, y, VIEW_SIZE, VIEW_SIZE)
+        perGrid = (time.perf_counter() - start) / len(points)
+
+        scanPoints = points[:max(1, len(points) // 100)]
+        start = time.perf_counter()
+        for x, y in scanPoints:
+            scan(compiled, x, y, VIEW_SIZE)
+        perScan = (time.perf_counter() - start) / len(scanPoints)
+
+        print(f"{grid:>6} {grid * grid:>6} {len(compiled.actions):>8} {build * 1000:>9.2f} "
+              f"{perGrid * 1e9:>12.0f} {perScan * 1e9:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Input sequences on the executor thread vs post / sleep / post inline.
+
+Starts staggered right-click (50 ms hold) and key-tap (1 ms hold) sequences
+the way rightclick.py and full-window.py do, once with the sleeps on the
+calling thread and once through core.inputSequence.SequenceExecutor with a
+RecordingInputSink. Reports how long the caller (the UI thread in the app)
+is blocked per sequence, and the executor's per-step timing error with and
+without the spin lead. Runs headless.
+
+    python benchmarks/inputSequenceBench.py [--sequences 200] [--stagger 0.007]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.inputSequence import (SequenceExecutor, click, keyTap, RIGHT_BUTTON, CLICK_HOLD,
+                                KEY_TAP_HOLD, SPIN_LEAD)
+from core.inputSink import RecordingInputSink
+
+
+def sequence(i):
+    if i % 2:
+        return click(RIGHT_BUTTON, 100.0, 100.0)
+    return keyTap(0x7E)
+
+
+def inline(sink, count, stagger):
+    """The old way: post, sleep on the caller's thread, post."""
+    blocked = []
+    for i in range(count):
+        hold = CLICK_HOLD if i % 2 else KEY_TAP_HOLD
+        down, _, up = sequence(i)
+        start = time.perf_counter()
+        sink.post(down)
+        time.sleep(hold)
+        sink.post(up)
+        blocked.append(time.perf_counter() - start)
+        time.sleep(stagger)
+    return blocked
+
+
+def executed(sink, count, stagger, lead):
+    executor = SequenceExecutor(sink, lead=lead)
+    finished = threading.Semaphore(0)
+    blocked = []
+    runs = []
+    for i in range(count):
+        start = time.perf_counter()
+        runs.append(executor.run(sequence(i), lambda run: finished.release()))
+        blocked.append(time.perf_counter() - start)
+        time.sleep(stagger)
+    for _ in range(count):
+        finished.acquire()
+    executor.stop()
+    errors = sorted(timing.error for run in runs for timing in run.report())
+    return blocked, errors
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.3f} ms"
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sequences", type=int, default=200)
+    parser.add_argument("--stagger", type=float, default=0.007, help="seconds between sequence starts")
+    args = parser.parse_args()
+
+    blocked = inline(RecordingInputSink(), args.sequences, args.stagger)
+    print(f"inline sleeps:  caller blocked {ms(sum(blocked) / len(blocked))} per sequence, "
+          f"{ms(sum(blocked))} in total")
+
+    for lead in (0.0, SPIN_LEAD):
+        blocked, errors = executed(RecordingInputSink(), args.sequences, args.stagger, lead)
+        print(f"executor lead {lead * 1000:.0f} ms: caller blocked {ms(sum(blocked) / len(blocked))} per sequence; "
+              f"step error p50 {ms(percentile(errors, 0.5))}  p99 {ms(percentile(errors, 0.99))}  "
+              f"max {ms(errors[-1])}")
+
+
+if __name__ == "__main__":
+    main()
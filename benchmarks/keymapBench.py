@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Interned chord lookups vs rebuilding keycode_map and parsing modifiers per call.
+
+The prototypes built a keycode_map dict literal in every DwellBox init and
+again in every send_keys call, then looped over the key list to collect
+modifier flags. This times that against core.keymap.chordFor (parse once,
+then one dict hit) and against posting from a chord resolved at load time,
+and checks how many of a set of real-world key names each approach knows.
+Runs headless.
+
+    python benchmarks/keymapBench.py [--calls 200000]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.keymap import chordFor, NO_KEYCODE
+
+HOTKEYS = [["cmd", "c"], ["ctrl", "shift", "f5"], ["space"], ["shift", "tab"], ["alt", "num5"]]
+
+NAMES = ["w", "space", "f1", "f12", "num0", "numenter", "shift", "control", "[", ";",
+         "/", "escape", "pageup", "home", "`", "capslock", "ctrl+shift+f5", "cmd+s"]
+
+
+def oldSendKeys(keys):
+    """The removed HotkeyWindow.send_keys, minus the posting."""
+    keycode_map = {
+        "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
+        "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
+        "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
+        "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
+        "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
+        "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
+        "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
+        "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
+        "return": 0x24, "delete": 0x33,
+    }
+    flags = 0
+    regular_key = None
+    for key in keys:
+        key_lower = key.lower()
+        if key_lower in ["command", "cmd"]:
+            flags |= 0x00100000
+        elif key_lower in ["control", "ctrl"]:
+            flags |= 0x00040000
+        elif key_lower in ["shift"]:
+            flags |= 0x00020000
+        elif key_lower in ["option", "alt"]:
+            flags |= 0x00080000
+        else:
+            regular_key = key_lower
+    if regular_key and regular_key in keycode_map:
+        return keycode_map[regular_key], flags
+    return None
+
+
+def timed(fn, calls):
+    start = time.perf_counter()
+    fn(calls)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+    hotkeys = HOTKEYS
+    joined = ["+".join(keys) for keys in HOTKEYS]
+    chords = [chordFor(text) for text in joined]
+
+    def old(calls):
+        for i in range(calls):
+            oldSendKeys(hotkeys[i % 5])
+
+    def cached(calls):
+        for i in range(calls):
+            chordFor("+".join(hotkeys[i % 5]))
+
+    def interned(calls):
+        for i in range(calls):
+            chord = chords[i % 5]
+            chord.keycode, chord.flags
+
+    print(f"keycode_map + modifier loop per call: {timed(old, args.calls):7.0f} ns")
+    print(f"chordFor(join(keys)), cached:         {timed(cached, args.calls):7.0f} ns")
+    print(f"chord resolved at load time:          {timed(interned, args.calls):7.0f} ns")
+
+    oldKnown = sum(oldSendKeys(name.split("+")) is not None for name in NAMES)
+    newKnown = sum(chordFor(name).keycode != NO_KEYCODE for name in NAMES)
+    print(f"names known: old {oldKnown}/{len(NAMES)}, keymap {newKnown}/{len(NAMES)}")
+    print(f"interned: {chordFor('Ctrl+Shift+F5') is chordFor('shift+control+f5')}")
+
+
+if __name__ == "__main__":
+    main()
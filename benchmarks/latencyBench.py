@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Latency tracing: what it costs, how accurate it is, and what it reports.
+
+1. Cost per call site with tracing off (one attribute lookup and a None test)
+   and on (a histogram record), and output pipeline throughput both ways.
+2. Percentiles from core.latency.LatencyHistogram against an exact sort of
+   the same log-normal sample.
+3. A headless run of the real path: --boxes core.dwellAction.DwellActions
+   (what a DwellBox wraps) on one DwellScheduler, whose fires are dispatched
+   to a stand-in main loop. Each box's DwellEngine completes, handleIntent
+   presses the key through a HeldKeys table into an OutputPipeline
+   (RecordingInputSink), and the loop moves the cursor out and back in to
+   start the next dwell, for --seconds, with tracing on. Prints the
+   per-stage p50 / p95 / p99 the app would write to latency.json (no
+   "event" stage: no NSEvents).
+
+    python benchmarks/latencyBench.py [--boxes 20] [--seconds 2] [--samples 200000]
+"""
+import os
+import sys
+import time
+import queue
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core import latency
+from core.dwellAction import DwellAction
+from core.dwellScheduler import DwellScheduler
+from core.heldKeys import HeldKeys
+from core.inputSequence import SequenceExecutor, keyDown, keyUp
+from core.inputSink import RecordingInputSink
+from core.keymap import KEYCODES, chordFor
+from core.outputPipeline import OutputPipeline
+from core.presetCompiler import CompiledAction
+from core.targetProcess import TargetResolver, FakeNotificationSource
+from core.turbo import TurboRepeater
+
+
+def callSite(calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        tracer = latency.tracer
+        if tracer is not None:
+            tracer.record(latency.DWELL, 0.0004)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def emptyLoop(calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        pass
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def pipelineRate(steps):
+    pipeline = OutputPipeline(RecordingInputSink(), capacity=steps * 2)
+    pipeline.start()
+    start = time.perf_counter()
+    for i in range(0, steps, 2):
+        pipeline.submitAll((keyDown(i % 50), keyUp(i % 50)))
+    pipeline.flush()
+    elapsed = time.perf_counter() - start
+    pipeline.stop()
+    return steps / elapsed
+
+
+def accuracy(samples):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-7.0, 1.0) for _ in range(samples)]  # median ~0.9 ms
+    histogram = latency.LatencyHistogram()
+    start = time.perf_counter()
+    for value in values:
+        histogram.record(value)
+    cost = (time.perf_counter() - start) / samples * 1e9
+    exact = sorted(int(v * 1e6) for v in values)
+    print(f"record: {cost:.0f} ns, {len(histogram.counts)} buckets")
+    for q in latency.PERCENTILES:
+        want = exact[max(0, int(q * samples + 0.999999) - 1)]
+        got = histogram.percentile(q)
+        print(f"  p{q * 100:g}: exact {want} µs, histogram {got} µs ({(got - want) / want * 100:+.1f}%)")
+
+
+def endToEnd(boxes, seconds):
+    tracer = latency.enableTracing()
+    tracer.clear()
+    pipeline = OutputPipeline(RecordingInputSink())
+    pipeline.start()
+    mainLoop = queue.Queue()  # stands in for AppHelper.callAfter and the main thread
+    scheduler = DwellScheduler(mainLoop.put)
+    held = HeldKeys(pipeline.submit)
+    executor = SequenceExecutor(pipeline)
+    repeater = TurboRepeater(held, executor.scheduler)
+    apps = FakeNotificationSource()
+    apps.launch(100, "game")
+    apps.activate(100)
+    resolver = TargetResolver(apps)
+
+    rng = random.Random(3)
+    keys = sorted(KEYCODES)[:boxes]
+    actions = []
+    for i, key in enumerate(keys):
+        action = CompiledAction(i, key, KEYCODES[key], chordFor(key), i, 0, 1, 1,
+                                0.0, 0.0, 1.0, 1.0, None, None)
+        dwell = DwellAction(action, scheduler, held, executor, repeater, resolver)
+        dwell.configure(rng.uniform(0.05, 0.15), 4.0, 8.0)
+        dwell.cursorEntered(50.0, 50.0)
+        actions.append(dwell)
+
+    scheduler.start()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        try:
+            fire = mainLoop.get(timeout=0.01)
+        except queue.Empty:
+            continue
+        fire()
+        # A pressed box: leave and come back, which releases the key and starts over
+        for dwell in actions:
+            if dwell.engine.pressed:
+                dwell.cursorExited()
+                dwell.cursorEntered(50.0, 50.0)
+    for dwell in actions:
+        dwell.close()
+    scheduler.stop()
+    executor.stop()
+    pipeline.stop()
+    latency.disableTracing()
+
+    print(f"{'stage':<10} {'count':>7} {'p50 µs':>8} {'p95 µs':>8} {'p99 µs':>8} {'max µs':>8}")
+    for stage, summary in tracer.report().items():
+        if summary["count"]:
+            print(f"{stage:<10} {summary['count']:>7} {summary['p50Us']:>8} {summary['p95Us']:>8} "
+                  f"{summary['p99Us']:>8} {summary['maxUs']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boxes", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--samples", type=int, default=200000)
+    args = parser.parse_args()
+
+    calls = args.samples
+    base = emptyLoop(calls)
+    latency.disableTracing()
+    off = callSite(calls)
+    offRate = pipelineRate(calls)
+    latency.enableTracing()
+    on = callSite(calls)
+    onRate = pipelineRate(calls)
+    latency.disableTracing()
+    print(f"call site: off {off - base:5.0f} ns, on {on - base:5.0f} ns (over an empty loop)")
+    print(f"pipeline: off {offRate / 1000:6.0f}k steps/s, on {onRate / 1000:6.0f}k steps/s")
+
+    accuracy(args.samples)
+    endToEnd(args.boxes, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Macro timelines on the shared executor vs one threading.Timer per step.
+
+Compiles a "hold shift, tap 1-2-3 (x3), release" macro with core.macro, then
+plays --macros staggered copies through one SequenceExecutor (RecordingInputSink)
+and, for comparison, by starting a threading.Timer for every step the way a
+naive implementation would. Each runs idle and under load (a busy Python
+thread competing for the GIL). Reports compile cost, threads started, and
+per-step lateness p50 / p95 / p99 / max from the executor's jitter record,
+and checks that every key event inside the held shift carries the shift flag
+(events posted to a pid don't inherit modifier state).
+
+    python benchmarks/macroBench.py [--macros 50] [--stagger 0.013]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.macro import compileMacro
+from core.keymap import KEYCODES, MODIFIER_FLAGS
+from core.inputSequence import SequenceExecutor, KEY_DOWN
+from core.inputSink import RecordingInputSink
+
+MACRO = [{"press": "shift"}, "1", {"delay": 0.01}, "2", {"delay": 0.01}, {"tap": "3", "repeat": 3},
+         {"release": "shift"}]
+
+
+class Load:
+    """A thread that keeps the interpreter busy, like layout or a save running alongside."""
+
+    def __init__(self):
+        self.stopped = False
+        self.thread = threading.Thread(target=self.spin, daemon=True)
+
+    def spin(self):
+        total = 0
+        while not self.stopped:
+            for i in range(1000):
+                total += i * i
+
+    def __enter__(self):
+        self.thread.start()
+
+    def __exit__(self, *exc):
+        self.stopped = True
+        self.thread.join()
+
+
+def shiftCarried(timeline):
+    """(key events while shift is held, how many of them lack the shift flag)"""
+    shiftKey, shiftFlag = KEYCODES["shift"], MODIFIER_FLAGS["shift"]
+    inside = missing = 0
+    holding = False
+    for step in timeline.steps:
+        if step.value == shiftKey:
+            holding = step.kind == KEY_DOWN
+            continue
+        if holding:
+            inside += 1
+            missing += not step.flags & shiftFlag
+    return inside, missing
+
+
+def viaExecutor(timeline, macros, stagger):
+    executor = SequenceExecutor(RecordingInputSink())
+    finished = threading.Semaphore(0)
+    before = threading.active_count()
+    for _ in range(macros):
+        executor.runTimeline(timeline, lambda run: finished.release())
+        time.sleep(stagger)
+    threads = threading.active_count() - before
+    for _ in range(macros):
+        finished.acquire()
+    executor.stop()
+    return sorted(executor.jitter()), threads + 1  # + the executor's own thread
+
+
+def viaTimers(timeline, macros, stagger):
+    sink = RecordingInputSink()
+    errors = []
+    lock = threading.Lock()
+    timers = []
+
+    def fire(step, due):
+        late = time.monotonic() - due
+        sink.post(step)
+        with lock:
+            errors.append(late)
+
+    for _ in range(macros):
+        start = time.monotonic()
+        for offset, step in zip(timeline.offsets, timeline.steps):
+            timer = threading.Timer(offset, fire, (step, start + offset))
+            timer.start()
+            timers.append(timer)
+        time.sleep(stagger)
+    for timer in timers:
+        timer.join()
+    return sorted(errors), len(timers)
+
+
+def summary(label, errors, threads):
+    def p(q):
+        return errors[min(len(errors) - 1, int(len(errors) * q))] * 1000
+    print(f"{label:<24} {threads:>7} {p(0.5):8.3f} {p(0.95):8.3f} {p(0.99):8.3f} {errors[-1] * 1000:8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--macros", type=int, default=50)
+    parser.add_argument("--stagger", type=float, default=0.013, help="seconds between macro starts")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        timeline = compileMacro(MACRO)
+    print(f"compile: {(time.perf_counter() - start) * 1000:.1f} µs per macro, "
+          f"{len(timeline.steps)} steps over {timeline.duration * 1000:.0f} ms")
+    inside, missing = shiftCarried(timeline)
+    print(f"shift carried: {inside - missing}/{inside} key events inside the hold"
+          + ("" if not missing else "  <-- MISSING MODIFIER"))
+
+    print(f"{'':<24} {'threads':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for loaded in (False, True):
+        suffix = ", loaded" if loaded else ""
+        with Load() if loaded else _Idle():
+            summary("executor" + suffix, *viaExecutor(timeline, args.macros, args.stagger))
+        with Load() if loaded else _Idle():
+            summary("timer per step" + suffix, *viaTimers(timeline, args.macros, args.stagger))
+
+
+class _Idle:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+if __name__ == "__main__":
+    main()
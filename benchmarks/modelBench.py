@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Load / serialize / save benchmark for Model, with regression checks.
+
+Builds synthetic resources/ folders (presets x panels x actions) in a temp
+directory and times the Model end to end. Runs headless (no AppKit needed).
+
+Phases, each timed best-of-N and then re-run once under tracemalloc for
+peak memory:
+  coldLoad   Model() + open every preset, no index or parsed-preset cache
+  warmLoad   the same with the index and cache left by a previous run
+  serialize  every preset encoded by core.presetWriter (indent=4), as save does
+  save       every preset marked dirty, then Model.save()
+
+    python benchmarks/modelBench.py [--presets 10 100 1000] [--panels 4] [--actions 50]
+                                    [--output results.json]
+                                    [--compare baseline.json] [--threshold 0.2]
+
+With --compare, exits 1 when any phase is slower than the baseline by more
+than the threshold (0.2 = 20%).
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from model import Model
+from core.tracking import markDirty
+from core.presetWriter import writePreset
+from synthetic import writeResources
+
+PHASES = ("coldLoad", "warmLoad", "serialize", "save")
+
+
+def openAll(resourceDir):
+    model = Model(resourceDir)
+    for i in range(len(model.presets)):
+        model.getPreset(i)
+    return model
+
+
+def clearCaches(resourceDir):
+    shutil.rmtree(os.path.join(resourceDir, "cache"), ignore_errors=True)
+    for name in ("presetIndex.json", "journal.log"):
+        try:
+            os.remove(os.path.join(resourceDir, name))
+        except FileNotFoundError:
+            pass
+
+
+def measure(setup, body, repeat):
+    """Best wall time of body over repeat runs, then its tracemalloc peak."""
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        body(state)
+        best = min(best, time.perf_counter() - start)
+
+    state = setup()
+    tracemalloc.start()
+    body(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def runCase(resourceDir, repeat):
+    """Time every phase against one resources folder. Returns {phase: (seconds, peakBytes)}."""
+    results = {}
+
+    def cold():
+        clearCaches(resourceDir)
+        return resourceDir
+    results["coldLoad"] = measure(cold, lambda d: openAll(d).close(), repeat)
+
+    openAll(resourceDir).close()  # leave a warm index and cache behind
+    results["warmLoad"] = measure(lambda: resourceDir, lambda d: openAll(d).close(), repeat)
+
+    model = openAll(resourceDir)
+    presets = model.loadedPresets()
+
+    def serialize(_):
+        for data in presets:
+            writePreset(data, [].append, model.presetIndent)
+    results["serialize"] = measure(lambda: None, serialize, repeat)
+
+    def dirty():
+        for data in presets:
+            markDirty(data)
+    results["save"] = measure(dirty, lambda _: model.save(), repeat)
+
+    model.close()
+    return results
+
+
+def caseKey(case):
+    return f"{case['presets']}x{case['panels']}x{case['actions']}"
+
+
+def gitCommit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Return a line per phase that got slower than baseline by more than threshold."""
+    previous = {caseKey(c): c for c in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        old = previous.get(caseKey(case))
+        if old is None:
+            continue
+        for phase in PHASES:
+            before = old["phases"].get(phase, {}).get("seconds")
+            after = case["phases"][phase]["seconds"]
+            if before and after > before * (1 + threshold):
+                regressions.append(f"{caseKey(case)} {phase}: {before * 1000:.1f} -> {after * 1000:.1f} ms "
+                                   f"(+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--presets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--panels", type=int, nargs="+", default=[4], help="panels per preset")
+    parser.add_argument("--actions", type=int, nargs="+", default=[50], help="actions per panel")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON here")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": gitCommit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+        },
+        "cases": [],
+    }
+
+    print(f"{'case':>14} {'phase':>10} {'ms':>10} {'presets/s':>10} {'actions/s':>11} {'peak KiB':>10}")
+    for count in args.presets:
+        for panels in args.panels:
+            for actions in args.actions:
+                with tempfile.TemporaryDirectory() as resourceDir:
+                    writeResources(resourceDir, count, panels, actions)
+                    # Model logs every load and save; keep the table readable
+                    with redirect_stdout(io.StringIO()):
+                        timings = runCase(resourceDir, args.repeat)
+
+                case = {"presets": count, "panels": panels, "actions": actions, "phases": {}}
+                totalActions = count * panels * actions
+                for phase in PHASES:
+                    seconds, peak = timings[phase]
+                    case["phases"][phase] = {
+                        "seconds": seconds,
+                        "presetsPerSec": count / seconds,
+                        "actionsPerSec": totalActions / seconds,
+                        "peakBytes": peak,
+                    }
+                    print(f"{caseKey(case):>14} {phase:>10} {seconds * 1000:>10.1f} {count / seconds:>10.0f} "
+                          f"{totalActions / seconds:>11.0f} {peak / 1024:>10.0f}")
+                results["cases"].append(case)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
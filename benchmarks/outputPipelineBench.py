@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Output pipeline throughput, ordering and latency with a recording sink.
+
+Several producer threads (the main thread and dwell/scheduler threads in the
+app) submit key down/up pairs to core.outputPipeline.OutputPipeline, whose
+poster thread hands them to a RecordingInputSink that spins for --post-cost
+to stand in for CGEventPost. Reports the cost per event for the caller
+compared with posting inline, throughput, queue depth and submit-to-post
+latency, and checks that every key's events come out down, up, down, up.
+A final burst larger than the queue shows that only downs are dropped.
+
+    python benchmarks/outputPipelineBench.py [--producers 4] [--pairs 5000] [--post-cost 0.00002]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.inputSequence import keyDown, keyUp, KEY_DOWN
+from core.inputSink import RecordingInputSink
+from core.outputPipeline import OutputPipeline
+
+
+class SlowSink(RecordingInputSink):
+    def __init__(self, cost):
+        super().__init__()
+        self.cost = cost
+
+    def post(self, step):
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        super().post(step)
+
+
+def produce(submit, keycode, pairs, timings, interval):
+    spent = 0.0
+    for _ in range(pairs):
+        start = time.perf_counter()
+        submit(keyDown(keycode))
+        submit(keyUp(keycode))
+        spent += time.perf_counter() - start
+        if interval:
+            time.sleep(interval)
+    timings.append(spent / (pairs * 2))
+
+
+def run(submit, producers, pairs, interval=0.0):
+    timings = []
+    threads = [threading.Thread(target=produce, args=(submit, 0x20 + i, pairs, timings, interval))
+               for i in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sum(timings) / len(timings)
+
+
+def ordered(posted):
+    down = {}
+    for _, step in posted:
+        isDown = step.kind == KEY_DOWN
+        if down.get(step.value, False) == isDown:
+            return False
+        down[step.value] = isDown
+    return True
+
+
+def us(seconds):
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--pairs", type=int, default=5000)
+    parser.add_argument("--post-cost", type=float, default=0.00002, help="seconds per simulated CGEventPost")
+    args = parser.parse_args()
+    events = args.producers * args.pairs * 2
+
+    lock = threading.Lock()
+    sink = SlowSink(args.post_cost)
+
+    def inline(step):
+        with lock:  # the events would interleave arbitrarily without one
+            sink.post(step)
+
+    elapsed, perEvent = run(inline, args.producers, args.pairs)
+    print(f"inline:   caller {us(perEvent)} per event, {events / elapsed:9.0f} events/s")
+
+    sink = SlowSink(args.post_cost)
+    pipeline = OutputPipeline(sink, capacity=events)
+    pipeline.start()
+    elapsed, perEvent = run(pipeline.submit, args.producers, args.pairs)
+    pipeline.flush()
+    elapsed = max(elapsed, sink.posted[-1].time - sink.posted[0].time)
+    metrics = pipeline.metrics()
+    pipeline.stop()
+    print(f"pipeline: caller {us(perEvent)} per event, {events / elapsed:9.0f} events/s, "
+          f"max depth {metrics['maxDepth']} (flooded)")
+    print(f"          {len(sink.posted)} posted, per-key order {'kept' if ordered(sink.posted) else 'BROKEN'}")
+
+    # Game-like load: each producer taps a key every 5 ms
+    sink = SlowSink(args.post_cost)
+    pipeline = OutputPipeline(sink)
+    pipeline.start()
+    run(pipeline.submit, args.producers, 200, 0.005)
+    pipeline.flush()
+    metrics = pipeline.metrics()
+    pipeline.stop()
+    print(f"paced:    max depth {metrics['maxDepth']}, submit-to-post latency mean {us(metrics['meanLatency'])} "
+          f"max {us(metrics['maxLatency'])}, {metrics['dropped']} dropped")
+
+    sink = SlowSink(args.post_cost)
+    pipeline = OutputPipeline(sink, capacity=64)
+    pipeline.start()
+    with pipeline.cond:  # hold the poster off so the burst overflows the queue
+        for i in range(200):
+            pipeline.submit(keyDown(0x30 + i % 8))
+            pipeline.submit(keyUp(0x30 + i % 8))
+    pipeline.flush()
+    pipeline.stop()
+    ups = sum(1 for _, step in sink.posted if step.kind != KEY_DOWN)
+    print(f"burst of 400 into 64 slots: {pipeline.dropped} downs dropped, {ups}/200 ups posted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Serial vs thread-pool preset loading.
+
+Writes synthetic preset libraries of 10, 100 and 1000 files to a temp
+directory and times core.presetLoader.loadPresetFiles with one worker and
+with a pool. Runs headless (no AppKit needed). Decoding holds the GIL, so
+the pool only pays off with several cores and cold file reads.
+
+    python benchmarks/presetLoadBench.py [--sizes 10 100 1000] [--actions 50]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.presetLoader import loadPresetFiles
+from synthetic import writeLibrary
+
+
+def timeLoad(paths, workers, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        presets, errors = loadPresetFiles(paths, workers=workers)
+        best = min(best, time.perf_counter() - start)
+        assert not errors and len(presets) == len(paths)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--panels", type=int, default=2)
+    parser.add_argument("--actions", type=int, default=50, help="actions per panel")
+    parser.add_argument("--workers", type=int, default=4, help="pool size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'presets':>8} {'serial ms':>10} {'pool ms':>10} {'speedup':>8}")
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = writeLibrary(directory, count, args.panels, args.actions)
+            serial = timeLoad(paths, 1, args.repeat)
+            parallel = timeLoad(paths, args.workers, args.repeat)
+        print(f"{count:>8} {serial * 1000:>10.1f} {parallel * 1000:>10.1f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
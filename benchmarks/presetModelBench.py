@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Before/after benchmark for the preset data model.
+
+Compares the old SimpleNamespace object_hook + getattr layout loop against
+PresetData with packed action cells: parse time, layout-loop time and
+memory held per action. Runs headless (no AppKit needed).
+
+    python benchmarks/presetModelBench.py [--panels 4] [--actions 2000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.presetData import PresetData, ACTION_STRIDE, X, Y
+from synthetic import makePreset
+
+
+def loadBefore(text):
+    return json.loads(text, object_hook=lambda d: SimpleNamespace(**d))
+
+
+def loadAfter(text):
+    return PresetData.fromJson(json.loads(text))
+
+
+def layoutBefore(preset):
+    # Mirrors the old PanelView.createButtons/updateButtons reads
+    rects = 0
+    for panel in getattr(preset, 'panels', []):
+        pWidth = getattr(panel, 'width', 1)
+        pHeight = getattr(panel, 'height', 1)
+        if pWidth == 0: pWidth = 1
+        if pHeight == 0: pHeight = 1
+        gridW = 800.0 / pWidth
+        gridH = 800.0 / pHeight
+        for act in getattr(panel, 'actions', []):
+            rect = (act.x * gridW, act.y * gridH, gridW, gridH)
+            rects += 1
+    return rects
+
+
+def layoutAfter(preset):
+    rects = 0
+    for panel in preset.panels:
+        pWidth = panel.width
+        pHeight = panel.height
+        if pWidth == 0: pWidth = 1
+        if pHeight == 0: pHeight = 1
+        gridW = 800.0 / pWidth
+        gridH = 800.0 / pHeight
+        cells = panel.actions.cells
+        for x, y in zip(cells[X::ACTION_STRIDE], cells[Y::ACTION_STRIDE]):
+            rect = (x * gridW, y * gridH, gridW, gridH)
+            rects += 1
+    return rects
+
+
+def timeIt(fn, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def heldBytes(load, text):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    preset = load(text)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held, preset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--panels", type=int, default=4)
+    parser.add_argument("--actions", type=int, default=2000, help="actions per panel")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = json.dumps(makePreset(args.panels, args.actions))
+    total = args.panels * args.actions
+
+    rows = []
+    for label, load, layout in (("SimpleNamespace", loadBefore, layoutBefore),
+                                ("PresetData", loadAfter, layoutAfter)):
+        held, preset = heldBytes(load, text)
+        rows.append((label, timeIt(load, text, args.repeat), timeIt(layout, preset, args.repeat), held))
+
+    print(f"{args.panels} panel(s) x {args.actions} action(s) = {total} actions")
+    print(f"{'model':<16} {'parse ms':>10} {'layout ms':>10} {'bytes/action':>13}")
+    for label, parse, layout, held in rows:
+        print(f"{label:<16} {parse * 1000:>10.2f} {layout * 1000:>10.2f} {held / total:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
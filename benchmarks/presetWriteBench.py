@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Streaming preset writer vs toJson() + json.dump.
+
+Times writing one preset file the old way (build dicts with toJson, then
+json.dump with indent=4) against core.presetWriter streaming the tree into
+the file, indented and compact, for growing action counts. Also reports
+tracemalloc peak per write. Runs headless (no AppKit needed).
+
+    python benchmarks/presetWriteBench.py [--panels 4] [--actions 100 1000 5000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.journal import writeAtomic
+from core.presetData import PresetData
+from core.presetWriter import writePreset
+from synthetic import makePreset
+
+
+def writeBefore(data, path):
+    writeAtomic(path, lambda f: json.dump(data.toJson(), f, indent=4))
+
+
+def writeStreamed(data, path):
+    writeAtomic(path, lambda f: writePreset(data, f.write, 4))
+
+
+def writeCompact(data, path):
+    writeAtomic(path, lambda f: writePreset(data, f.write, None))
+
+
+def measure(write, data, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        write(data, path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    write(data, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--panels", type=int, default=4)
+    parser.add_argument("--actions", type=int, nargs="+", default=[100, 1000, 5000], help="actions per panel")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    writers = [("toJson+dump", writeBefore), ("streamed", writeStreamed), ("compact", writeCompact)]
+    print(f"{'actions':>8} {'writer':>12} {'ms':>9} {'peak KiB':>9} {'file KiB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "preset.json")
+        for actions in args.actions:
+            data = PresetData.fromJson(makePreset(args.panels, actions), path)
+            for name, write in writers:
+                seconds, peak, size = measure(write, data, path, args.repeat)
+                print(f"{args.panels * actions:>8} {name:>12} {seconds * 1000:>9.2f} "
+                      f"{peak / 1024:>9.0f} {size / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Synthetic preset libraries for the benchmarks.
+
+Presets are deterministic for a given seed so runs are comparable across
+commits.
+"""
+import os
+import json
+import random
+
+KEYS = ["a", "s", "d", "w", "space", "1", "2", "3"]
+
+
+def makePreset(panels, actions, seed=0, grid=40):
+    """A preset dict with the given number of panels and actions per panel."""
+    rng = random.Random(seed)
+    return {
+        "name": f"Bench {seed}",
+        "panels": [
+            {
+                "width": grid,
+                "height": grid,
+                "actions": [
+                    {"key": rng.choice(KEYS), "x": rng.randrange(grid), "y": rng.randrange(grid), "w": 1, "h": 1}
+                    for _ in range(actions)
+                ],
+                "screen_x": 0.0, "screen_y": 0.0, "screen_width": 800.0, "screen_height": 800.0,
+            }
+            for _ in range(panels)
+        ],
+    }
+
+
+def writeLibrary(presetDir, count, panels, actions):
+    """Write count preset files to presetDir and return their paths in filename order."""
+    os.makedirs(presetDir, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(presetDir, f"preset{i:05d}.json")
+        with open(path, 'w') as f:
+            json.dump(makePreset(panels, actions, seed=i), f, indent=4)
+        paths.append(path)
+    return paths
+
+
+def writeResources(resourceDir, count, panels, actions):
+    """Lay out a resources/ folder (presets + config) that Model(resourceDir) can open."""
+    paths = writeLibrary(os.path.join(resourceDir, "presets"), count, panels, actions)
+    with open(os.path.join(resourceDir, "config.json"), 'w') as f:
+        json.dump({"opacity": 0.75}, f, indent=4)
+    return paths
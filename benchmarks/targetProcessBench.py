@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Cached target PID vs asking for the frontmost application on every event.
+
+Replays key events interleaved with app switches, launches and quits from a
+core.targetProcess.FakeNotificationSource whose queries spin for --ipc-cost
+to stand in for the NSWorkspace round trip. Compares the old path (query
+the frontmost app before each event) with TargetResolver, counting queries
+and checking that every event goes to the right PID, both for the frontmost
+app and for a preset pinned to the game with target_app.
+
+    python benchmarks/targetProcessBench.py [--events 100000] [--switch-every 500] [--ipc-cost 0.00005]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.targetProcess import FakeNotificationSource, TargetResolver
+
+GAME = 100
+OTHERS = (200, 300)
+
+
+class SlowSource(FakeNotificationSource):
+    def __init__(self, cost):
+        super().__init__()
+        self.cost = cost
+
+    def _ipc(self):
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+
+    def frontmost(self):
+        self._ipc()
+        return super().frontmost()
+
+    def running(self):
+        self._ipc()
+        return super().running()
+
+
+def script(source, events, switchEvery):
+    """Yields before each event; switches apps (and restarts the game) as it goes."""
+    game = GAME
+    source.launch(game, "com.example.game", "Game")
+    for pid in OTHERS:
+        source.launch(pid, f"com.example.app{pid}", f"App {pid}")
+    source.activate(game)
+    for i in range(events):
+        if i and i % switchEvery == 0:
+            switch = i // switchEvery
+            if switch % 7 == 0:
+                # The game quits and comes back with a new PID
+                source.terminate(game)
+                game = GAME + switch
+                source.launch(game, "com.example.game", "Game")
+            source.activate(((game,) + OTHERS)[switch % 3])
+        yield
+
+
+def gamePid(source):
+    for pid, names in source.apps.items():
+        if "game" in names:
+            return pid
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--switch-every", type=int, default=500)
+    parser.add_argument("--ipc-cost", type=float, default=0.00005, help="seconds per simulated workspace query")
+    args = parser.parse_args()
+
+    source = SlowSource(args.ipc_cost)
+    wrong = 0
+    start = time.perf_counter()
+    for _ in script(source, args.events, args.switch_every):
+        front = source.frontmost()
+        pid = front[0] if front is not None else None
+        wrong += pid != source.front
+    elapsed = time.perf_counter() - start
+    print(f"query per event: {elapsed / args.events * 1e6:7.2f} µs/event, {source.queries:7d} queries, {wrong} misrouted")
+
+    for target in (None, "Game"):
+        source = SlowSource(args.ipc_cost)
+        resolver = TargetResolver(source)
+        wrong = 0
+        start = time.perf_counter()
+        for _ in script(source, args.events, args.switch_every):
+            expected = (gamePid(source) if target else None) or source.front
+            wrong += resolver.pid(target) != expected
+        elapsed = time.perf_counter() - start
+        label = f"resolver ({'pinned to ' + target if target else 'frontmost'})"
+        print(f"{label + ':':<27}{elapsed / args.events * 1e6:7.2f} µs/event, {source.queries:7d} queries, {wrong} misrouted")
+
+
+if __name__ == "__main__":
+    main()
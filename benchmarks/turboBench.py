@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Turbo keys on one TurboRepeater vs a repeating timer thread per held key.
+
+Holds --keys turbo keys at --rate taps per second for --seconds, first
+through core.turbo.TurboRepeater and a HeldKeys table (one DwellScheduler
+thread, one timer, a global cap of --cap taps per second) and then the way
+a naive implementation would: a thread per key sleeping out each down and
+up. Both post to a RecordingInputSink. Reports threads used, taps per
+second overall, the worst one-second window against the cap (plus the
+bucket's burst), and how close a lone key's rate and duty come to what was
+asked. Runs headless.
+
+    python benchmarks/turboBench.py [--keys 24] [--rate 15] [--seconds 3] [--cap 60]
+"""
+import os
+import sys
+import time
+import bisect
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.dwellScheduler import DwellScheduler
+from core.heldKeys import HeldKeys
+from core.inputSequence import KEY_DOWN, keyDown, keyUp
+from core.inputSink import RecordingInputSink
+from core.turbo import TurboRepeater, TurboSpec, TAP_BURST
+
+
+def viaRepeater(keys, spec, seconds, cap):
+    sink = RecordingInputSink()
+    scheduler = DwellScheduler()
+    scheduler.start()
+    repeater = TurboRepeater(HeldKeys(sink.post), scheduler, maxTapRate=cap)
+    before = threading.active_count()
+    handles = [repeater.start(keycode, 0, spec) for keycode in range(keys)]
+    threads = threading.active_count() - before + 1  # + the scheduler's own thread
+    time.sleep(seconds)
+    for handle in handles:
+        repeater.stop(handle)
+    scheduler.stop()
+    return sink.posted, threads
+
+
+def viaThreads(keys, spec, seconds):
+    sink = RecordingInputSink()
+    lock = threading.Lock()
+    stopped = threading.Event()
+    period = 1.0 / spec.rate
+
+    def repeat(keycode):
+        while not stopped.is_set():
+            with lock:
+                sink.post(keyDown(keycode))
+            time.sleep(period * spec.duty)
+            with lock:
+                sink.post(keyUp(keycode))
+            time.sleep(period * (1 - spec.duty))
+
+    threads = [threading.Thread(target=repeat, args=(keycode,), daemon=True) for keycode in range(keys)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stopped.set()
+    for thread in threads:
+        thread.join()
+    return sink.posted, len(threads)
+
+
+def worstWindow(downs):
+    """Most downs in any one-second window."""
+    worst = 0
+    for i, t in enumerate(downs):
+        worst = max(worst, bisect.bisect_right(downs, t + 1.0) - i)
+    return worst
+
+
+def summary(label, posted, threads, seconds, cap):
+    downs = [p.time for p in posted if p.step.kind == KEY_DOWN]
+    capped = f"{cap:g}+{TAP_BURST}" if cap else "none"
+    print(f"{label:<20} {threads:>7} {len(downs) / seconds:9.1f} {worstWindow(downs):10d} {capped:>6}")
+
+
+def accuracy(label, posted, spec):
+    """Mean rate and duty of a single key's taps."""
+    downs = [p.time for p in posted if p.step.kind == KEY_DOWN]
+    ups = [p.time for p in posted if p.step.kind != KEY_DOWN]
+    periods = [b - a for a, b in zip(downs, downs[1:])]
+    held = [up - down for down, up in zip(downs, ups)]
+    rate = 1.0 / (sum(periods) / len(periods))
+    duty = (sum(held) / len(held)) * rate
+    print(f"{label:<20} rate {rate:6.2f}/s (asked {spec.rate:g})   duty {duty:5.3f} (asked {spec.duty:g})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=24)
+    parser.add_argument("--rate", type=float, default=15.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--cap", type=float, default=60.0, help="repeater's taps per second across all keys")
+    args = parser.parse_args()
+    spec = TurboSpec(args.rate, 0.5)
+
+    print(f"{args.keys} keys at {args.rate:g}/s ({args.keys * args.rate:g} taps/s asked)")
+    print(f"{'':<20} {'threads':>7} {'taps/s':>9} {'worst 1 s':>10} {'cap':>6}")
+    summary("repeater", *viaRepeater(args.keys, spec, args.seconds, args.cap), args.seconds, args.cap)
+    summary("thread per key", *viaThreads(args.keys, spec, args.seconds), args.seconds, None)
+
+    print("one key:")
+    accuracy("repeater", viaRepeater(1, spec, args.seconds, args.cap)[0], spec)
+    accuracy("thread per key", viaThreads(1, spec, args.seconds)[0], spec)
+
+
+if __name__ == "__main__":
+    main()
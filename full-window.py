@@ -15,11 +15,15 @@ from Foundation import NSTimer
 from AppKit import NSEvent, NSKeyDown, NSWorkspace
 import math
 from Quartz import CGEventCreateKeyboardEvent, CGEventPost, kCGHIDEventTap, CGEventSetFlags, CGEventPostToPid
-from Quartz import kCGEventFlagMaskCommand, kCGEventFlagMaskControl, kCGEventFlagMaskShift, kCGEventFlagMaskAlternate
 import json
 import os
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from core.keymap import KEYCODES, NO_KEYCODE, keycodeFor, chordFor
+from core.targetProcess import sharedTargetResolver
+from core.inputSequence import sharedInputExecutor, keyTap
+
 class JoystickView(NSView):
     """Custom view that acts as a hover joystick"""
     def initWithFrame_(self, frame):
@@ -305,19 +309,8 @@ class HotkeyWindow:
     
     def get_keycode(self, key_name):
         """Get macOS keycode for a key name"""
-        keycode_map = {
-            "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
-            "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
-            "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
-            "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
-            "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
-            "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
-            "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
-            "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
-            "return": 0x24, "delete": 0x33,
-            "up": 0x7E, "down": 0x7D, "left": 0x7B, "right": 0x7C
-        }
-        return keycode_map.get(key_name.lower(), 0x31)  # Default to space
+        keycode = keycodeFor(key_name)
+        return keycode if keycode != NO_KEYCODE else KEYCODES["space"]  # Default to space
     
     def create_buttons(self):
         """Create buttons for each hotkey that resize with window"""
@@ -435,84 +428,33 @@ class HotkeyWindow:
     
     def send_keys(self, keys):
         """Send keyboard events using Quartz"""
-        # Key code mapping
-        keycode_map = {
-            "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
-            "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
-            "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
-            "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
-            "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
-            "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
-            "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
-            "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
-            "return": 0x24, "delete": 0x33,
-        }
+        # ["ctrl", "shift", "f5"] -> interned chord (keycode + modifier flags), parsed once per combination
+        chord = chordFor("+".join(keys))
         
-        # Determine modifiers
-        flags = 0
-        regular_key = None
-        
-        for key in keys:
-            key_lower = key.lower()
-            if key_lower in ["command", "cmd"]:
-                flags |= kCGEventFlagMaskCommand
-            elif key_lower in ["control", "ctrl"]:
-                flags |= kCGEventFlagMaskControl
-            elif key_lower in ["shift"]:
-                flags |= kCGEventFlagMaskShift
-            elif key_lower in ["option", "alt"]:
-                flags |= kCGEventFlagMaskAlternate
-            else:
-                regular_key = key_lower
-        
-        # Get keycode
-        if regular_key and regular_key in keycode_map:
-            keycode = keycode_map[regular_key]
-            
+        if chord.keycode != NO_KEYCODE:
             # Create and post key down event
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            if flags:
-                CGEventSetFlags(event, flags)
+            event = CGEventCreateKeyboardEvent(None, chord.keycode, True)
+            if chord.flags:
+                CGEventSetFlags(event, chord.flags)
             CGEventPost(kCGHIDEventTap, event)
             
             # Create and post key up event
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
+            event = CGEventCreateKeyboardEvent(None, chord.keycode, False)
             CGEventPost(kCGHIDEventTap, event)
     
     def send_arrow_key(self, keycode):
         """Send arrow key press (used by joystick) - DEPRECATED, use press/release instead"""
         # Try to get the frontmost app to send keys directly to it
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
+        pid = sharedTargetResolver().pid()
         
-        if active_app:
-            pid = active_app.processIdentifier()
-            
-            # Send key down
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            CGEventPostToPid(pid, event)
-            
-            # Small delay
-            time.sleep(0.001)
-            
-            # Send key up
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPostToPid(pid, event)
-        else:
-            # Fallback to system-wide posting
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            CGEventPost(kCGHIDEventTap, event)
-            
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPost(kCGHIDEventTap, event)
+        # Down, 1 ms, up, posted from the executor's thread instead of sleeping here
+        sharedInputExecutor().run(keyTap(keycode, pid=pid))
     
     def press_key(self, keycode):
         """Press and hold a key"""
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
+        pid = sharedTargetResolver().pid()
         
-        if active_app:
-            pid = active_app.processIdentifier()
+        if pid is not None:
             event = CGEventCreateKeyboardEvent(None, keycode, True)
             CGEventPostToPid(pid, event)
         else:
@@ -521,11 +463,9 @@ class HotkeyWindow:
     
     def release_key(self, keycode):
         """Release a held key"""
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
+        pid = sharedTargetResolver().pid()
         
-        if active_app:
-            pid = active_app.processIdentifier()
+        if pid is not None:
             event = CGEventCreateKeyboardEvent(None, keycode, False)
             CGEventPostToPid(pid, event)
         else:
@@ -7,19 +7,26 @@ from Cocoa import (
     NSMakeRect, NSBackingStoreBuffered, NSTitledWindowMask, NSClosableWindowMask,
     NSMiniaturizableWindowMask, NSFloatingWindowLevel, NSApplicationActivationPolicyAccessory,
     NSNonactivatingPanelMask, NSView, NSMakeSize, NSNotificationCenter, NSColor, NSBezierPath,
-    NSTrackingArea, NSTrackingMouseEnteredAndExited,NSWindowMiniaturizeButton, NSWindowZoomButton,NSWindowStyleMaskBorderless,NSTrackingMouseMoved, NSTrackingActiveAlways,
-    NSTimer
+    NSTrackingArea, NSTrackingMouseEnteredAndExited,NSWindowMiniaturizeButton, NSWindowZoomButton,NSWindowStyleMaskBorderless,NSTrackingMouseMoved, NSTrackingActiveAlways
 )
-from Foundation import NSTimer
 
 from AppKit import NSEvent, NSKeyDown, NSWorkspace
 import math
-from Quartz import CGEventCreateKeyboardEvent, CGEventPost, kCGHIDEventTap, CGEventSetFlags, CGEventPostToPid
-from Quartz import kCGEventFlagMaskCommand, kCGEventFlagMaskControl, kCGEventFlagMaskShift, kCGEventFlagMaskAlternate
 import json
 import os
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from core.cursorBuffer import sharedCursorBuffer
+from core.cursorSampler import sharedCursorSampler
+from core.keymap import KEYCODES, NO_KEYCODE, keycodeFor, chordFor
+from core.targetProcess import sharedTargetResolver
+from core.inputSequence import sharedInputExecutor, keyTap, keyDown, keyUp
+from core.outputPipeline import sharedOutputPipeline, stopSharedOutputPipeline
+from core.heldKeys import sharedHeldKeys, releaseAllHeldKeys
+
+JOYSTICK_RATE = 20.0  # Hz, while the cursor is over the joystick
+
 class JoystickView(NSView):
     """Custom view that acts as a hover joystick"""
     def initWithFrame_(self, frame):
@@ -29,9 +36,7 @@ class JoystickView(NSView):
         
         self.controller = None
         self.current_direction = None
-        self.held_keys = set()  # Track multiple held keys for diagonal movement
         self.mouse_inside = False
-        self.last_mouse_location = None
         
         # Default joystick key mappings (can be configured)
         # self.key_mappings = {
@@ -48,14 +53,8 @@ class JoystickView(NSView):
             "right": 0x02    # D
         }
         
-        # Start a timer to check mouse position
-        self.timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            0.05,  # Check every 50ms
-            self,
-            "timerFired:",
-            None,
-            True
-        )
+        # Re-check the position only while the cursor is over the joystick
+        self.sampling = sharedCursorSampler().subscribe(self.cursorSampled, JOYSTICK_RATE)
         
         return self
     
@@ -127,47 +126,50 @@ class JoystickView(NSView):
     
     def mouseMoved_(self, event):
         """Handle mouse movement over joystick"""
-        location = self.convertPoint_fromView_(event.locationInWindow(), None)
-        self.last_mouse_location = location
+        # Screen coordinates, into the history the sampler also feeds
+        location = NSEvent.mouseLocation()
+        sharedCursorBuffer().append(time.monotonic(), location.x, location.y)
     
     def mouseEntered_(self, event):
         """Handle mouse entering joystick area"""
         self.mouse_inside = True
+        self.sampling.setPending(True)
     
     def mouseExited_(self, event):
         """Handle mouse leaving joystick area"""
         self.mouse_inside = False
-        self.last_mouse_location = None
+        self.sampling.setPending(False)
         
         # Release all held keys
-        for keycode in list(self.held_keys):
-            self.controller.release_key(keycode)
-        self.held_keys.clear()
+        sharedHeldKeys().setHeld(self, ())
         
         self.current_direction = None
         self.setNeedsDisplay_(True)
     
-    def timerFired_(self, timer):
-        """Timer callback to continuously check mouse position"""
-        if not self.mouse_inside or not self.last_mouse_location or not self.controller:
+    @objc.python_method
+    def cursorSampled(self, t, x, y):
+        """Sampler callback to continuously check mouse position"""
+        sample = sharedCursorBuffer().latest()
+        if not self.mouse_inside or sample is None or not self.controller or self.window() is None:
             return
         
-        location = self.last_mouse_location
+        # Steer from the newest sample (a mouse event or the sampler), in view space
+        _, x, y = sample
+        location = self.convertPoint_fromView_(self.window().convertPointFromScreen_((x, y)), None)
+        x, y = location.x, location.y
         bounds = self.bounds()
         center_x = bounds.size.width / 2
         center_y = bounds.size.height / 2
         
-        dx = location.x - center_x
-        dy = location.y - center_y
+        dx = x - center_x
+        dy = y - center_y
         
         # Calculate distance
         distance = math.sqrt(dx * dx + dy * dy)
         
         if distance < 20:  # Dead zone in center
             # Release all keys if we're in dead zone
-            for keycode in list(self.held_keys):
-                self.controller.release_key(keycode)
-            self.held_keys.clear()
+            sharedHeldKeys().setHeld(self, ())
             self.current_direction = None
             self.setNeedsDisplay_(True)
             return
@@ -187,20 +189,8 @@ class JoystickView(NSView):
         elif dx < -10:  # Left threshold
             keys_to_press.add(self.key_mappings["left"])
         
-        # Release keys that are no longer needed
-        keys_to_release = self.held_keys - keys_to_press
-        for keycode in keys_to_release:
-            self.controller.release_key(keycode)
-        
-        # Press new keys
-        keys_to_add = keys_to_press - self.held_keys
-        for keycode in keys_to_add:
-            self.controller.press_key(keycode)
-        
-        # Update held keys
-        if self.held_keys != keys_to_press:
-            self.held_keys = keys_to_press
-            
+        # The held-key table releases keys no longer needed and presses new ones (two for diagonals)
+        if sharedHeldKeys().setHeld(self, keys_to_press, pid=self.controller.frontmost_pid()):
             # Update direction string for display
             directions = []
             if self.key_mappings["up"] in keys_to_press:
@@ -308,19 +298,8 @@ class HotkeyWindow:
     
     def get_keycode(self, key_name):
         """Get macOS keycode for a key name"""
-        keycode_map = {
-            "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
-            "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
-            "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
-            "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
-            "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
-            "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
-            "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
-            "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
-            "return": 0x24, "delete": 0x33,
-            "up": 0x7E, "down": 0x7D, "left": 0x7B, "right": 0x7C
-        }
-        return keycode_map.get(key_name.lower(), 0x31)  # Default to space
+        keycode = keycodeFor(key_name)
+        return keycode if keycode != NO_KEYCODE else KEYCODES["space"]  # Default to space
     
     def create_buttons(self):
         """Create buttons for each hotkey that resize with window"""
@@ -365,6 +344,9 @@ class HotkeyWindow:
     
     def windowShouldClose_(self, sender):
         """Handle window close button - quit the app"""
+        # Nothing may stay down in the game: queue the ups, let the pipeline post them
+        releaseAllHeldKeys()
+        stopSharedOutputPipeline()
         NSApp.terminate_(None)
         return True
     
@@ -378,102 +360,31 @@ class HotkeyWindow:
     
     def send_keys(self, keys):
         """Send keyboard events using Quartz"""
-        # Key code mapping
-        keycode_map = {
-            "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
-            "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
-            "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
-            "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
-            "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
-            "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
-            "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
-            "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
-            "return": 0x24, "delete": 0x33,
-        }
+        # ["ctrl", "shift", "f5"] -> interned chord (keycode + modifier flags), parsed once per combination
+        chord = chordFor("+".join(keys))
         
-        # Determine modifiers
-        flags = 0
-        regular_key = None
-        
-        for key in keys:
-            key_lower = key.lower()
-            if key_lower in ["command", "cmd"]:
-                flags |= kCGEventFlagMaskCommand
-            elif key_lower in ["control", "ctrl"]:
-                flags |= kCGEventFlagMaskControl
-            elif key_lower in ["shift"]:
-                flags |= kCGEventFlagMaskShift
-            elif key_lower in ["option", "alt"]:
-                flags |= kCGEventFlagMaskAlternate
-            else:
-                regular_key = key_lower
-        
-        # Get keycode
-        if regular_key and regular_key in keycode_map:
-            keycode = keycode_map[regular_key]
-            
-            # Create and post key down event
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            if flags:
-                CGEventSetFlags(event, flags)
-            CGEventPost(kCGHIDEventTap, event)
-            
-            # Create and post key up event
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPost(kCGHIDEventTap, event)
+        if chord.keycode != NO_KEYCODE:
+            sharedOutputPipeline().submitAll([keyDown(chord.keycode, chord.flags), keyUp(chord.keycode)])
     
     def send_arrow_key(self, keycode):
         """Send arrow key press (used by joystick) - DEPRECATED, use press/release instead"""
         # Try to get the frontmost app to send keys directly to it
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
+        pid = sharedTargetResolver().pid()
         
-        if active_app:
-            pid = active_app.processIdentifier()
-            
-            # Send key down
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            CGEventPostToPid(pid, event)
-            
-            # Small delay
-            time.sleep(0.001)
-            
-            # Send key up
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPostToPid(pid, event)
-        else:
-            # Fallback to system-wide posting
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            CGEventPost(kCGHIDEventTap, event)
-            
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPost(kCGHIDEventTap, event)
+        # Down, 1 ms, up, posted from the executor's thread instead of sleeping here
+        sharedInputExecutor().run(keyTap(keycode, pid=pid))
     
     def press_key(self, keycode):
         """Press and hold a key"""
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
-        
-        if active_app:
-            pid = active_app.processIdentifier()
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            CGEventPostToPid(pid, event)
-        else:
-            event = CGEventCreateKeyboardEvent(None, keycode, True)
-            CGEventPost(kCGHIDEventTap, event)
+        sharedHeldKeys().press(self, keycode, pid=self.frontmost_pid())
     
     def release_key(self, keycode):
         """Release a held key"""
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
-        
-        if active_app:
-            pid = active_app.processIdentifier()
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPostToPid(pid, event)
-        else:
-            event = CGEventCreateKeyboardEvent(None, keycode, False)
-            CGEventPost(kCGHIDEventTap, event)
+        sharedHeldKeys().release(self, keycode)
+    
+    def frontmost_pid(self):
+        """PID to post key events to, or None for the system-wide tap"""
+        return sharedTargetResolver().pid()
     
     def run(self):
         """Start the application"""
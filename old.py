@@ -18,6 +18,10 @@ from Foundation import NSTimer
 from AppKit import NSEvent, NSKeyDown, NSWorkspace
 
 from threading import Timer
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from core.keymap import keycodeFor
 import objc
 
 class HotkeyWindow:
@@ -160,21 +164,9 @@ class ZPanel:
 
 class DwellBox(NSView):
     def initWithFrame_key_(self, frame, key):
-            keycode_map = {
-            "a": 0x00, "s": 0x01, "d": 0x02, "f": 0x03, "h": 0x04,
-            "g": 0x05, "z": 0x06, "x": 0x07, "c": 0x08, "v": 0x09,
-            "b": 0x0B, "q": 0x0C, "w": 0x0D, "e": 0x0E, "r": 0x0F,
-            "y": 0x10, "t": 0x11, "1": 0x12, "2": 0x13, "3": 0x14,
-            "4": 0x15, "5": 0x17, "6": 0x16, "7": 0x1A, "8": 0x1C,
-            "9": 0x19, "0": 0x1D, "o": 0x1F, "u": 0x20, "i": 0x22,
-            "p": 0x23, "l": 0x25, "j": 0x26, "k": 0x28, "n": 0x2D,
-            "m": 0x2E, "space": 0x31, "escape": 0x35, "tab": 0x30,
-            "return": 0x24, "delete": 0x33,
-            "up": 0x7E, "down": 0x7D, "left": 0x7B, "right": 0x7C
-        }
-            
+            # Shared table in app/core/keymap.py (F-keys, numpad, punctuation, chords)
             self.key = key
-            self.keycode = keycode_map[self.key]
+            self.keycode = keycodeFor(self.key)
             self.is_pressed = False
             print("init Dwell")
             self = objc.super(DwellBox, self).initWithFrame_(frame) # type:ignore
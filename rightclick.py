@@ -6,44 +6,53 @@ triggers a right-click at the cursor location after another dwell period.
 """
 
 from Cocoa import (
-    NSApplication, NSWindow, NSView, NSTextField, NSColor, NSBezierPath, NSTimer,
+    NSApplication, NSWindow, NSView, NSTextField, NSColor, NSBezierPath,
     NSMakeRect, NSBackingStoreBuffered,
     NSWindowStyleMaskTitled, NSWindowStyleMaskClosable,
     NSWindowStyleMaskMiniaturizable,
     NSApplicationActivationPolicyRegular, NSCenterTextAlignment,
     NSTrackingArea, NSTrackingMouseEnteredAndExited, 
     NSTrackingActiveAlways, NSTrackingInVisibleRect,
-    NSFont, NSFontWeightMedium
-)
-from Quartz import (
-    CGEventCreateMouseEvent, CGEventPost, CGEventCreate, CGEventGetLocation,
-    kCGEventRightMouseDown, kCGEventRightMouseUp, 
-    kCGMouseButtonRight, kCGHIDEventTap
+    NSFont, NSFontWeightMedium, NSEvent, NSScreen
 )
+from Quartz import CGEventCreate, CGEventGetLocation
 from PyObjCTools import AppHelper
 import objc
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+from core.dwellEngine import DwellEngine, CLICK_MODE, CLICK, IDLE, ARMED, AIMING
+from core.cursorBuffer import sharedCursorBuffer
+from core.cursorSampler import sharedCursorSampler
+from core.inputSequence import sharedInputExecutor, click, RIGHT_BUTTON
+
 # Configuration
 DWELL_TIME = 0.25  # seconds to hover before activation
-
+DWELL_THRESHOLD = 5  # pixels of allowed movement
+SAMPLE_RATE = 20.0  # Hz, cursor sampling while a dwell is in progress
 
 class DwellBox(NSView):
-    """Custom view that acts as a dwell-activated box."""
+    """Custom view that acts as a dwell-activated box.
+
+    The dwell logic lives in core.dwellEngine; this view feeds it global
+    cursor positions and draws its state.
+    """
     
     def init(self):
         self = objc.super(DwellBox, self).init()
         if self is None:
             return None
         
-        self.hover_active = False
-        self.is_dwelling = False  # True when mouse is still and timer is running
-        self.dwell_timer = None
-        self.right_click_pending = False
-        self.last_mouse_position = None
-        self.dwell_threshold = 5  # pixels of allowed movement
+        self.engine = DwellEngine(self.handleIntent, DWELL_TIME, DWELL_THRESHOLD, CLICK_MODE)
+        self.sampling = sharedCursorSampler().subscribe(self.cursorSampled, SAMPLE_RATE)
         
         return self
+
+    @objc.python_method
+    def isClickPending(self):
+        return self.engine.state in (ARMED, AIMING)
     
     def updateTrackingAreas(self):
         """Set up tracking area for hover detection."""
@@ -64,7 +73,7 @@ class DwellBox(NSView):
     def drawRect_(self, rect):
         """Draw the box with current state."""
         # Set background color based on state
-        if self.right_click_pending:
+        if self.isClickPending():
             NSColor.colorWithRed_green_blue_alpha_(0.2, 0.6, 1.0, 1.0).setFill()
         else:
             NSColor.colorWithRed_green_blue_alpha_(0.3, 0.3, 0.3, 1.0).setFill()
@@ -83,7 +92,7 @@ class DwellBox(NSView):
         path.stroke()
         
         # Draw text
-        if self.right_click_pending:
+        if self.isClickPending():
             text = "DWELL"
         else:
             text = "HOVER"
@@ -115,195 +124,72 @@ class DwellBox(NSView):
     
     def mouseEntered_(self, event):
         """Called when mouse enters the box area."""
-        if not self.right_click_pending:
-            self.hover_active = True
-            self.last_mouse_position = event.locationInWindow()
-            self.setNeedsDisplay_(True)
-            self.startDwellTimer()
+        self.engine.enter(*self.cursorSample())
+        self.stateChanged()
     
     def mouseExited_(self, event):
         """Called when mouse leaves the box area."""
-        if not self.right_click_pending:
-            self.hover_active = False
-            self.last_mouse_position = None
-            self.setNeedsDisplay_(True)
-            self.cancelDwellTimer()
+        self.engine.exit()
+        self.stateChanged()
     
     def mouseMoved_(self, event):
         """Called when mouse moves within the box area."""
-        if self.hover_active and not self.right_click_pending:
-            current_position = event.locationInWindow()
-            
-            if self.last_mouse_position is not None:
-                # Calculate distance moved
-                dx = current_position.x - self.last_mouse_position.x
-                dy = current_position.y - self.last_mouse_position.y
-                distance = (dx * dx + dy * dy) ** 0.5
-                
-                # If moved more than threshold, reset timer and visual state
-                if distance > self.dwell_threshold:
-                    self.is_dwelling = False
-                    self.setNeedsDisplay_(True)
-                    self.cancelDwellTimer()
-                    self.startDwellTimer()
-            
-            self.last_mouse_position = current_position
-    
-    def startDwellTimer(self):
-        """Start the dwell timer."""
-        self.cancelDwellTimer()
-        self.is_dwelling = True
-        self.setNeedsDisplay_(True)
-        self.dwell_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            DWELL_TIME,
-            self,
-            "dwellTimerFired:",
-            None,
-            False
-        )
-    
-    def cancelDwellTimer(self):
-        """Cancel the dwell timer."""
-        if self.dwell_timer is not None:
-            self.dwell_timer.invalidate()
-            self.dwell_timer = None
-    
-    def dwellTimerFired_(self, timer):
-        """Called when dwell timer completes."""
-        self.dwell_timer = None
-        self.activateBox()
-    
-    def activateBox(self):
-        """Activate the box and prepare for right-click."""
-        from Quartz import CGEventCreate, CGEventGetLocation
-        
-        self.hover_active = False
-        self.is_dwelling = False
-        self.right_click_pending = True
+        self.engine.move(*self.cursorSample())
+        self.stateChanged()
+
+    @objc.python_method
+    def cursorSample(self):
+        """Record the cursor in the shared history and return it as (x, y, t).
+
+        Screen coordinates throughout (the sampler's space), since aiming
+        happens outside the box.
+        """
+        t = time.monotonic()
+        location = NSEvent.mouseLocation()
+        sharedCursorBuffer().append(t, location.x, location.y)
+        return location.x, location.y, t
+
+    @objc.python_method
+    def stateChanged(self):
+        """Redraw, and ask for cursor samples only while a dwell is in progress."""
         self.setNeedsDisplay_(True)
-        
-        # Store the activation position - don't start monitoring until mouse moves away
-        current_event = CGEventCreate(None)
-        self.activation_pos = CGEventGetLocation(current_event)
-        self.has_moved_after_activation = False
-        
-        # Start checking if mouse has moved away
-        self.movement_check_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            0.1,
-            self,
-            "checkInitialMovement:",
-            None,
-            True
-        )
-    
-    def checkInitialMovement_(self, timer):
-        """Check if cursor has moved away from activation position."""
-        from Quartz import CGEventCreate, CGEventGetLocation
-        
-        current_event = CGEventCreate(None)
-        current_pos = CGEventGetLocation(current_event)
-        
-        # Calculate distance from activation position
-        dx = current_pos.x - self.activation_pos.x
-        dy = current_pos.y - self.activation_pos.y
-        distance = (dx * dx + dy * dy) ** 0.5
-        
-        # If moved more than threshold, start the dwell monitoring
-        if distance > self.dwell_threshold:
-            self.movement_check_timer.invalidate()
-            self.movement_check_timer = None
-            self.startCursorDwellTimer()
-    
-    def startCursorDwellTimer(self):
-        """Start monitoring cursor position for dwell to trigger right-click."""
-        from Quartz import CGEventCreate, CGEventGetLocation
-        
-        # Store initial cursor position
-        current_event = CGEventCreate(None)
-        self.cursor_start_pos = CGEventGetLocation(current_event)
-        self.cursor_dwell_started = time.time()
-        
-        # Use a repeating timer to check cursor position
-        self.cursor_check_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            0.1,  # Check every 100ms
-            self,
-            "checkCursorDwell:",
-            None,
-            True
-        )
-    
-    def checkCursorDwell_(self, timer):
-        """Check if cursor has stayed in roughly the same position."""
-        from Quartz import CGEventCreate, CGEventGetLocation
-        
-        # Get current cursor position
-        current_event = CGEventCreate(None)
-        current_pos = CGEventGetLocation(current_event)
-        
-        # Calculate distance moved from start position
-        dx = current_pos.x - self.cursor_start_pos.x
-        dy = current_pos.y - self.cursor_start_pos.y
-        distance = (dx * dx + dy * dy) ** 0.5
-        
-        # If cursor moved too much, reset the dwell timer
-        if distance > self.dwell_threshold:
-            self.cursor_start_pos = current_pos
-            self.cursor_dwell_started = time.time()
-        
-        # Check if enough time has passed
-        if time.time() - self.cursor_dwell_started >= DWELL_TIME:
-            self.cursor_check_timer.invalidate()
-            self.cursor_check_timer = None
+        self.sampling.setPending(self.engine.state != IDLE)
+
+    @objc.python_method
+    def cursorSampled(self, t, x, y):
+        """Feed the cursor to the engine while it is outside the box, and complete due dwells."""
+        if self.isClickPending():
+            self.engine.move(x, y, t)
+        self.engine.tick(t)
+        self.stateChanged()
+
+    @objc.python_method
+    def handleIntent(self, intent):
+        if intent.kind == CLICK:
             self.performRightClick()
     
     def performRightClick(self):
         """Simulate a right-click at the current cursor position."""
-        # Get current mouse location using CGEvent
-        current_event = CGEventCreate(None)
-        mouse_location = CGEventGetLocation(current_event)
-        
-        # Create right mouse down event
-        down_event = CGEventCreateMouseEvent(
-            None,
-            kCGEventRightMouseDown,
-            mouse_location,
-            kCGMouseButtonRight
-        )
-        
-        # Post mouse down
-        CGEventPost(kCGHIDEventTap, down_event)
-        
-        # Small delay between down and up
-        time.sleep(0.05)
-        
-        # Create right mouse up event
-        up_event = CGEventCreateMouseEvent(
-            None,
-            kCGEventRightMouseUp,
-            mouse_location,
-            kCGMouseButtonRight
-        )
+        # Newest sample in the shared history (what the dwell completed on),
+        # flipped to Quartz's top-left origin for the click
+        sample = sharedCursorBuffer().latest()
+        if sample is None:
+            mouse_location = CGEventGetLocation(CGEventCreate(None))
+            x, y = mouse_location.x, mouse_location.y
+        else:
+            _, x, y = sample
+            y = NSScreen.screens()[0].frame().size.height - y
         
-        # Post mouse up
-        CGEventPost(kCGHIDEventTap, up_event)
+        # Down, hold, up, posted from the executor's thread so the box keeps running
+        sharedInputExecutor().run(click(RIGHT_BUTTON, x, y))
         
         # Reset state
         self.resetBox()
     
     def resetBox(self):
         """Reset box to initial state."""
-        self.right_click_pending = False
-        self.hover_active = False
-        self.is_dwelling = False
-        self.setNeedsDisplay_(True)
-        
-        if hasattr(self, 'cursor_check_timer') and self.cursor_check_timer is not None:
-            self.cursor_check_timer.invalidate()
-            self.cursor_check_timer = None
-        
-        if hasattr(self, 'movement_check_timer') and self.movement_check_timer is not None:
-            self.movement_check_timer.invalidate()
-            self.movement_check_timer = None
+        self.engine.reset()
+        self.stateChanged()
 
 
 class AppDelegate(NSView):
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+
+import pytest
+
+# The app runs as `python app/app.py`, so its modules import from app/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+
+class FakeClock:
+    """A monotonic clock that only moves when a test sets now."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def panelJson(actions=(("a", 0, 0),), width=2, height=2, x=50):
+    return {
+        "width": width, "height": height,
+        "actions": [{"key": key, "x": ax, "y": ay, "w": 1, "h": 1} for key, ax, ay in actions],
+        "screen_x": x, "screen_y": 500, "screen_width": 500, "screen_height": 500,
+    }
+
+
+def writeJson(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+@pytest.fixture
+def resourceDir(tmp_path):
+    """A resources/ folder with two presets and a config, as Model(resourceDir) expects."""
+    presets = tmp_path / "presets"
+    presets.mkdir()
+    writeJson(presets / "alpha.json", {"name": "Alpha", "panels": [panelJson()]})
+    writeJson(presets / "beta.json", {"name": "Beta", "panels": [panelJson(), panelJson(x=600)]})
+    writeJson(tmp_path / "config.json", {"opacity": 0.75})
+    return str(tmp_path)
+
+
+@pytest.fixture
+def openModel(resourceDir):
+    """Model(resourceDir) factory; every model it made is closed after the test."""
+    from model import Model
+    models = []
+
+    def make():
+        model = Model(resourceDir)
+        models.append(model)
+        return model
+
+    yield make
+    for model in models:
+        model.close()
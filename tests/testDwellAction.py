@@ -0,0 +1,102 @@
+"""core.dwellAction: a dwell target pressing through HeldKeys, on a fake clock."""
+from core.dwellAction import DwellAction
+from core.dwellScheduler import DwellScheduler
+from core.heldKeys import HeldKeys
+from core.presetCompiler import compilePanel
+from core.presetData import PanelData
+from core.targetProcess import TargetResolver, FakeNotificationSource
+from core.inputSequence import KEY_DOWN, KEY_UP, keyDown
+from core.keymap import KEYCODES
+from conftest import panelJson
+
+
+class FakeRun:
+    def __init__(self, pid, sink):
+        self.pid = pid
+        self.sink = sink
+
+
+class FakeExecutor:
+    """Records the runs it is handed; tests post their steps into run.sink themselves."""
+    def __init__(self):
+        self.runs = []
+        self.cancelled = []
+
+    def runTimeline(self, timeline, done=None, pid=None, sink=None):
+        run = FakeRun(pid, sink)
+        self.runs.append(run)
+        return run
+
+    def cancel(self, run):
+        self.cancelled.append(run)
+
+
+def dwellActions(clock, panel):
+    posted = []
+    apps = FakeNotificationSource()
+    apps.launch(10, "Game")
+    apps.activate(10)
+    held = HeldKeys(posted.append)
+    executor = FakeExecutor()
+    scheduler = DwellScheduler(clock=clock)  # not started; tests call tick() themselves
+    compiled = compilePanel(PanelData.fromJson(panel))
+    actions = [DwellAction(action, scheduler, held, executor, None, TargetResolver(apps))
+               for action in compiled.actions]
+    for action in actions:
+        action.configure(0.1, 4.0, 8.0)  # no smoothing, so samples land as given
+    return actions, held, executor, posted
+
+
+def events(posted):
+    return [(step.kind, step.value, step.pid) for step in posted]
+
+
+def dwell(action, clock):
+    action.cursorEntered(10.0, 10.0)
+    clock.now += 0.1
+    action.tick()
+
+
+def testDwellPressesThenMoveReleases(clock):
+    (action,), held, _, posted = dwellActions(clock, panelJson(actions=(("w", 0, 0),)))
+    action.cursorEntered(10.0, 10.0)
+    assert action.armedDeadline == 0.1
+    clock.now = 0.1
+    action.tick()
+    assert events(posted) == [(KEY_DOWN, KEYCODES["w"], 10)]
+
+    clock.now = 0.2
+    action.cursorMoved(30.0, 10.0)
+    assert events(posted)[-1] == (KEY_UP, KEYCODES["w"], 10)
+    assert held.held() == set()
+
+
+def testTwoTargetsOnOneKeyShareTheDown(clock):
+    (a, b), held, _, posted = dwellActions(clock, panelJson(actions=(("w", 0, 0), ("w", 1, 0))))
+    dwell(a, clock)
+    dwell(b, clock)
+    a.close()
+    assert events(posted) == [(KEY_DOWN, KEYCODES["w"], 10)]
+    b.close()
+    assert [kind for kind, _, _ in events(posted)] == [KEY_DOWN, KEY_UP]
+
+
+def testCloseCancelsTheMacroAndReleasesItsKeys(clock):
+    panel = panelJson(actions=(("combo", 0, 0),))
+    panel["actions"][0]["macro"] = [{"press": "shift"}, "1"]
+    (action,), held, executor, posted = dwellActions(clock, panel)
+    dwell(action, clock)
+    (run,) = executor.runs
+    assert run.pid == 10
+    run.sink.post(keyDown(KEYCODES["shift"], pid=run.pid))  # the executor got one step out
+
+    action.close()
+    assert executor.cancelled == [run]
+    assert held.held() == set()
+    assert events(posted)[-1] == (KEY_UP, KEYCODES["shift"], 10)
+
+    # Nothing presses again after close, not even a fire already on its way
+    clock.now += 1.0
+    action.tick()
+    action.cursorMoved(10.0, 10.0)
+    assert held.held() == set()
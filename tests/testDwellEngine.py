@@ -0,0 +1,154 @@
+"""core.dwellEngine.DwellEngine, driven with explicit timestamps."""
+import pytest
+
+from core.dwellEngine import (DwellEngine, KEY_MODE, CLICK_MODE, PRESS, RELEASE, CLICK,
+                              IDLE, DWELLING, PRESSED, ARMED, AIMING, ANCHOR_SAMPLES)
+
+
+def keyEngine(radius=4.0, exitRadius=8.0, anchorSamples=ANCHOR_SAMPLES):
+    # Every call below passes t, so the engine's own clock is never read
+    intents = []
+    engine = DwellEngine(intents.append, 0.1, radius, KEY_MODE, exitRadius=exitRadius,
+                         anchorSamples=anchorSamples)
+    return engine, intents
+
+
+def kinds(intents):
+    return [intent.kind for intent in intents]
+
+
+def testEngineJitterInsideRadiusKeepsDwell():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    engine.move(3.0, 0.0, 0.05)
+    assert engine.state == DWELLING
+    assert engine.deadline == pytest.approx(0.1)
+
+    engine.tick(0.09)
+    assert intents == []
+    engine.tick(0.1)
+    assert kinds(intents) == [PRESS]
+    assert engine.state == PRESSED and engine.pressed
+    assert intents[0].time == 0.1
+
+
+def testEngineDriftPastRadiusRestartsDwell():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    engine.move(5.0, 0.0, 0.05)
+    assert engine.deadline == pytest.approx(0.15)
+    engine.tick(0.1)
+    assert intents == []
+    engine.tick(0.16)
+    assert kinds(intents) == [PRESS]
+
+
+def holdWithOutlierStart(engine):
+    """Dwell that starts on a 3 pt outlier, settles at the origin, then jitters 3.5 pt the other way."""
+    engine.enter(3.0, 0.0, 0.0)
+    for i in range(1, ANCHOR_SAMPLES):
+        engine.move(0.0, 0.0, i * 0.005)
+    engine.move(-3.5, 0.0, 0.05)
+
+
+def testEngineAnchorsOnMeanOfFirstSamples():
+    engine, intents = keyEngine()
+    holdWithOutlierStart(engine)
+    assert engine.anchorX == pytest.approx(3.0 / ANCHOR_SAMPLES)
+    assert engine.deadline == pytest.approx(0.1)
+    engine.tick(0.1)
+    assert kinds(intents) == [PRESS]
+
+
+def testEngineSingleSampleAnchorRestartsOnOutlier():
+    engine, intents = keyEngine(anchorSamples=1)
+    holdWithOutlierStart(engine)
+    assert engine.deadline == pytest.approx(0.15)
+
+
+def testEngineAnchorStopsFollowingSlowDrift():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    x = 0.0
+    restarted = False
+    # 0.5 pt per sample: the mean would trail a drift like this forever
+    for i in range(1, 30):
+        x += 0.5
+        engine.move(x, 0.0, i * 0.001)
+        if engine.deadline != pytest.approx(0.1):
+            restarted = True
+            break
+    assert restarted
+    assert x < 2 * 4.0
+
+
+def testEngineHysteresisHoldsUntilExitRadius():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    engine.tick(0.1)
+
+    # Past radius but inside exitRadius: the key stays down
+    engine.move(6.0, 0.0, 0.2)
+    assert engine.state == PRESSED
+    assert kinds(intents) == [PRESS]
+
+    engine.move(9.0, 0.0, 0.3)
+    assert kinds(intents) == [PRESS, RELEASE]
+    assert engine.state == DWELLING
+    assert engine.deadline == pytest.approx(0.4)
+
+
+def testEngineWithoutHysteresisReleasesAtRadius():
+    engine, intents = keyEngine(exitRadius=None)
+    engine.enter(0.0, 0.0, 0.0)
+    engine.tick(0.1)
+    engine.move(5.0, 0.0, 0.2)
+    assert kinds(intents) == [PRESS, RELEASE]
+
+
+def testEngineExitKeepsKeyAndReenterReleases():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    engine.tick(0.1)
+    engine.exit(0.2)
+    assert engine.state == PRESSED
+    engine.enter(0.0, 0.0, 0.3)
+    assert kinds(intents) == [PRESS, RELEASE]
+    assert engine.state == DWELLING
+
+
+def testEngineExitWhileDwellingGoesIdle():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    engine.exit(0.05)
+    assert engine.state == IDLE and engine.deadline is None
+    engine.tick(1.0)
+    assert intents == []
+
+
+def testEngineResetReleases():
+    engine, intents = keyEngine()
+    engine.enter(0.0, 0.0, 0.0)
+    engine.tick(0.1)
+    engine.reset(0.2)
+    assert kinds(intents) == [PRESS, RELEASE]
+    assert engine.state == IDLE and not engine.pressed
+
+
+def testEngineClickModeArmsAimsAndClicks():
+    intents = []
+    engine = DwellEngine(intents.append, 0.25, 4.0, CLICK_MODE, exitRadius=8.0)
+    engine.enter(10.0, 10.0, 0.0)
+    engine.tick(0.25)
+    assert engine.state == ARMED
+
+    engine.exit(0.3)
+    engine.move(16.0, 10.0, 0.4)  # inside exitRadius of the arming spot
+    assert engine.state == ARMED
+    engine.move(100.0, 50.0, 0.5)
+    assert engine.state == AIMING
+    engine.move(102.0, 50.0, 0.6)  # settles within radius
+    engine.tick(0.75)
+    assert kinds(intents) == [CLICK]
+    assert (intents[0].x, intents[0].y) == (102.0, 50.0)
+    assert engine.state == IDLE
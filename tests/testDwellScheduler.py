@@ -0,0 +1,90 @@
+"""core.dwellScheduler: one heap of dwell timers on a fake clock."""
+import threading
+
+from core.dwellScheduler import DwellScheduler
+
+
+def fireAll(scheduler, clock, count, at=100.0):
+    """Jump the clock past every deadline and run the first count fires, in expiry order."""
+    dispatched = []
+    done = threading.Event()
+
+    def dispatch(fn):
+        dispatched.append(fn)
+        fn()
+        if len(dispatched) >= count:
+            done.set()
+
+    scheduler.dispatch = dispatch
+    clock.now = at
+    scheduler.start()
+    assert done.wait(2.0), f"only {len(dispatched)} of {count} fired"
+    scheduler.stop()
+
+
+def namedTimer(scheduler, fired, name):
+    return scheduler.timer(lambda: fired.append(name))
+
+
+def testSchedulerFiresInDeadlineOrder(clock):
+    scheduler = DwellScheduler(clock=clock)
+    fired = []
+    for name, delay in (("c", 0.3), ("a", 0.1), ("b", 0.2)):
+        scheduler.arm(namedTimer(scheduler, fired, name), delay)
+    fireAll(scheduler, clock, 3)
+    assert fired == ["a", "b", "c"]
+
+
+def testSchedulerCancelAndRearmReorder(clock):
+    scheduler = DwellScheduler(clock=clock)
+    fired = []
+    a = namedTimer(scheduler, fired, "a")
+    b = namedTimer(scheduler, fired, "b")
+    c = namedTimer(scheduler, fired, "c")
+    scheduler.arm(a, 0.1)
+    scheduler.arm(b, 0.2)
+    scheduler.arm(c, 0.3)
+
+    scheduler.cancel(b)
+    assert not b.armed()
+    clock.now = 0.05
+    scheduler.arm(a, 0.5)   # moved later: now due at 0.55
+    scheduler.arm(c, 0.01)  # moved earlier: now due at 0.06
+    scheduler.arm(b, 0.2)   # back in: due at 0.25
+    assert scheduler.heap[0] is c
+
+    fireAll(scheduler, clock, 3)
+    assert fired == ["c", "b", "a"]
+    assert [t.pos for t in (a, b, c)] == [-1, -1, -1]
+
+
+def testSchedulerDropsFireRearmedBeforeDispatch(clock):
+    scheduler = DwellScheduler(clock=clock)
+    fired = []
+    a = namedTimer(scheduler, fired, "a")
+    b = namedTimer(scheduler, fired, "b")
+    scheduler.arm(a, 0.1)
+    scheduler.arm(b, 0.2)
+
+    # Hold the expiries the way AppHelper.callAfter would, until both are queued
+    queued = []
+    both = threading.Event()
+
+    def dispatch(fn):
+        queued.append(fn)
+        if len(queued) == 2:
+            both.set()
+
+    scheduler.dispatch = dispatch
+    clock.now = 1.0
+    scheduler.start()
+    assert both.wait(2.0)
+    scheduler.stop()
+
+    scheduler.arm(a, 1.0)  # a's dwell restarted before its stale fire ran
+    for fn in queued:
+        fn()
+    assert fired == ["b"]
+    assert a.armed()
+
+
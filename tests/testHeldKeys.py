@@ -0,0 +1,78 @@
+"""core.heldKeys: reference-counted key holds and guaranteed release."""
+from core.heldKeys import HeldKeys, HeldKeysSink
+from core.inputSequence import KEY_DOWN, KEY_UP, MOUSE_DOWN, keyDown, keyUp, mouseDown
+
+
+def table():
+    posted = []
+    return HeldKeys(posted.append), posted
+
+
+def events(posted):
+    return [(step.kind, step.value, step.pid) for step in posted]
+
+
+def testKeyGoesDownOnFirstPressAndUpOnLastRelease():
+    held, posted = table()
+    assert held.press("a", 13, pid=10)
+    assert held.press("b", 13, pid=20)
+    assert not held.press("a", 13)  # already held by a
+    assert held.holders(13) == 2
+
+    assert held.release("a", 13)
+    assert not held.release("a", 13)
+    assert events(posted) == [(KEY_DOWN, 13, 10)]
+
+    held.release("b", 13)
+    # The up goes where the down went, not to b's pid
+    assert events(posted) == [(KEY_DOWN, 13, 10), (KEY_UP, 13, 10)]
+    assert (held.downs, held.ups, held.merged) == (1, 1, 2)
+    assert held.held() == set()
+
+
+def testReleaseAllByGroupThenEverything():
+    held, posted = table()
+    left, right = object(), object()
+    held.press("box1", 1, group=left)
+    held.press("box2", 2, group=left)
+    held.press("box3", 2, group=right)
+    held.press("joystick", 3)
+
+    assert held.releaseAll(left) == 2
+    assert held.held() == {2, 3}
+    assert held.holders(2) == 1
+    assert held.releaseAll() == 2
+    assert held.held() == set()
+    assert [kind for kind, _, _ in events(posted)].count(KEY_UP) == 3
+
+
+def testReleaseOwnerAndSetHeld():
+    held, posted = table()
+    held.setHeld("joystick", {1, 2})
+    assert not held.setHeld("joystick", [2, 1])
+    held.setHeld("joystick", {2, 3})
+    assert held.held("joystick") == {2, 3}
+    assert events(posted)[2:] == [(KEY_UP, 1, None), (KEY_DOWN, 3, None)]
+
+    assert held.releaseOwner("joystick") == 2
+    assert held.releaseOwner("joystick") == 0
+    assert held.held() == set()
+
+
+def testSinkHoldsAsOneOwnerAndStopsPressingOnceClosed():
+    held, posted = table()
+    group = object()
+    sink = HeldKeysSink(held, group)
+    held.press("box", 5)
+    sink.post(keyDown(5, pid=7))
+    sink.post(keyDown(6, pid=7))
+    sink.post(mouseDown(0, 1, 2))
+    assert held.holders(5) == 2 and held.isHeld(sink, 6)
+
+    assert sink.close() == 2
+    sink.post(keyDown(8))  # already in flight when the run was cancelled
+    sink.post(keyUp(6))
+    sink.post(mouseDown(0, 1, 2))
+    assert held.held() == {5}
+    assert [kind for kind, _, _ in events(posted)] == [KEY_DOWN, KEY_DOWN, MOUSE_DOWN, KEY_UP]
+    assert held.releaseAll(group) == 0
@@ -0,0 +1,100 @@
+"""core.inputSequence: timelines and the executor's thread."""
+import threading
+
+import pytest
+
+from core.inputSequence import (SequenceExecutor, compileSequence, keyTap, keyDown, keyUp, click, wait,
+                                KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP, LEFT_BUTTON)
+
+
+class ListSink:
+    def __init__(self):
+        self.steps = []
+
+    def post(self, step):
+        self.steps.append(step)
+
+
+def testCompileTurnsWaitsIntoOffsets():
+    timeline = compileSequence(keyTap(1, hold=0.02) + [wait(0.1)] + click(LEFT_BUTTON, 5, 6, hold=0.05))
+    assert [step.kind for step in timeline.steps] == [KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP]
+    assert list(timeline.offsets) == pytest.approx([0.0, 0.02, 0.12, 0.17])
+    assert timeline.duration == pytest.approx(0.17)
+
+
+def testRunPostsEveryStepInOrderThenCallsDone():
+    sink = ListSink()
+    executor = SequenceExecutor(sink)
+    finished = threading.Event()
+    try:
+        run = executor.run([keyDown(1), wait(0.01), keyUp(1), wait(0.01), keyDown(2)],
+                           lambda run: finished.set())
+        assert finished.wait(2.0)
+    finally:
+        executor.stop()
+    assert [(step.kind, step.value) for step in sink.steps] == [(KEY_DOWN, 1), (KEY_UP, 1), (KEY_DOWN, 2)]
+    assert run.finished()
+    assert [t.planned for t in run.report()] == [0.0, 0.01, 0.02]
+
+
+def testPidRetargetsKeyStepsOnly():
+    sink = ListSink()
+    executor = SequenceExecutor(sink)
+    finished = threading.Event()
+    try:
+        executor.runTimeline(compileSequence(keyTap(1) + click(LEFT_BUTTON, 0, 0, hold=0.0)),
+                             lambda run: finished.set(), pid=42)
+        assert finished.wait(2.0)
+    finally:
+        executor.stop()
+    assert [step.pid for step in sink.steps] == [42, 42, None, None]
+
+
+class CancellingSink(ListSink):
+    """Cancels the run from inside its first post, as a close racing the executor thread would."""
+    def __init__(self):
+        super().__init__()
+        self.executor = None
+        self.run = None
+        self.started = threading.Event()  # self.run is set
+        self.cancelled = threading.Event()
+
+    def post(self, step):
+        super().post(step)
+        if len(self.steps) == 1:
+            self.started.wait(2.0)
+            self.executor.cancel(self.run)
+            self.cancelled.set()
+
+
+def testCancelStopsAnAdvanceAlreadyRunning():
+    sink = CancellingSink()
+    executor = SequenceExecutor(sink)
+    sink.executor = executor
+    done = []
+    try:
+        # Every step is due at once, so one _advance call would post them all
+        timeline = compileSequence([keyDown(1), keyDown(2)] + click(LEFT_BUTTON, 1, 1, hold=0.0))
+        sink.run = executor.runTimeline(timeline, done.append)
+        sink.started.set()
+        assert sink.cancelled.wait(2.0)
+        threading.Event().wait(0.05)  # time for a re-armed timer to fire, if there were one
+    finally:
+        executor.stop()
+    assert [step.kind for step in sink.steps] == [KEY_DOWN]
+    assert not sink.run.timer.armed()
+    assert done == []
+
+
+def testCancelBeforeDueDropsTheRest():
+    sink = ListSink()
+    executor = SequenceExecutor(sink)
+    try:
+        run = executor.run([keyDown(1), wait(0.2), keyUp(1)])
+        threading.Event().wait(0.05)
+        executor.cancel(run)
+        threading.Event().wait(0.25)
+    finally:
+        executor.stop()
+    assert [step.kind for step in sink.steps] == [KEY_DOWN]
+    assert not run.finished()
@@ -0,0 +1,113 @@
+"""core.journal: coalescing, time-driven fsync, failed writes, crash replay."""
+import time
+
+from core.journal import Journal
+
+
+def lines(journal):
+    return [(target, path, value) for target, path, value in journal.entries()]
+
+
+def waitFor(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def testQueuedEditsCoalesceByPath(tmp_path):
+    journal = Journal(str(tmp_path / "journal.log"))
+    journal.record("a.json", ("panels", 0, "screen_x"), 10)
+    journal.record("config", ("opacity",), 0.5)
+    journal.record("a.json", ("panels", 0, "screen_x"), 20)
+    journal.flush()
+    journal.close()
+
+    # One line per path, the re-queued one moved after the config edit
+    assert lines(journal) == [
+        ("config", ("opacity",), 0.5),
+        ("a.json", ("panels", 0, "screen_x"), 20),
+    ]
+    assert journal.records == 3
+
+
+def testWriterFsyncsOnceEditsStop(tmp_path):
+    journal = Journal(str(tmp_path / "journal.log"), batchSize=1000, syncInterval=0.05)
+    journal.start()
+    try:
+        journal.lastSync = time.monotonic()
+        journal.record("config", ("opacity",), 0.5)
+        assert waitFor(lambda: not journal.isEmpty())
+        # No further edits and no close: the writer's timeout does the fsync
+        assert waitFor(lambda: journal.pending == 0)
+    finally:
+        journal.close()
+
+
+class FailingFile:
+    """Stands in for the journal file; write() fails, after an edit lands meanwhile."""
+    def __init__(self, journal):
+        self.journal = journal
+
+    def write(self, text):
+        self.journal.record("config", ("opacity",), 0.9)
+        raise OSError("disk full")
+
+    def close(self):
+        pass
+
+
+def testFailedWriteIsRequeuedBehindNewerEdits(tmp_path):
+    journal = Journal(str(tmp_path / "journal.log"))
+    journal.record("config", ("opacity",), 0.5)
+    journal.record("config", ("main_window", "x"), 10)
+    journal.file = FailingFile(journal)
+    try:
+        journal.flush()
+    except OSError:
+        pass
+    else:
+        assert False, "flush should re-raise the write error"
+
+    # The newer opacity wins and stays last
+    assert list(journal.queued.items()) == [
+        (("config", ("main_window", "x")), 10),
+        (("config", ("opacity",)), 0.9),
+    ]
+    journal.file = None
+    journal.flush()
+    journal.close()
+    assert lines(journal) == [("config", ("main_window", "x"), 10), ("config", ("opacity",), 0.9)]
+
+
+def testTruncateDropsQueuedAndWritten(tmp_path):
+    journal = Journal(str(tmp_path / "journal.log"))
+    journal.record("config", ("opacity",), 0.5)
+    journal.flush()
+    journal.record("config", ("opacity",), 0.6)
+    journal.truncate()
+    journal.close()
+    assert journal.isEmpty()
+    assert lines(journal) == []
+
+
+def testReplayAfterCrashRestoresEditsThenTruncates(openModel):
+    model = openModel()
+    model.getPreset(1).panels[1].screen_x = 640
+    model.config.opacity = 0.25
+    # Quit without saving: the edits are only in the journal
+    model.close()
+    assert not model.journal.isEmpty()
+
+    model = openModel()
+    assert model.getPreset(1).panels[1].screen_x == 640
+    assert model.config.opacity == 0.25
+    assert model.journal.isEmpty()
+
+    # The replayed edits were saved to the files, not just re-applied
+    model.close()
+    model = openModel()
+    assert model.getPreset(1).panels[1].screen_x == 640
+    assert model.journal.isEmpty()
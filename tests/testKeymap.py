@@ -0,0 +1,37 @@
+"""core.keymap: key names, chords and their interning."""
+import pytest
+
+from core.keymap import (parseChord, chordFor, keycodeFor, KEYCODES, MODIFIER_FLAGS,
+                         NO_KEYCODE, NO_CHORD)
+
+
+def testAliasesAndCaseResolveToTheSameKey():
+    assert keycodeFor("Esc") == keycodeFor("escape") == KEYCODES["escape"]
+    assert keycodeFor(" Keypad7 ") == KEYCODES["num7"]
+
+
+def testModifiersCombineIntoFlags():
+    chord = chordFor("cmd+shift+a")
+    assert chord.keycode == KEYCODES["a"]
+    assert chord.flags == MODIFIER_FLAGS["command"] | MODIFIER_FLAGS["shift"]
+    assert chord.name == "shift+command+a"
+
+
+def testEqualChordsAreOneObject():
+    a = chordFor("ctrl+alt+f5")
+    b = chordFor("Option+Control+F5")
+    c = parseChord("control + option + f5")
+    assert a is b is c
+    # Spellings are cached too
+    assert chordFor("ctrl+alt+f5") is a
+
+
+def testKeypadPlus():
+    assert chordFor("num+").keycode == KEYCODES["num+"]
+    assert chordFor("shift+keypad+").flags == MODIFIER_FLAGS["shift"]
+
+
+@pytest.mark.parametrize("text", ["nosuchkey", "hyper+a", "shift+", "", None, 5])
+def testUnknownIsNoChord(text):
+    assert chordFor(text) is NO_CHORD
+    assert keycodeFor(text) == NO_KEYCODE
@@ -0,0 +1,42 @@
+"""core.latency: log-linear histogram percentiles."""
+from core.latency import LatencyHistogram
+
+
+# LatencyHistogram
+
+def testHistogramExactBelowLinearRange():
+    histogram = LatencyHistogram()
+    for micros in range(1, 51):
+        histogram.record(micros / 1e6)
+    assert histogram.percentile(0.5) == 25
+    assert histogram.percentile(0.99) == 50
+    assert histogram.percentile(1.0) == 50
+    summary = histogram.summary()
+    assert summary["count"] == 50
+    assert summary["minUs"] == 1 and summary["maxUs"] == 50
+    assert summary["meanUs"] == 25.5
+
+
+def testHistogramPercentilesWithinBucketPrecision():
+    histogram = LatencyHistogram()
+    values = [micros for micros in range(100, 100100, 100)]  # 0.1 ms .. 100 ms
+    for micros in values:
+        histogram.record(micros / 1e6)
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values) + 0.999999) - 1]
+        got = histogram.percentile(q)
+        assert exact <= got <= exact * (1 + 1 / 32)
+
+
+def testHistogramClampsAndClears():
+    histogram = LatencyHistogram()
+    histogram.record(-0.001)    # cross-thread clocks can disagree by a tick
+    histogram.record(120.0)     # past HIGHEST_MICROS
+    assert histogram.min == 0
+    assert histogram.max == histogram.highest
+    assert histogram.percentile(1.0) == histogram.highest
+
+    histogram.clear()
+    assert histogram.count == 0
+    assert histogram.percentile(0.5) == 0
+    assert histogram.summary()["minUs"] == 0
@@ -0,0 +1,64 @@
+"""core.macro: macro lists compiled to timelines."""
+import pytest
+
+from core.macro import compileMacro, TAP_HOLD, TAP_GAP
+from core.keymap import KEYCODES, MODIFIER_FLAGS
+from core.inputSequence import KEY_DOWN, KEY_UP
+
+SHIFT = MODIFIER_FLAGS["shift"]
+
+
+def events(timeline):
+    return [(step.kind, step.value, step.flags) for step in timeline.steps]
+
+
+def testTapsAndDelays():
+    timeline = compileMacro(["a", {"delay": 0.5}, {"tap": "ctrl+b", "hold": 0.1}])
+    ctrl = MODIFIER_FLAGS["control"]
+    assert events(timeline) == [
+        (KEY_DOWN, KEYCODES["a"], 0), (KEY_UP, KEYCODES["a"], 0),
+        (KEY_DOWN, KEYCODES["b"], ctrl), (KEY_UP, KEYCODES["b"], ctrl),
+    ]
+    assert list(timeline.offsets) == pytest.approx([0.0, TAP_HOLD, TAP_HOLD + 0.5, TAP_HOLD + 0.6])
+
+
+def testHeldModifierIsOredIntoLaterKeys():
+    timeline = compileMacro([{"press": "shift"}, "1", {"release": "shift"}, "2"])
+    assert events(timeline) == [
+        (KEY_DOWN, KEYCODES["shift"], SHIFT),
+        (KEY_DOWN, KEYCODES["1"], SHIFT), (KEY_UP, KEYCODES["1"], SHIFT),
+        (KEY_UP, KEYCODES["shift"], 0),
+        (KEY_DOWN, KEYCODES["2"], 0), (KEY_UP, KEYCODES["2"], 0),
+    ]
+
+
+def testRepeatSpacesTapsByGap():
+    timeline = compileMacro([{"tap": "x", "repeat": 3}])
+    assert len(timeline.steps) == 6
+    assert timeline.duration == pytest.approx(3 * TAP_HOLD + 2 * TAP_GAP)
+
+
+def testKeysStillHeldAreReleasedAtTheEnd():
+    warnings = []
+    timeline = compileMacro([{"press": "shift"}, {"press": "w"}], warnings.append)
+    assert events(timeline)[-2:] == [(KEY_UP, KEYCODES["w"], SHIFT), (KEY_UP, KEYCODES["shift"], 0)]
+    assert warnings == ["shift, w still held at the end, released"]
+
+
+def testReleasingAKeyNotHeldWarns():
+    warnings = []
+    compileMacro([{"release": "a"}], warnings.append)
+    assert warnings == ["step 1 releases 'a', which isn't held"]
+
+
+@pytest.mark.parametrize("spec", [
+    "a",
+    [5],
+    [{"tap": "a", "delay": 1}],
+    [{"delay": 60}],
+    [{"tap": "a", "repeat": 0}],
+    [{"tap": "nosuchkey"}],
+])
+def testBadMacrosAreErrors(spec):
+    with pytest.raises(ValueError):
+        compileMacro(spec)
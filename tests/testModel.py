@@ -0,0 +1,41 @@
+"""Model persistence: dirty-only saves."""
+import os
+
+
+def mtimes(resourceDir):
+    presets = os.path.join(resourceDir, "presets")
+    return {name: os.stat(os.path.join(presets, name)).st_mtime_ns for name in os.listdir(presets)}
+
+
+def testSaveWritesOnlyDirtyPresets(openModel, resourceDir):
+    model = openModel()
+    alpha = model.getPreset(0)
+    model.getPreset(1)
+    before = mtimes(resourceDir)
+
+    alpha.panels[0].screen_x = 75
+    saved, skipped = model.save()
+    assert (saved, skipped) == (1, 1)  # alpha; config is clean too
+    after = mtimes(resourceDir)
+    assert after["alpha.json"] != before["alpha.json"]
+    assert after["beta.json"] == before["beta.json"]
+
+
+def testSaveWithNothingDirtyWritesNothing(openModel, resourceDir):
+    model = openModel()
+    model.getPreset(0)
+    before = mtimes(resourceDir)
+    assert model.save() == (0, 2)
+    assert mtimes(resourceDir) == before
+
+
+def testEditsSurviveReload(openModel):
+    model = openModel()
+    model.getPreset(1).panels[1].screen_x = 640
+    model.config.opacity = 0.5
+    model.save()
+    model.close()
+
+    model = openModel()
+    assert model.getPreset(1).panels[1].screen_x == 640
+    assert model.config.opacity == 0.5
@@ -0,0 +1,69 @@
+"""core.presetCache: validated, size-bounded pickle cache of parsed presets."""
+import os
+
+from core.presetCache import PresetCache
+from core.presetData import PresetData
+from conftest import writeJson, panelJson
+
+
+def source(tmp_path, name="p.json", panels=1):
+    path = str(tmp_path / name)
+    data = {"name": name, "panels": [panelJson() for _ in range(panels)]}
+    writeJson(path, data)
+    return path, PresetData.fromJson(data)
+
+
+def testHitReturnsTheCachedPreset(tmp_path):
+    cache = PresetCache(str(tmp_path / "cache"))
+    path, preset = source(tmp_path)
+    assert cache.get(path, os.stat(path)) is None
+    cache.put(path, os.stat(path), preset)
+
+    cached = cache.get(path, os.stat(path))
+    assert cached.toJson() == preset.toJson()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def testEditedSourceInvalidatesTheEntry(tmp_path):
+    cache = PresetCache(str(tmp_path / "cache"))
+    path, preset = source(tmp_path)
+    cache.put(path, os.stat(path), preset)
+
+    source(tmp_path, panels=3)  # same path, new size
+    assert cache.get(path, os.stat(path)) is None
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.get(path, os.stat(path)) is None
+
+
+def testUnreadableEntryIsDropped(tmp_path):
+    cache = PresetCache(str(tmp_path / "cache"))
+    path, preset = source(tmp_path)
+    cache.put(path, os.stat(path), preset)
+    entryPath = cache._entryPath(path)
+    with open(entryPath, 'wb') as f:
+        f.write(b"not a pickle")
+
+    assert cache.get(path, os.stat(path)) is None
+    assert not os.path.exists(entryPath)
+
+
+def testEvictionDropsLeastRecentlyUsed(tmp_path):
+    probe = PresetCache(str(tmp_path / "probe"))
+    path, preset = source(tmp_path, "a.json")
+    probe.put(path, os.stat(path), preset)
+    entrySize = os.path.getsize(probe._entryPath(path))
+
+    # Room for two entries
+    cache = PresetCache(str(tmp_path / "cache"), maxBytes=2 * entrySize + entrySize // 2)
+    paths = [source(tmp_path, name)[0] for name in ("a.json", "b.json", "c.json")]
+    for i, path in enumerate(paths[:2]):
+        cache.put(path, os.stat(path), PresetData.fromJson({"name": os.path.basename(path), "panels": [panelJson()]}))
+        os.utime(cache._entryPath(path), ns=(i * 10 ** 9, i * 10 ** 9))
+    cache.get(paths[0], os.stat(paths[0]))  # a is now the most recently used
+
+    cache.put(paths[2], os.stat(paths[2]), PresetData.fromJson({"name": "c.json", "panels": [panelJson()]}))
+    assert os.path.exists(cache._entryPath(paths[0]))
+    assert not os.path.exists(cache._entryPath(paths[1]))
+    assert os.path.exists(cache._entryPath(paths[2]))
+    assert cache.usedBytes <= cache.maxBytes
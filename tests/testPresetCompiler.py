@@ -0,0 +1,93 @@
+"""core.presetCompiler: issues, clamping, and recompiling after edits and hot reload."""
+import os
+
+from core.presetCompiler import compilePreset, compiledFor, formatIssue, MAX_GRID
+from core.presetData import PresetData
+from conftest import writeJson, panelJson
+
+
+def compile(panels, **extra):
+    return compilePreset(PresetData.fromJson(dict(name="P", panels=panels, **extra)))
+
+
+def messages(compiled):
+    return [formatIssue(issue) for issue in compiled.issues]
+
+
+def testCleanPresetHasNoIssues():
+    compiled = compile([panelJson(actions=(("a", 0, 0), ("cmd+c", 1, 1)))])
+    assert compiled.issues == ()
+    a, copy = compiled.panels[0].actions
+    assert (a.left, a.top, a.spanW, a.spanH) == (0.0, 0.0, 0.5, 0.5)
+    assert copy.chord.flags and copy.chord.keycode == copy.keycode
+
+
+def testGridAndGeometryAreClamped():
+    panel = panelJson(width=0, height=MAX_GRID + 1)
+    panel["screen_width"] = 10
+    compiled = compile([panel, dict(panelJson(), width=2.5)])
+    assert (compiled.panels[0].width, compiled.panels[0].height) == (1, MAX_GRID)
+    assert compiled.panels[0].frame[2] == 50.0
+    assert messages(compiled) == [
+        "panel 1: width 0 is below 1, clamped",
+        f"panel 1: height {MAX_GRID + 1} is above {MAX_GRID}, clamped",
+        "panel 1: window size 10.0x500.0 too small, clamped",
+        "panel 2: width 2.5 is not an integer, using 1",
+    ]
+
+
+def testActionIssues():
+    panel = panelJson(actions=(("nosuchkey", 0, 0), ("b", 5, 0), ("c", 1, 1)))
+    panel["actions"][2]["w"] = 3
+    compiled = compile([panel])
+    assert messages(compiled) == [
+        "panel 1, action 1: unknown key 'nosuchkey'",
+        "panel 1, action 2: action 'b' at (5, 0) is outside the 2x2 grid",
+        "panel 1, action 3: action 'c' size 3x1 clamped to the grid",
+    ]
+    # Off-grid actions are left out; the rest keep their ActionList index
+    assert [(a.index, a.w) for a in compiled.panels[0].actions] == [(0, 1), (2, 1)]
+
+
+def testMacroTurboAndTargetIssues():
+    panel = panelJson(actions=(("m", 0, 0), ("t", 1, 0)))
+    panel["actions"][0].update(macro=["a"], turbo=10)
+    panel["actions"][1]["turbo"] = "fast"
+    compiled = compile([panel], target_app="")
+    issues = messages(compiled)
+    assert issues[0] == "preset: target_app '' is not an application name, ignored"
+    assert issues[1] == "panel 1, action 1: turbo is ignored on a macro action"
+    assert issues[2].startswith("panel 1, action 2: ") and issues[2].endswith(", turbo off")
+    assert compiled.target is None
+    assert compiled.panels[0].actions[0].macro is not None
+
+
+def testEditsRecompile(openModel):
+    model = openModel()
+    preset = model.getPreset(0)
+    first = compiledFor(preset)
+    assert compiledFor(preset) is first
+
+    preset.panels[0].width = 4
+    assert compiledFor(preset).panels[0].width == 4
+
+
+def testHotReloadAddingAndRemovingPanelsRecompiles(openModel, resourceDir):
+    model = openModel()
+    preset = model.getPreset(0)
+    assert len(compiledFor(preset).panels) == 1
+    path = os.path.join(resourceDir, "presets", "alpha.json")
+
+    writeJson(path, {"name": "Alpha", "panels": [panelJson(), panelJson(x=600), panelJson(x=700)]})
+    reloaded, _ = model.pollPresetChanges()
+    assert [data for data, _ in reloaded] == [preset]
+    compiled = compiledFor(preset)
+    assert len(compiled.panels) == 3
+    # Every change the open windows will be handed has a compiled panel
+    for change in reloaded[0][1].panels:
+        assert compiled.panels[change.index].frame[0] == preset.panels[change.index].screen_x
+
+    writeJson(path, {"name": "Alpha", "panels": [panelJson(x=600)]})
+    reloaded, _ = model.pollPresetChanges()
+    assert len(compiledFor(preset).panels) == 1
+    assert compiledFor(preset).panels[0].frame[0] == 600.0
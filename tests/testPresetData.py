@@ -0,0 +1,59 @@
+"""core.presetData: packed action lists and typed preset trees."""
+import pytest
+
+from core.presetData import ActionList, PresetData, ACTION_STRIDE, KEYCODE
+from core.keymap import keycodeFor
+
+
+def action(key="a", x=0, y=0, w=1, h=1, **extra):
+    return dict(key=key, x=x, y=y, w=w, h=h, **extra)
+
+
+def testActionsArePackedWithTheirKeycode():
+    actions = ActionList.fromJson([action("a", 1, 2), action("space", 3, 4, 2, 1)])
+    assert len(actions) == 2
+    assert len(actions.cells) == 2 * ACTION_STRIDE
+    assert actions.cells[ACTION_STRIDE + KEYCODE] == keycodeFor("space")
+    second = actions[1]
+    assert (second.key, second.x, second.y, second.w, second.h) == ("space", 3, 4, 2, 1)
+
+
+def testWholeFloatCoordinatesAreAccepted():
+    actions = ActionList.fromJson([action(x=1.0, y=2.0, w=3.0)])
+    assert (actions[0].x, actions[0].y, actions[0].w) == (1, 2, 3)
+
+
+@pytest.mark.parametrize("value", [1.5, -0.25, "2", None, float("nan")])
+def testFractionalOrNonNumericCoordinatesAreErrors(value):
+    with pytest.raises(ValueError, match="not a whole number"):
+        ActionList.fromJson([action(x=value)])
+
+
+@pytest.mark.parametrize("value", [2 ** 31, float("inf")])
+def testOutOfRangeCoordinatesAreErrors(value):
+    with pytest.raises(ValueError, match="out of range"):
+        ActionList.fromJson([action(y=value)])
+
+
+def testUnknownFieldsRoundTrip():
+    data = {
+        "name": "P",
+        "panels": [{"width": 2, "height": 1, "actions": [action("a", macro="a b")],
+                    "screen_x": 1, "screen_y": 2, "screen_width": 3, "screen_height": 4,
+                    "label": "left"}],
+        "target_app": "Game",
+    }
+    assert PresetData.fromJson(data).toJson() == data
+
+
+def testDefaultsAreFilledIn():
+    preset = PresetData.fromJson({"panels": [{}]})
+    assert preset.name == "Preset"
+    panel = preset.panels[0]
+    assert (panel.width, panel.height, panel.screen_x, len(panel.actions)) == (1, 1, 50, 0)
+
+
+@pytest.mark.parametrize("data", [[], {"panels": {}}, {"panels": [[]]}, {"panels": [{"actions": [1]}]}])
+def testWrongShapesAreErrors(data):
+    with pytest.raises(ValueError):
+        PresetData.fromJson(data)
@@ -0,0 +1,55 @@
+"""core.presetDiff: patching a live preset from a re-read file."""
+from core.presetDiff import diffPresets, applyDiff, isEmpty, ADDED, REMOVED, CHANGED, PANEL_FIELDS
+from core.presetData import PresetData
+from core.tracking import bind, setListener
+from conftest import panelJson
+
+
+def preset(*panels, name="P"):
+    data = PresetData.fromJson({"name": name, "panels": list(panels)})
+    bind(data, data)
+    return data
+
+
+def testIdenticalPresetsHaveNoDiff():
+    assert isEmpty(diffPresets(preset(panelJson()), preset(panelJson())))
+
+
+def testChangedFieldsArePerPanel():
+    old = preset(panelJson(), panelJson(x=600))
+    new = preset(panelJson(), panelJson(x=700, actions=(("b", 1, 1),)), name="Q")
+    diff = diffPresets(old, new)
+    assert diff.fields == ("name",)
+    assert diff.panels == [(1, CHANGED, ("actions", "screen_x"))]
+
+
+def testAddedAndRemovedPanels():
+    one = preset(panelJson())
+    three = preset(panelJson(), panelJson(x=1), panelJson(x=2))
+    assert diffPresets(one, three).panels == [(1, ADDED, PANEL_FIELDS), (2, ADDED, PANEL_FIELDS)]
+    # Removals come highest index first
+    assert diffPresets(three, one).panels == [(2, REMOVED, PANEL_FIELDS), (1, REMOVED, PANEL_FIELDS)]
+
+
+def testApplyKeepsPanelObjectsAndRebindsPaths():
+    old = preset(panelJson(), panelJson(x=600), panelJson(x=700))
+    kept = old.panels[0]
+    new = preset(panelJson(width=3), panelJson(x=700))
+    applyDiff(old, new, diffPresets(old, new))
+
+    assert old.toJson() == new.toJson()
+    assert old.panels[0] is kept
+    changes = []
+    setListener(old, lambda root, path, value: changes.append(path))
+    old.panels[1].screen_y = 10
+    assert changes == [("panels", 1, "screen_y")]
+
+
+def testApplyAddedPanelIsTracked():
+    old = preset(panelJson())
+    new = preset(panelJson(), panelJson(x=600))
+    applyDiff(old, new, diffPresets(old, new))
+    changes = []
+    setListener(old, lambda root, path, value: changes.append(path))
+    old.panels[1].screen_x = 5
+    assert changes == [("panels", 1, "screen_x")]
@@ -0,0 +1,93 @@
+"""core.presetIndex: only new or changed preset files are parsed on startup."""
+import os
+import json
+
+from core.presetIndex import PresetIndex
+from core.presetData import PresetData
+from conftest import writeJson, panelJson
+
+
+class Parser:
+    """parseMany stand-in that remembers which files it was handed."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, paths):
+        self.calls.append([os.path.basename(p) for p in paths])
+        presets = []
+        for path in paths:
+            try:
+                with open(path) as f:
+                    presets.append(PresetData.fromJson(json.load(f)))
+            except ValueError:
+                presets.append(None)
+        return presets
+
+
+def openIndex(resourceDir):
+    index = PresetIndex(os.path.join(resourceDir, "presetIndex.json"),
+                        os.path.join(resourceDir, "presets"))
+    index.load()
+    return index
+
+
+def startup(resourceDir):
+    """Load, refresh and save the index the way Model.loadPresets does."""
+    parse = Parser()
+    index = openIndex(resourceDir)
+    entries = index.refresh(parse)
+    index.save()
+    return entries, parse.calls
+
+
+def testFirstRunParsesEverythingInFilenameOrder(resourceDir):
+    entries, calls = startup(resourceDir)
+    assert calls == [["alpha.json", "beta.json"]]
+    assert [(e.filename, e.name, e.panelCount) for e in entries] == [
+        ("alpha.json", "Alpha", 1), ("beta.json", "Beta", 2)]
+    assert all(e.data is not None for e in entries)
+
+
+def testUnchangedFilesAreNotParsed(resourceDir):
+    startup(resourceDir)
+    entries, calls = startup(resourceDir)
+    assert calls == []
+    assert [(e.name, e.panelCount, e.data) for e in entries] == [("Alpha", 1, None), ("Beta", 2, None)]
+
+
+def testChangedAddedAndRemovedFilesAreRevalidated(resourceDir):
+    startup(resourceDir)
+    presets = os.path.join(resourceDir, "presets")
+    writeJson(os.path.join(presets, "alpha.json"), {"name": "Alpha 2", "panels": [panelJson(), panelJson()]})
+    writeJson(os.path.join(presets, "gamma.json"), {"name": "Gamma", "panels": []})
+    os.remove(os.path.join(presets, "beta.json"))
+
+    entries, calls = startup(resourceDir)
+    assert calls == [["alpha.json", "gamma.json"]]
+    assert [(e.filename, e.name, e.panelCount) for e in entries] == [
+        ("alpha.json", "Alpha 2", 2), ("gamma.json", "Gamma", 0)]
+
+    # The saved index agrees
+    assert startup(resourceDir)[1] == []
+
+
+def testUnreadableFileIsDroppedAndRetried(resourceDir):
+    startup(resourceDir)
+    path = os.path.join(resourceDir, "presets", "beta.json")
+    with open(path, 'w') as f:
+        f.write("{not json")
+
+    entries, calls = startup(resourceDir)
+    assert calls == [["beta.json"]]
+    assert [e.filename for e in entries] == ["alpha.json"]
+    # Not indexed, so the next startup tries it again
+    assert startup(resourceDir)[1] == [["beta.json"]]
+
+
+def testCorruptIndexFallsBackToParsing(resourceDir):
+    startup(resourceDir)
+    with open(os.path.join(resourceDir, "presetIndex.json"), 'w') as f:
+        f.write("[")
+    entries, calls = startup(resourceDir)
+    assert calls == [["alpha.json", "beta.json"]]
+    assert len(entries) == 2
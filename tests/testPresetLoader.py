@@ -0,0 +1,53 @@
+"""core.presetLoader: results in path order, per-file errors, cache use."""
+import pytest
+
+from core.presetLoader import loadPresetFiles, MIN_PARALLEL
+from core.presetCache import PresetCache
+from conftest import writeJson, panelJson
+
+
+def library(tmp_path, count, broken=()):
+    paths = []
+    for i in range(count):
+        path = str(tmp_path / f"p{i:02d}.json")
+        if i in broken:
+            with open(path, 'w') as f:
+                f.write("{")
+        else:
+            writeJson(path, {"name": f"P{i}", "panels": [panelJson(x=i)]})
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def testPresetsLineUpWithPaths(tmp_path, workers):
+    paths = library(tmp_path, MIN_PARALLEL * 3)
+    presets, errors = loadPresetFiles(list(reversed(paths)), workers=workers)
+    assert errors == []
+    assert [p.name for p in presets] == [f"P{i}" for i in reversed(range(len(paths)))]
+    assert [p.filepath for p in presets] == list(reversed(paths))
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def testFailuresAreReportedInPlace(tmp_path, workers):
+    paths = library(tmp_path, MIN_PARALLEL * 2, broken={3, 11})
+    paths.insert(5, str(tmp_path / "missing.json"))
+    writeJson(str(tmp_path / "list.json"), [])
+    paths.append(str(tmp_path / "list.json"))
+
+    presets, errors = loadPresetFiles(paths, workers=workers)
+    failed = [i for i, p in enumerate(presets) if p is None]
+    assert failed == [3, 5, 12, len(paths) - 1]
+    assert [e.filename for e in errors] == ["p03.json", "missing.json", "p11.json", "list.json"]
+    assert isinstance(errors[1].error, FileNotFoundError)
+    assert all(e.path == paths[i] for e, i in zip(errors, failed))
+
+
+def testSecondLoadComesFromTheCache(tmp_path):
+    paths = library(tmp_path, 3)
+    cache = PresetCache(str(tmp_path / "cache"))
+    first, _ = loadPresetFiles(paths, cache=cache)
+    second, _ = loadPresetFiles(paths, cache=cache)
+    assert (cache.hits, cache.misses) == (3, 3)
+    assert [p.toJson() for p in second] == [p.toJson() for p in first]
+    assert [p.filepath for p in second] == paths
@@ -0,0 +1,46 @@
+"""core.presetWriter: streamed output matches json.dump of toJson() exactly."""
+import json
+
+import pytest
+
+from core.presetWriter import writePreset
+from core.presetData import PresetData
+from conftest import panelJson
+
+
+def withExtras():
+    panel = panelJson(actions=(("a", 0, 0), ("shift+1", 1, 0)))
+    panel["actions"][1]["macro"] = [{"press": "shift"}, "1", {"delay": 0.5}]
+    panel["label"] = "Left é \"quoted\""
+    return {"name": "Ünïcode \\ name", "panels": [panel, panelJson(x=600.5)],
+            "target_app": "Game", "notes": {"nested": [1, 2.5, None, True]}}
+
+
+CASES = [
+    {"name": "Empty", "panels": []},
+    {"name": "One", "panels": [panelJson(actions=())]},
+    withExtras(),
+]
+
+
+def streamed(data, indent):
+    chunks = []
+    writePreset(PresetData.fromJson(data), chunks.append, indent)
+    return ''.join(chunks)
+
+
+@pytest.mark.parametrize("indent", [4, 2, None])
+@pytest.mark.parametrize("data", CASES)
+def testMatchesJsonDump(data, indent):
+    expected = PresetData.fromJson(data).toJson()
+    if indent is None:
+        # Compact form: no whitespace at all
+        assert streamed(data, indent) == json.dumps(expected, separators=(',', ':'))
+    else:
+        assert streamed(data, indent) == json.dumps(expected, indent=indent)
+
+
+@pytest.mark.parametrize("data", CASES)
+def testRoundTrip(data):
+    assert json.loads(streamed(data, 4)) == data
+    assert PresetData.fromJson(json.loads(streamed(data, None))).toJson() == data
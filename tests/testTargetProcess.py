@@ -0,0 +1,39 @@
+"""core.targetProcess: pid resolution from workspace notifications."""
+from core.targetProcess import TargetResolver, FakeNotificationSource
+
+
+def testResolverFollowsFrontmostApp():
+    apps = FakeNotificationSource()
+    apps.launch(10, "Finder")
+    apps.activate(10)
+    resolver = TargetResolver(apps)
+    assert resolver.pid() == 10
+
+    apps.launch(20, "Game")
+    apps.activate(20)
+    queries = apps.queries
+    assert resolver.pid() == 20
+    assert apps.queries == queries  # answered from notifications, no query
+
+    apps.terminate(20)
+    assert resolver.pid() is None
+
+
+def testResolverPinsTargetAppAcrossRelaunch():
+    apps = FakeNotificationSource()
+    apps.launch(10, "Finder")
+    apps.activate(10)
+    resolver = TargetResolver(apps)
+
+    # Not running yet: falls back to the frontmost app
+    assert resolver.pid("Game") == 10
+    apps.launch(30, "Game")
+    assert resolver.pid("game") == 30
+    queries = apps.queries
+    assert resolver.pid("GAME") == 30
+    assert apps.queries == queries  # cached
+
+    apps.terminate(30)
+    assert resolver.pid("Game") == 10
+    apps.launch(31, "Game")
+    assert resolver.pid("Game") == 31
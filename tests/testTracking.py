@@ -0,0 +1,61 @@
+"""core.tracking: dirty flags and change notifications on the preset/config trees."""
+from core.tracking import TrackedNamespace, toNamespace, bind, setListener, isDirty, markClean, markDirty
+from core.presetData import PresetData
+
+
+def trackedTree(data):
+    root = toNamespace(data)
+    bind(root, root)
+    changes = []
+    setListener(root, lambda r, path, value: changes.append((path, value)))
+    return root, changes
+
+
+def testWriteMarksRootDirtyAndReportsPath():
+    root, changes = trackedTree({"main_window": {"x": 1, "y": 2}, "opacity": 0.5})
+    assert not isDirty(root)
+
+    root.main_window.x = 10
+    assert isDirty(root)
+    assert changes == [(("main_window", "x"), 10)]
+
+
+def testSameValueWriteIsIgnored():
+    root, changes = trackedTree({"opacity": 0.5})
+    root.opacity = 0.5
+    assert not isDirty(root)
+    assert changes == []
+
+
+def testNewSubtreeIsBoundUnderItsPath():
+    root, changes = trackedTree({})
+    root.main_window = toNamespace({"x": 1})
+    root.main_window.x = 2
+    assert changes[-1] == (("main_window", "x"), 2)
+
+
+def testListItemsCarryTheirIndex():
+    preset = PresetData.fromJson({"name": "p", "panels": [{}, {"width": 2}]})
+    bind(preset, preset)
+    changes = []
+    setListener(preset, lambda r, path, value: changes.append(path))
+
+    preset.panels[1].screen_x = 70
+    assert changes == [("panels", 1, "screen_x")]
+
+
+def testMarkCleanAndMarkDirty():
+    root, _ = trackedTree({"opacity": 0.5})
+    root.opacity = 1.0
+    markClean(root)
+    assert not isDirty(root)
+    markDirty(root)
+    assert isDirty(root)
+
+
+def testPrivateAndFilepathWritesAreNotTracked():
+    preset = PresetData.fromJson({"name": "p"})
+    bind(preset, preset)
+    preset.filepath = "/tmp/p.json"
+    preset._compiled = None
+    assert not isDirty(preset)
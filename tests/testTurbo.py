@@ -0,0 +1,107 @@
+"""core.turbo: TurboRepeater tap timing, cap and teardown on a fake clock."""
+import pytest
+
+from core.turbo import TurboRepeater, TurboSpec, parseTurbo, DEFAULT_DUTY
+from core.heldKeys import HeldKeys
+from core.inputSequence import KEY_DOWN, KEY_UP
+
+
+class FakeScheduler:
+    """Records the repeater's single timer instead of running a thread; runUntil() fires it."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.due = None
+        self.fn = None
+
+    def timer(self, fn):
+        self.fn = fn
+        return fn
+
+    def arm(self, timer, delay):
+        self.due = self.clock() + delay
+
+    def cancel(self, timer):
+        self.due = None
+
+    def runUntil(self, end):
+        while self.due is not None and self.due <= end:
+            # A hair past due: clock() + delay can round just short of the deadline
+            self.clock.now = self.due + 1e-9
+            self.due = None  # fired timers are disarmed
+            self.fn()
+        self.clock.now = end
+
+
+def repeater(clock, **kwargs):
+    posted = []
+    held = HeldKeys(posted.append)
+    scheduler = FakeScheduler(clock)
+    return TurboRepeater(held, scheduler, **kwargs), scheduler, held, posted
+
+
+def timeline(posted):
+    return [(step.kind, step.value) for step in posted]
+
+
+def testParseTurbo():
+    assert parseTurbo(15) == TurboSpec(15.0, DEFAULT_DUTY)
+    assert parseTurbo({"rate": 10, "duty": 0.25}) == TurboSpec(10.0, 0.25)
+    for bad in (0, 100, True, "fast", {"rate": 10, "duty": 1.0}, {}):
+        with pytest.raises(ValueError):
+            parseTurbo(bad)
+
+
+def testTapsAtRateAndDuty(clock):
+    turbo, scheduler, held, posted = repeater(clock)
+    times = []
+    held.post = lambda step: (posted.append(step), times.append(clock.now))
+    turbo.start(7, 0, TurboSpec(10.0, 0.25))
+    scheduler.runUntil(0.31)
+    assert timeline(posted) == [(KEY_DOWN, 7), (KEY_UP, 7)] * 3 + [(KEY_DOWN, 7)]
+    assert times == pytest.approx([0.0, 0.025, 0.1, 0.125, 0.2, 0.225, 0.3], abs=1e-6)
+
+
+def testStopReleasesADownKey(clock):
+    turbo, scheduler, held, posted = repeater(clock)
+    key = turbo.start(7, 0, TurboSpec(10.0, 0.5))
+    scheduler.runUntil(0.01)
+    assert held.held() == {7}
+    turbo.stop(key)
+    assert held.held() == set()
+    assert timeline(posted) == [(KEY_DOWN, 7), (KEY_UP, 7)]
+    scheduler.runUntil(1.0)
+    assert len(posted) == 2 and turbo.active() == 0
+
+
+def testGlobalCapSkipsTapsButNeverUps(clock):
+    turbo, scheduler, held, posted = repeater(clock, maxTapRate=10.0, burst=1)
+    for keycode in (1, 2, 3):
+        turbo.start(keycode, 0, TurboSpec(10.0, 0.5))
+    scheduler.runUntil(1.0)
+    downs = sum(1 for kind, _ in timeline(posted) if kind == KEY_DOWN)
+    ups = sum(1 for kind, _ in timeline(posted) if kind == KEY_UP)
+    assert downs <= 11  # the burst plus 10 per second
+    assert turbo.skipped > 0
+    assert downs - ups == len(held.held())  # every tap but those down right now went up
+
+
+def testTapOfAKeyHeldElsewhereDoesntReachTheGame(clock):
+    turbo, scheduler, held, posted = repeater(clock)
+    held.press("box", 7)
+    turbo.start(7, 0, TurboSpec(10.0, 0.5))
+    scheduler.runUntil(0.5)
+    assert timeline(posted) == [(KEY_DOWN, 7)]
+
+
+def testStopAllByGroup(clock):
+    turbo, scheduler, held, posted = repeater(clock)
+    left, right = object(), object()
+    turbo.start(1, 0, TurboSpec(10.0, 0.5), group=left)
+    turbo.start(2, 0, TurboSpec(10.0, 0.5), group=right)
+    scheduler.runUntil(0.01)
+    turbo.stopAll(left)
+    assert held.held() == {2}
+    assert turbo.active() == 1
+    turbo.stopAll()
+    assert held.held() == set() and turbo.active() == 0
+    assert scheduler.due is None